@@ -0,0 +1,7 @@
+"""Titik masuk baris perintah MINER: python miner.py index|search ... (lihat src/cli.py)."""
+import sys
+
+from src.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
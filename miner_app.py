@@ -1,28 +1,33 @@
 
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
+import importlib
 import os
 import threading
 import subprocess
 import platform
-import time
 from pathlib import Path
 from ui.theme import COLORS, build_fonts
 from ui.sidebar import build_sidebar
-from ui.pages.search_page import render_search_page
-from ui.pages.results_page import render_results_page
-from ui.pages.upload_page import render_upload_page
-from ui.pages.documents_page import render_documents_page
 from ui.assets import load_images
-from src.pipeline import process_directory, build_models, SUPPORTED_EXT
-
-# Import backend helpers
-from src.utils.view_helpers import get_preview_snippet
+from src.pipeline import process_directory, build_models, rescan_directory, SUPPORTED_EXT
+from src.retrieval.query_cache import CachedRetrievalEngine
+from src.retrieval.async_search import AsyncSearcher
+from src.indexing.snippet_store import SnippetStore
+from src.utils.instrumentation import METRICS
 
 # Set appearance
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
+# Modul halaman diimpor saat halaman itu pertama kali dibuka
+PAGES = {
+    "search": ("ui.pages.search_page", "render_search_page"),
+    "results": ("ui.pages.results_page", "render_results_page"),
+    "documents": ("ui.pages.documents_page", "render_documents_page"),
+    "upload": ("ui.pages.upload_page", "render_upload_page"),
+}
+
 
 class MinerApp(ctk.CTk):
     def __init__(self):
@@ -41,9 +46,20 @@ class MinerApp(ctk.CTk):
         self.query_processor = None
         self.engine = None
         self.processed_docs = []
+        self.indexed_directory = None
         self.current_query = ""
         self.current_results = []
         self.current_search_time_ms = 0.0
+        self.current_search_stages = {}
+        # Skor kedekatan term (kotak centang di halaman pencarian); mati = peringkat QL biasa
+        self.proximity_search = False
+        # Dipegang pencarian dan pembaruan index (rescan) agar keduanya tidak tumpang tindih
+        self.index_lock = threading.RLock()
+        # Kueri dan pratinjau dijalankan di luar thread Tk
+        self.searcher = AsyncSearcher(lambda fn: self.after(0, fn), index_lock=self.index_lock)
+        # Teks dokumen disimpan saat indexing sehingga pratinjau tidak membaca ulang file
+        self.snippets = SnippetStore()
+        self.result_cards = []
 
         # Assets
         self.images = {}
@@ -70,13 +86,18 @@ class MinerApp(ctk.CTk):
         self.main_container.grid(row=0, column=1, sticky="nsew")
         
         # Show search page by default
-        render_search_page(self)
+        self.render_page("search")
 
     def clear_main_container(self):
         """Hapus seluruh konten utama sebelum memuat halaman baru."""
         for widget in self.main_container.winfo_children():
             widget.destroy()
 
+    def render_page(self, page):
+        """Render halaman ke main_container; modulnya diimpor saat pertama dipakai."""
+        module_name, func_name = PAGES[page]
+        getattr(importlib.import_module(module_name), func_name)(self)
+
     def navigate_to(self, page):
         """Navigate to different pages"""
         self.current_page = page
@@ -103,17 +124,11 @@ class MinerApp(ctk.CTk):
         self.clear_main_container()
         
         # Show appropriate page
-        if page == "search":
-            render_search_page(self)
-        elif page == "results":
-            render_results_page(self)
-        elif page == "documents":
-            render_documents_page(self)
-        elif page == "upload":
-            render_upload_page(self)
+        if page in PAGES:
+            self.render_page(page)
     
     def perform_search(self):
-        """Perform search and navigate to results"""
+        """Mulai pencarian di thread pekerja; hasil dan pratinjau dikirim balik ke UI."""
         if not self.engine:
             messagebox.showwarning("Warning", "Silakan index dokumen terlebih dahulu!\nGunakan halaman Upload.")
             return
@@ -123,59 +138,62 @@ class MinerApp(ctk.CTk):
             messagebox.showwarning("Warning", "Masukkan query pencarian!")
             return
         
-        try:
-            # Loading indicator
-            if hasattr(self, "search_button") and self.search_button.winfo_exists():
-                self.search_button.configure(state="disabled", text="Mencari…")
-            if hasattr(self, "search_status") and self.search_status.winfo_exists():
-                self.search_status.configure(text="Sedang mencari…")
-
-            start = time.perf_counter()
-            # Process query
-            q_vector, q_tokens = self.query_processor.transform_query(query)
+        # Loading indicator; tombol tetap aktif karena kueri baru membatalkan yang lama
+        if hasattr(self, "search_status") and self.search_status.winfo_exists():
+            self.search_status.configure(text="Sedang mencari…")
 
-            # Search dengan LM Dirichlet
-            results = self.engine.search(q_vector, top_k=20)
+        self.searcher.submit(
+            query,
+            self.query_processor,
+            self.engine,
+            top_k=20,
+            on_results=self._on_search_results,
+            on_preview=self._on_search_preview,
+            on_error=self._on_search_error,
+            snippets=self.snippets,
+            proximity=self.proximity_search,
+        )
 
-            elapsed_ms = (time.perf_counter() - start) * 1000
-            self.current_search_time_ms = elapsed_ms
+    def _on_search_results(self, ticket, results, q_tokens, elapsed_ms):
+        """Tampilkan ranking segera; pratinjau menyusul lewat _on_search_preview."""
+        self.current_search_time_ms = elapsed_ms
+        self.current_search_stages = ticket.stages
+        self.current_query = ticket.query
+        self.current_results = results
+        self.navigate_to("results")
 
-            # Normalisasi skor untuk tampilan (0-1) sambil simpan raw log-prob
-            if results:
-                raw_scores = [r['score'] for r in results]
-                min_s, max_s = min(raw_scores), max(raw_scores)
-                denom = (max_s - min_s) if max_s != min_s else 1.0
-                for res in results:
-                    res['raw_score'] = res['score']
-                    res['score'] = (res['score'] - min_s) / denom
-                    # keep hits for display
-                    res['hits'] = res.get('hits', 0)
+    def _on_search_preview(self, ticket, index, preview):
+        """Isi pratinjau satu hasil pada kartu yang sudah tampil."""
+        if index >= len(self.current_results):
+            return
+        self.current_results[index]['preview'] = preview
+        cards = getattr(self, "result_cards", [])
+        if self.current_page == "results" and index < len(cards):
+            cards[index].set_preview(preview)
 
-            # Add previews
-            for res in results:
-                preview = get_preview_snippet(
-                    res['metadata']['filepath'],
-                    q_tokens,
-                    max_length=200
-                )
-                res['preview'] = preview
-                res['query_terms'] = q_tokens
-            
-            # Store results
-            self.current_query = query
-            self.current_results = results
-            
-            # Navigate to results page
-            self.navigate_to("results")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Search failed: {str(e)}")
-        finally:
-            if hasattr(self, "search_button") and self.search_button.winfo_exists():
-                self.search_button.configure(state="normal", text="Cari")
-            if hasattr(self, "search_status") and self.search_status.winfo_exists():
-                self.search_status.configure(text="")
+    def _on_search_error(self, ticket, error):
+        if hasattr(self, "search_status") and self.search_status.winfo_exists():
+            self.search_status.configure(text="")
+        messagebox.showerror("Error", f"Search failed: {str(error)}")
     
+    def export_metrics(self):
+        """Simpan durasi tahap dan counter (indexing + pencarian) sebagai JSON atau Prometheus."""
+        path = filedialog.asksaveasfilename(
+            title="Ekspor metrik",
+            defaultextension=".json",
+            filetypes=[("JSON", "*.json"), ("Prometheus", "*.prom")],
+        )
+        if not path:
+            return
+        text = METRICS.to_prometheus() if path.endswith(".prom") else METRICS.to_json() + "\n"
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        except OSError as e:
+            messagebox.showerror("Error", f"Gagal menyimpan metrik: {e}")
+            return
+        messagebox.showinfo("Info", f"Metrik disimpan ke {path}")
+
     def browse_and_index(self):
         """Browse folder and index documents"""
         folder = filedialog.askdirectory(title="Pilih Folder Dokumen")
@@ -199,21 +217,56 @@ class MinerApp(ctk.CTk):
                 progress = 0.3 + (0.4 * current / total)
                 self.after(0, lambda p=progress: self.upload_progress.set(p))
 
-            self.processed_docs = process_directory(directory, SUPPORTED_EXT, progress_cb)
+            if self.inverted_index is not None and directory == self.indexed_directory:
+                # Folder yang sama: proses ulang hanya file yang berubah
+                # index diubah di bawah self.index_lock (lihat AsyncSearcher)
+                inverted_index = self.inverted_index
+                changes = rescan_directory(
+                    directory, inverted_index, SUPPORTED_EXT, progress_cb, lean=False, snippets=self.snippets,
+                    lock=self.index_lock,
+                )
+                changed = {doc['id']: doc for doc in changes['updated']}
+                removed = set(changes['removed'])
+                processed_docs = [
+                    changed.get(doc['id'], doc)
+                    for doc in self.processed_docs
+                    if doc['id'] not in removed
+                ] + changes['added']
+                models = None
+            else:
+                processed_docs = process_directory(
+                    directory, SUPPORTED_EXT, progress_cb, snippets=self.snippets, positional=True
+                )
 
-            if not self.processed_docs:
-                self.after(0, lambda: messagebox.showwarning("Warning", "Tidak ada dokumen yang ditemukan!"))
-                return
+                if not processed_docs:
+                    self.after(0, lambda: messagebox.showwarning("Warning", "Tidak ada dokumen yang ditemukan!"))
+                    return
 
-            self.after(0, lambda: self.upload_progress.set(0.7))
+                self.after(0, lambda: self.upload_progress.set(0.7))
 
-            # Gunakan default mu=2000; dapat diubah bila perlu
-            self.inverted_index, self.query_processor, self.engine = build_models(self.processed_docs)
-            
+                # Gunakan default mu=2000; dapat diubah bila perlu. Posisi term disimpan
+                # untuk kueri frasa ("...") dan pratinjau pada bagian paling relevan.
+                # Index baru dibangun terpisah; pencarian tetap memakai index lama sampai ditukar.
+                inverted_index, query_processor, engine = build_models(processed_docs, positional=True)
+                # Kueri populer dilayani dari cache; otomatis kosong saat index berubah
+                models = (inverted_index, query_processor, CachedRetrievalEngine(engine))
+
+            # Buang teks dokumen yang sudah tidak ada di index
+            with self.index_lock:
+                self.snippets.retain(meta.get('hash') for meta in inverted_index.documents.values())
+
+            def _publish():
+                # atribut yang dibaca UI dan perform_search hanya ditukar di thread Tk
+                self.processed_docs = processed_docs
+                if models is not None:
+                    self.inverted_index, self.query_processor, self.engine = models
+                    self.indexed_directory = directory
+
+            self.after(0, _publish)
             self.after(0, lambda: self.upload_progress.set(1.0))
             
             # Thread-safe UI updates
-            doc_count = len(self.processed_docs)
+            doc_count = len(processed_docs)
             self.after(0, lambda: self.upload_status.configure(
                 text=f"{doc_count} dokumen berhasil diindeks!",
                 text_color=self.colors["success"]
@@ -0,0 +1,92 @@
+"""Benchmark waktu impor (cold start) modul-modul jalur pencarian.
+
+Jalankan dari akar proyek:
+
+    python scripts/bench_import.py [--runs 7] [--budget-ms 80] [modul ...]
+
+Setiap modul diimpor di proses Python baru sebanyak --runs kali; yang
+dilaporkan adalah median waktu impor kumulatif modul tersebut (dari
+``python -X importtime``) dan median waktu total proses dibanding proses
+kosong. Skrip juga memeriksa bahwa modul jalur kueri tidak ikut memuat
+pustaka berat (docx, PyPDF2, customtkinter, PIL, multiprocessing), dan
+berhenti dengan status 1 bila ada yang termuat atau median impor jalur
+kueri melebihi --budget-ms.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# modul yang dipakai proses query-only (CLI search, server, pekerja)
+QUERY_PATH = (
+    "src.query.query_processor",
+    "src.retrieval.retrieval_engine",
+    "src.retrieval.loader",
+    "src.cli",
+)
+# modul lain yang tetap dilaporkan, tanpa batas waktu
+OTHERS = (
+    "src.utils.utils",
+    "src.pipeline",
+    "src.server",
+)
+HEAVY = ("docx", "PyPDF2", "customtkinter", "PIL", "multiprocessing")
+
+
+def _run(code, importtime=False):
+    cmd = [sys.executable, "-X", "importtime", "-c", code] if importtime else [sys.executable, "-c", code]
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True, check=True)
+    return time.perf_counter() - start, proc
+
+
+def import_ms(module):
+    """Waktu impor kumulatif modul (ms) menurut -X importtime."""
+    _, proc = _run(f"import {module}", importtime=True)
+    for line in reversed(proc.stderr.splitlines()):
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1]) / 1000
+    raise RuntimeError(f"baris importtime untuk {module} tidak ditemukan")
+
+
+def heavy_loaded(module):
+    code = f"import sys, {module}; print(' '.join(m for m in {HEAVY!r} if m in sys.modules))"
+    _, proc = _run(code)
+    return proc.stdout.split()
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", help="modul tambahan untuk diukur")
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--budget-ms", type=float, default=80.0, help="batas median impor modul jalur kueri")
+    args = parser.parse_args(argv)
+
+    baseline = statistics.median(_run("pass")[0] for _ in range(args.runs)) * 1000
+    print(f"proses Python kosong: {baseline:.1f} ms\n")
+    print(f"{'modul':<32} {'impor':>9} {'proses':>9}  pustaka berat")
+
+    failed = False
+    for module in QUERY_PATH + OTHERS + tuple(args.modules):
+        imports = statistics.median(import_ms(module) for _ in range(args.runs))
+        process = statistics.median(_run(f"import {module}")[0] for _ in range(args.runs)) * 1000 - baseline
+        heavy = heavy_loaded(module)
+        mark = ""
+        if module in QUERY_PATH and (heavy or imports > args.budget_ms):
+            mark = "  <-- GAGAL"
+            failed = True
+        print(f"{module:<32} {imports:7.1f}ms {process:7.1f}ms  {' '.join(heavy) or '-'}{mark}")
+
+    if failed:
+        print(f"\njalur kueri memuat pustaka berat atau melebihi {args.budget_ms:.0f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
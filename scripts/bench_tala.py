@@ -0,0 +1,72 @@
+"""Uji kesetaraan + benchmark stem_tala_word vs stem_tala_word_compiled.
+
+Jalankan dari akar proyek:
+
+    python scripts/bench_tala.py [file_kata ...]
+
+Daftar kata dibentuk dari file teks yang diberikan (default: data/raw),
+kombinasi imbuhan Indonesia atas kata-kata tersebut, dan string acak dari
+huruf yang sering muncul pada imbuhan. Skrip berhenti dengan status 1 bila
+ada satu kata pun yang hasilnya berbeda.
+"""
+import glob
+import itertools
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.preprocessing.tala_stemmer import stem_tala_word  # noqa: E402
+from src.preprocessing.tala_compiled import stem_tala_word_compiled  # noqa: E402
+from src.utils.utils import bersihkan_text, tokenizing  # noqa: E402
+
+PREFIXES = ("", "me", "mem", "meng", "men", "meny", "pe", "pem", "peng", "pen", "peny",
+            "di", "ter", "ke", "ber", "per", "pel", "bel", "be", "mempe", "diper", "memper")
+SUFFIXES = ("", "kan", "an", "i")
+ENDINGS = ("", "lah", "kah", "pun", "nya", "ku", "mu", "nyalah", "kupun")
+ROOTS = ("ajar", "baca", "tulis", "kerja", "sapu", "pakai", "ambil", "nilai", "satu",
+         "erti", "main", "lari", "beri", "buat", "kata", "ikan", "lihat", "dengar",
+         "sikat", "tani", "kenal", "pukul", "rumah", "jalan", "ubah", "ukur", "a", "e")
+
+
+def build_words(paths):
+    words = set()
+    for path in paths:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            words.update(tokenizing(bersihkan_text(f.read())))
+    roots = set(ROOTS) | {w for w in words if len(w) <= 8}
+    for prefix, root, suffix, ending in itertools.product(PREFIXES, sorted(roots), SUFFIXES, ENDINGS):
+        words.add(prefix + root + suffix + ending)
+    rng = random.Random(0)
+    alphabet = "aiueoaiuemnngykdtrbplsh"
+    for _ in range(200_000):
+        words.add("".join(rng.choice(alphabet) for _ in range(rng.randint(1, 14))))
+    return sorted(words)
+
+
+def main(argv):
+    paths = argv or glob.glob(os.path.join("data", "raw", "*.txt"))
+    words = build_words(paths)
+    print(f"{len(words)} kata uji")
+
+    mismatches = [w for w in words if stem_tala_word(w) != stem_tala_word_compiled(w)]
+    for w in mismatches[:20]:
+        print(f"BEDA {w!r}: {stem_tala_word(w)!r} != {stem_tala_word_compiled(w)!r}")
+    if mismatches:
+        print(f"{len(mismatches)} kata berbeda")
+        return 1
+    print("setara: semua kata menghasilkan stem yang sama")
+
+    for name, fn in (("stem_tala_word", stem_tala_word), ("stem_tala_word_compiled", stem_tala_word_compiled)):
+        start = time.perf_counter()
+        for w in words:
+            fn(w)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<26} {elapsed * 1000:9.1f} ms  ({elapsed / len(words) * 1e6:.2f} us/kata)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
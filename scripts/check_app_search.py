@@ -0,0 +1,83 @@
+"""Periksa jalur pencarian aplikasi: kueri berulang harus dilayani dari cache.
+
+Jalankan dari akar proyek:
+
+    python scripts/check_app_search.py [folder_dokumen] [kueri]
+
+Index dibangun seperti MinerApp (positional + SnippetStore, engine dibungkus
+CachedRetrievalEngine) lalu kueri dikirim dua kali lewat AsyncSearcher.
+Skrip berhenti dengan status 1 bila pencarian kedua tidak tercatat sebagai
+cache hit atau hasilnya berbeda dari jalur yang sama di engine langsung:
+search_positional (tanpa skor kedekatan) untuk kueri berfrasa, search untuk
+kueri lain.
+"""
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.pipeline import SUPPORTED_EXT, build_models, process_directory  # noqa: E402
+from src.indexing.snippet_store import SnippetStore  # noqa: E402
+from src.retrieval.async_search import AsyncSearcher  # noqa: E402
+from src.retrieval.query_cache import CachedRetrievalEngine  # noqa: E402
+
+
+def run_query(searcher, query, query_processor, engine, snippets):
+    done = threading.Event()
+    out = {}
+
+    def on_results(ticket, results, q_tokens, elapsed_ms):
+        out["results"] = [(r['doc_id'], r['raw_score']) for r in results]  # skor asli sebelum normalisasi
+
+    def on_error(ticket, error):
+        out["error"] = error
+        done.set()
+
+    searcher.submit(query, query_processor, engine, top_k=20, snippets=snippets,
+                    on_results=on_results, on_done=lambda ticket: done.set(), on_error=on_error)
+    if not done.wait(60):
+        raise RuntimeError("pencarian tidak selesai dalam 60 detik")
+    if "error" in out:
+        raise out["error"]
+    return out["results"]
+
+
+def main(argv):
+    directory = argv[0] if argv else "data/raw"
+    query = argv[1] if len(argv) > 1 else '"proses pembacaan" dokumen'
+
+    snippets = SnippetStore()
+    docs = process_directory(directory, SUPPORTED_EXT, snippets=snippets, positional=True)
+    _, query_processor, engine = build_models(docs, positional=True)
+    cached = CachedRetrievalEngine(engine)
+
+    searcher = AsyncSearcher(lambda fn: fn())
+    try:
+        first = run_query(searcher, query, query_processor, cached, snippets)
+        second = run_query(searcher, query, query_processor, cached, snippets)
+    finally:
+        searcher.shutdown()
+
+    q_vector, _ = query_processor.transform_query(query)
+    phrases = query_processor.extract_phrases(query)
+    if phrases:
+        direct = engine.search_positional(q_vector, top_k=20, phrases=phrases, proximity=False)
+    else:
+        direct = engine.search(q_vector, top_k=20)
+    expected = [(r['doc_id'], r['score']) for r in direct]
+
+    stats = cached.stats()
+    print(f"{len(docs)} dokumen, {len(first)} hasil, cache: {stats['hits']} hit / {stats['misses']} miss")
+    failed = False
+    if stats["hits"] != 1:
+        print("kueri kedua tidak dilayani dari cache")
+        failed = True
+    if not (first == second == expected):
+        print("hasil cache berbeda dari pencarian langsung")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
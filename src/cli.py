@@ -0,0 +1,250 @@
+"""Antarmuka baris perintah MINER tanpa UI (lihat miner.py di akar proyek).
+
+    python miner.py index dokumen/ --out index/ --workers 4
+    python miner.py index dokumen/ --out index/ --shards 4   # pencarian scatter-gather
+    python miner.py search index/ "sistem temu kembali" --top-k 20 --json
+    cat kueri.txt | python miner.py search index/ - --json
+    python miner.py convert lama/index.pkl   # index pickle lama -> lama/index.pkl.segment
+
+Waktu setiap tahap (lihat src.utils.instrumentation) ditulis ke stderr agar
+stdout tetap bersih untuk pipe; --metrics menyimpannya sebagai JSON atau
+format Prometheus (.prom), dan --profile/--tracemalloc memprofil satu tahap:
+
+    python miner.py index dokumen/ --workers 1 --detailed --profile ingest.stem
+    python miner.py search index/ - --metrics kueri.prom < kueri.txt
+
+Modul ini sengaja tidak mengimpor customtkinter/PIL, dan pipeline (pembaca
+docx/pdf) baru diimpor oleh perintah index.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+
+from src.retrieval.loader import (
+    CORPUS_STOPWORDS_FILE, ENGINES, INDEX_FILE, SEGMENT_DIR, SHARDS_DIR, load_corpus_stopwords, load_engine,
+)
+from src.utils.instrumentation import METRICS
+
+
+def _setup_metrics(args):
+    """Pasang profiler dari opsi --profile / --tracemalloc."""
+    for stage in args.profile:
+        METRICS.profile(stage, "cprofile")
+    for stage in args.tracemalloc:
+        METRICS.profile(stage, "tracemalloc")
+
+
+def _finish_metrics(args, started):
+    """Ekspor --metrics, lalu laporan tahap dan profil ke stderr."""
+    if args.metrics:
+        text = METRICS.to_prometheus() if args.metrics.endswith(".prom") else METRICS.to_json() + "\n"
+        with open(args.metrics, "w", encoding="utf-8") as f:
+            f.write(text)
+    if not args.quiet:
+        METRICS.report()
+        print(f"  {'total (wall)':<24} {'':>7} {(time.perf_counter() - started) * 1000:>11.1f}", file=sys.stderr)
+    for stage in args.profile:
+        stats = METRICS.profile_stats(stage)
+        if stats is None:
+            print(f"profil {stage}: tahap tidak berjalan di proses ini (coba --workers 1)", file=sys.stderr)
+        else:
+            print(f"\nprofil {stage}:\n{stats}", file=sys.stderr)
+
+
+def cmd_index(args):
+    from src.indexing.segment import write_segment
+    from src.pipeline import SUPPORTED_EXT, build_models, iter_processed_documents
+    from src.preprocessing.cache import PreprocessCache
+
+    if not os.path.isdir(args.directory):
+        print(f"Folder tidak ditemukan: {args.directory}", file=sys.stderr)
+        return 2
+    if args.shards < 1:
+        print("--shards harus >= 1", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    METRICS.detailed = args.detailed
+    _setup_metrics(args)
+    cache = PreprocessCache(args.cache) if args.cache else None
+    progress = None
+    if not args.quiet and sys.stderr.isatty():
+        def progress(done, total):
+            print(f"\r  {done}/{total} dokumen", end="" if done < total else "\n", file=sys.stderr)
+
+    docs = iter_processed_documents(
+        args.directory, SUPPORTED_EXT, progress, workers=args.workers, cache=cache, positional=args.positional,
+    )
+    layout = args.layout or ("dict" if args.positional or args.pickle else "columnar")
+    if args.pickle and layout != "dict":
+        print("--pickle hanya untuk layout dict (format InvertedIndex)", file=sys.stderr)
+        return 2
+    try:
+        inverted_index, _, _ = build_models(docs, positional=args.positional, layout=layout)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+
+    os.makedirs(args.out, exist_ok=True)
+    # hanya satu bentuk index di folder keluaran (lihat loader.resolve_index_path)
+    segment_dir, shards_dir = os.path.join(args.out, SEGMENT_DIR), os.path.join(args.out, SHARDS_DIR)
+    stale = shards_dir if args.shards <= 1 else segment_dir
+    if os.path.isdir(stale):
+        shutil.rmtree(stale)
+    if args.shards > 1:
+        from src.indexing.shards import write_shards
+
+        with METRICS.stage("ingest.save_shards"):
+            write_shards(inverted_index, shards_dir, args.shards)
+    else:
+        with METRICS.stage("ingest.save_segment"):
+            write_segment(inverted_index, segment_dir)
+    if args.pickle:
+        with METRICS.stage("ingest.save"):
+            inverted_index.save(os.path.join(args.out, INDEX_FILE))
+    stopwords_path = os.path.join(args.out, CORPUS_STOPWORDS_FILE)
+    if args.corpus_stopwords:
+        from src.preprocessing.stopword import corpus_stopwords, write_stopword_file
+
+        words = corpus_stopwords(inverted_index, top_n=args.corpus_stopwords)
+        write_stopword_file(words, stopwords_path, header=f"{len(words)} term ter-stem dengan cf tertinggi")
+    elif os.path.exists(stopwords_path):
+        os.remove(stopwords_path)  # sisa indexing sebelumnya tidak cocok dengan koleksi ini
+
+    print(f"{len(inverted_index.documents)} dokumen, {len(inverted_index.terms())} term -> {args.out}",
+          file=sys.stderr)
+    if cache is not None:
+        print(f"  cache: {cache.hits} hit / {cache.misses} miss", file=sys.stderr)
+    _finish_metrics(args, started)
+    return 0
+
+
+def _result_dict(rank, res):
+    meta = res['metadata']
+    return {
+        "rank": rank,
+        "doc_id": res['doc_id'],
+        "score": res['score'],
+        "hits": res['hits'],
+        "filename": meta.get('filename'),
+        "filepath": meta.get('filepath'),
+    }
+
+
+def cmd_search(args):
+    from src.query.query_processor import QueryProcessor
+
+    started = time.perf_counter()
+    _setup_metrics(args)
+    with METRICS.stage("search.load_index"):
+        try:
+            engine = load_engine(args.index, mu=args.mu, engine=args.engine, allow_pickle=args.pickle)
+        except (FileNotFoundError, ValueError) as exc:
+            print(exc, file=sys.stderr)
+            return 2
+        stopwords = frozenset() if args.keep_common_terms else load_corpus_stopwords(args.index)
+        query_processor = QueryProcessor(corpus_stopwords=stopwords)
+
+    queries = [line.strip() for line in sys.stdin] if args.query == "-" else [args.query]
+    out = sys.stdout
+    for query in queries:
+        if not query:
+            continue
+        q_vector, _ = query_processor.transform_query(query)
+        results = engine.search(q_vector, top_k=args.top_k)
+        with METRICS.stage("search.output"):
+            rows = [_result_dict(rank, res) for rank, res in enumerate(results, 1)]
+            if args.json:
+                out.write(json.dumps({"query": query, "results": rows}, ensure_ascii=False) + "\n")
+            else:
+                for row in rows:
+                    prefix = f"{query}\t" if len(queries) > 1 else ""
+                    out.write(f"{prefix}{row['rank']}\t{row['score']:.6f}\t{row['filename']}\t{row['filepath']}\n")
+    out.flush()
+
+    _finish_metrics(args, started)
+    close = getattr(engine, 'close', None)
+    if close is not None:
+        close()
+    return 0
+
+
+def cmd_convert(args):
+    from src.retrieval.loader import convert_pickle
+
+    try:
+        segment_dir = convert_pickle(args.pickle_file, args.out)
+    except FileNotFoundError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    print(f"{args.pickle_file} -> {segment_dir}", file=sys.stderr)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="miner", description="MINER - indexing dan pencarian dari baris perintah")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--metrics", default=None, metavar="FILE",
+                        help="simpan durasi tahap dan counter (JSON, atau Prometheus bila berakhiran .prom)")
+    common.add_argument("--profile", action="append", default=[], metavar="STAGE",
+                        help="profil cProfile untuk tahap, mis. search.scoring (dapat diulang)")
+    common.add_argument("--tracemalloc", action="append", default=[], metavar="STAGE",
+                        help="catat puncak alokasi memori tahap (dapat diulang)")
+
+    p_index = sub.add_parser("index", parents=[common], help="bangun index dari folder dokumen")
+    p_index.add_argument("directory", help="folder dokumen (.txt, .docx, .pdf, .html, .md, .odt, ...)")
+    p_index.add_argument("--out", default="index", help="folder keluaran (default: index)")
+    p_index.add_argument("--workers", type=int, default=None, help="jumlah proses preprocessing")
+    p_index.add_argument("--positional", action="store_true", help="simpan posisi term (kueri frasa)")
+    p_index.add_argument("--layout", choices=["columnar", "compressed", "dict"], default=None,
+                         help="layout index dalam memori saat membangun "
+                              "(default: columnar, atau dict untuk --positional/--pickle)")
+    p_index.add_argument("--pickle", action="store_true",
+                         help="tulis juga index pickle di <out>/index.pkl (index utama: segmen mmap <out>/segment)")
+    p_index.add_argument("--shards", type=int, default=1, metavar="N",
+                         help="tulis N shard segmen di <out>/shards (dicari paralel) alih-alih satu segmen")
+    p_index.add_argument("--cache", default=None, help="file PreprocessCache untuk indexing ulang")
+    p_index.add_argument("--corpus-stopwords", type=int, default=0, metavar="N",
+                         help="simpan N term dengan collection frequency tertinggi sebagai stopword kueri "
+                              "(dipakai bila search menerima folder keluaran ini)")
+    p_index.add_argument("--detailed", action="store_true",
+                         help="ukur clean/tokenize/stopword/stem terpisah (lebih lambat)")
+    p_index.add_argument("-q", "--quiet", action="store_true", help="tanpa progres dan laporan waktu")
+    p_index.set_defaults(func=cmd_index)
+
+    p_search = sub.add_parser("search", parents=[common], help="cari di index tersimpan")
+    p_search.add_argument("index", help="folder keluaran `index`, file pickle, folder segmen atau shard")
+    p_search.add_argument("query", help="teks kueri, atau - untuk membaca satu kueri per baris dari stdin")
+    p_search.add_argument("-k", "--top-k", type=int, default=10)
+    p_search.add_argument("--mu", type=float, default=2000)
+    p_search.add_argument("--engine", choices=ENGINES, default="default",
+                          help="evaluator kueri: maxscore (top-k dengan pruning) atau numpy (skor tervektorisasi); "
+                               "hasil sama dengan default")
+    p_search.add_argument("--json", action="store_true", help="keluaran JSON (satu baris per kueri)")
+    p_search.add_argument("--keep-common-terms", action="store_true",
+                          help="abaikan corpus_stopwords.txt di folder keluaran `index`")
+    p_search.add_argument("-q", "--quiet", action="store_true", help="tanpa laporan waktu")
+    p_search.add_argument("--pickle", action="store_true",
+                          help="izinkan membaca index pickle lama yang belum dikonversi (hanya file tepercaya)")
+    p_search.set_defaults(func=cmd_search)
+
+    p_convert = sub.add_parser("convert", help="ubah index pickle lama (tepercaya) menjadi segmen mmap")
+    p_convert.add_argument("pickle_file", help="file index pickle, mis. index/index.pkl")
+    p_convert.add_argument("--out", default=None, help="folder segmen (default: <pickle_file>.segment)")
+    p_convert.set_defaults(func=cmd_convert)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except BrokenPipeError:
+        # mis. `miner search ... | head`: jangan biarkan flush saat keluar gagal lagi
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
@@ -0,0 +1,82 @@
+"""Codec bilangan bulat untuk index: delta (gap) + variable-byte (VByte).
+
+Setiap bilangan non-negatif ditulis 7 bit per byte, byte terakhir tanpa bit
+tertinggi (sama dengan LEB128 unsigned). Daftar terurut disimpan sebagai
+selisih dengan elemen sebelumnya, sehingga angka yang ditulis kecil dan
+sebagian besar muat dalam satu byte.
+"""
+from itertools import accumulate
+
+
+def vbyte_encode(values, out=None):
+    """Tambahkan values ke out (bytearray baru bila None) dalam format VByte."""
+    out = bytearray() if out is None else out
+    append = out.append
+    for value in values:
+        if value < 0:
+            raise ValueError(f"VByte hanya untuk bilangan non-negatif: {value}")
+        while value >= 0x80:
+            append((value & 0x7F) | 0x80)
+            value >>= 7
+        append(value)
+    return out
+
+
+def vbyte_decode(buf, start=0, end=None, count=None):
+    """Baca bilangan VByte dari buf[start:end]; paling banyak count bilangan.
+
+    Hasil (values, posisi byte setelah bilangan terakhir yang dibaca).
+    """
+    end = len(buf) if end is None else end
+    if count is not None and start + count <= end:
+        # jalur cepat: count byte berikutnya semuanya < 0x80 -> satu byte per bilangan
+        chunk = bytes(buf[start:start + count])
+        if chunk.isascii():
+            return list(chunk), start + count
+    values = []
+    append = values.append
+    pos = start
+    value = shift = 0
+    while pos < end:
+        if count is not None and len(values) >= count:
+            break
+        byte = buf[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            append(value)
+            value = shift = 0
+    if shift:
+        raise ValueError("Data VByte terpotong")
+    return values, pos
+
+
+def delta_encode(values, base=0):
+    """Selisih berurutan dari daftar terurut naik (elemen pertama relatif terhadap base)."""
+    gaps = []
+    prev = base
+    for value in values:
+        if value < prev:
+            raise ValueError("delta_encode butuh daftar terurut naik")
+        gaps.append(value - prev)
+        prev = value
+    return gaps
+
+
+def delta_decode(gaps, base=0):
+    """Kebalikan delta_encode."""
+    values = list(accumulate(gaps, initial=base))
+    del values[0]
+    return values
+
+
+def encode_sorted(values):
+    """Daftar terurut naik -> bytes (delta + VByte)."""
+    return bytes(vbyte_encode(delta_encode(values)))
+
+
+def decode_sorted(buf, start=0, end=None):
+    """Kebalikan encode_sorted."""
+    return delta_decode(vbyte_decode(buf, start, end)[0])
@@ -0,0 +1,151 @@
+"""Inverted index kolumnar: posting disimpan sebagai buffer array('I') paralel."""
+import os
+import pickle
+from array import array
+from src.indexing.inverted_index import doc_term_counts
+
+
+class ColumnarInvertedIndex:
+    """Layout ringkas untuk InvertedIndex.
+
+    Semua posting disambung dalam dua buffer paralel (doc_ids dan tfs); term
+    dipetakan ke slot, dan offsets[slot]:offsets[slot + 1] menunjuk potongan
+    posting milik term tersebut, terurut doc_id. Satu posting hanya memakan
+    8 byte.
+    """
+
+    def __init__(self):
+        self.term_slots = {}
+        self.offsets = array('Q', [0])
+        self.cfs = array('Q')
+        self.doc_ids = array('I')
+        self.tfs = array('I')
+        self.documents = {}
+        self.collection_len = 0
+        self.version = 0
+
+    @classmethod
+    def from_index(cls, inverted_index):
+        """Konversi InvertedIndex (dict-of-dicts) yang sudah dibangun."""
+        columnar = cls()
+        for term in inverted_index.terms():
+            columnar._append_term(
+                term,
+                inverted_index.get_collection_freq(term),
+                [p['doc_id'] for p in inverted_index.get_postings(term)],
+                [p['tf'] for p in inverted_index.get_postings(term)],
+            )
+        columnar.documents = dict(inverted_index.documents)
+        columnar.collection_len = inverted_index.get_collection_len()
+        return columnar
+
+    def _append_term(self, term, cf, doc_ids, tfs):
+        self.term_slots[term] = len(self.cfs)
+        self.cfs.append(cf)
+        self.doc_ids.extend(doc_ids)
+        self.tfs.extend(tfs)
+        self.offsets.append(len(self.doc_ids))
+
+    def build_index(self, processed_documents):
+        """Bangun index dari dokumen terproses atau generator (format sama dengan InvertedIndex)."""
+        version = self.version
+        self.__init__()
+        self.version = version + 1
+
+        # posting sementara per term, lalu disambung menjadi buffer tunggal
+        term_docs = {}
+        term_tfs = {}
+        for doc in processed_documents:
+            doc_id = doc['id']
+            term_counts, doc_len = doc_term_counts(doc)
+            self.collection_len += doc_len
+
+            self.documents[doc_id] = {
+                **doc['metadata'],
+                'doc_len': doc_len,
+            }
+
+            for term, tf in term_counts.items():
+                if term not in term_docs:
+                    term_docs[term] = array('I')
+                    term_tfs[term] = array('I')
+                term_docs[term].append(doc_id)
+                term_tfs[term].append(tf)
+
+        for term in list(term_docs):
+            doc_ids = term_docs.pop(term)
+            tfs = term_tfs.pop(term)
+            if any(a >= b for a, b in zip(doc_ids, doc_ids[1:])):
+                # dokumen tidak datang urut doc_id; posting harus terurut (bisect, MaxScore, segmen)
+                order = sorted(range(len(doc_ids)), key=doc_ids.__getitem__)
+                doc_ids = array('I', (doc_ids[i] for i in order))
+                tfs = array('I', (tfs[i] for i in order))
+            self._append_term(term, sum(tfs), doc_ids, tfs)
+
+        return self
+
+    def save(self, filepath):
+        """Simpan buffer dan metadata ke disk menggunakan pickle."""
+        data = {
+            'term_slots': self.term_slots,
+            'offsets': self.offsets,
+            'cfs': self.cfs,
+            'doc_ids': self.doc_ids,
+            'tfs': self.tfs,
+            'documents': self.documents,
+            'collection_len': self.collection_len,
+        }
+
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+
+        with open(filepath, 'wb') as f:
+            pickle.dump(data, f)
+
+    def load(self, filepath):
+        """Muat buffer dan metadata dari disk."""
+        if not os.path.exists(filepath):
+            return False
+
+        with open(filepath, 'rb') as f:
+            data = pickle.load(f)
+            self.term_slots = data.get('term_slots', {})
+            self.offsets = data.get('offsets', array('Q', [0]))
+            self.cfs = data.get('cfs', array('Q'))
+            self.doc_ids = data.get('doc_ids', array('I'))
+            self.tfs = data.get('tfs', array('I'))
+            self.documents = data.get('documents', {})
+            self.collection_len = data.get('collection_len', 0)
+            self.version += 1
+        return True
+
+    def terms(self):
+        """Seluruh term dalam index."""
+        return self.term_slots.keys()
+
+    def get_postings_arrays(self, term):
+        """Akses cepat: (doc_ids, tfs) sebagai memoryview tanpa salinan."""
+        slot = self.term_slots.get(term)
+        if slot is None:
+            return memoryview(array('I')), memoryview(array('I'))
+        start, end = self.offsets[slot], self.offsets[slot + 1]
+        return memoryview(self.doc_ids)[start:end], memoryview(self.tfs)[start:end]
+
+    def get_postings(self, term):
+        """Ambil daftar posting untuk suatu term."""
+        doc_ids, tfs = self.get_postings_arrays(term)
+        return [{'doc_id': doc_id, 'tf': tf} for doc_id, tf in zip(doc_ids, tfs)]
+
+    def get_collection_freq(self, term):
+        """Frekuensi term di seluruh koleksi."""
+        slot = self.term_slots.get(term)
+        if slot is None:
+            return 0
+        return self.cfs[slot]
+
+    def get_doc_len(self, doc_id):
+        """Panjang dokumen (jumlah token)."""
+        return self.documents.get(doc_id, {}).get('doc_len', 0)
+
+    def get_collection_len(self):
+        """Total token dalam koleksi."""
+        return self.collection_len
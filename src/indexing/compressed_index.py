@@ -0,0 +1,299 @@
+"""Inverted index dengan posting terkompresi (delta doc_id + VByte) per blok.
+
+Posting setiap term dipecah menjadi blok berisi block_size entri. Satu blok
+adalah gap doc_id (VByte, gap pertama relatif terhadap doc_id terakhir blok
+sebelumnya) diikuti tf (VByte). Untuk setiap blok disimpan skip pointer:
+doc_id terakhir dan offset byte awal blok, sehingga kursor dapat melompat
+ke doc_id tertentu hanya dengan mendekode satu blok. Posting umumnya
+memakan 2-3 byte, dibanding ratusan byte untuk dict di InvertedIndex.
+"""
+import os
+import pickle
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+
+from src.indexing.codec import delta_decode, delta_encode, vbyte_decode, vbyte_encode
+from src.indexing.inverted_index import doc_term_counts
+
+DEFAULT_BLOCK_SIZE = 128
+
+
+class CompressedInvertedIndex:
+    """API sama dengan InvertedIndex, ditambah iter_blocks() dan cursor() per term."""
+
+    def __init__(self, block_size=DEFAULT_BLOCK_SIZE):
+        self.block_size = block_size
+        self.term_slots = {}
+        self.cfs = array('Q')
+        self.dfs = array('I')
+        self.data = bytearray()
+        # skip pointer semua term disambung; blok milik slot = skip_starts[slot]:skip_starts[slot + 1]
+        self.skip_docs = array('I')  # doc_id terakhir tiap blok
+        self.skip_offsets = array('Q')  # offset byte awal tiap blok di data
+        self.skip_starts = array('Q', [0])
+        self.data_ends = array('Q')  # offset byte akhir posting tiap term
+        self.documents = {}
+        self.collection_len = 0
+        self.version = 0
+
+    @classmethod
+    def from_index(cls, inverted_index, block_size=DEFAULT_BLOCK_SIZE):
+        """Konversi index lain (InvertedIndex, ColumnarInvertedIndex, SegmentIndex)."""
+        compressed = cls(block_size)
+        get_arrays = getattr(inverted_index, 'get_postings_arrays', None)
+        for term in inverted_index.terms():
+            if get_arrays is not None:
+                doc_ids, tfs = get_arrays(term)
+            else:
+                postings = inverted_index.get_postings(term)
+                doc_ids = [p['doc_id'] for p in postings]
+                tfs = [p['tf'] for p in postings]
+            compressed._append_term(term, inverted_index.get_collection_freq(term), doc_ids, tfs)
+        compressed.documents = dict(inverted_index.documents)
+        compressed.collection_len = inverted_index.get_collection_len()
+        return compressed
+
+    def _append_term(self, term, cf, doc_ids, tfs):
+        self.term_slots[term] = len(self.cfs)
+        self.cfs.append(cf)
+        self.dfs.append(len(doc_ids))
+        size = self.block_size
+        base = 0
+        for start in range(0, len(doc_ids), size):
+            block_docs = doc_ids[start:start + size]
+            self.skip_offsets.append(len(self.data))
+            vbyte_encode(delta_encode(block_docs, base), self.data)
+            vbyte_encode(tfs[start:start + size], self.data)
+            base = block_docs[-1]
+            self.skip_docs.append(base)
+        self.skip_starts.append(len(self.skip_docs))
+        self.data_ends.append(len(self.data))
+
+    def build_index(self, processed_documents):
+        """Bangun index dari dokumen terproses atau generator (format sama dengan InvertedIndex)."""
+        version = self.version
+        self.__init__(self.block_size)
+        self.version = version + 1
+
+        term_docs = {}
+        term_tfs = {}
+        for doc in processed_documents:
+            doc_id = doc['id']
+            term_counts, doc_len = doc_term_counts(doc)
+            self.collection_len += doc_len
+
+            self.documents[doc_id] = {
+                **doc['metadata'],
+                'doc_len': doc_len,
+            }
+
+            for term, tf in term_counts.items():
+                if term not in term_docs:
+                    term_docs[term] = array('I')
+                    term_tfs[term] = array('I')
+                term_docs[term].append(doc_id)
+                term_tfs[term].append(tf)
+
+        for term in list(term_docs):
+            doc_ids = term_docs.pop(term)
+            tfs = term_tfs.pop(term)
+            if any(a >= b for a, b in zip(doc_ids, doc_ids[1:])):
+                # dokumen tidak datang urut doc_id
+                order = sorted(range(len(doc_ids)), key=doc_ids.__getitem__)
+                doc_ids = array('I', (doc_ids[i] for i in order))
+                tfs = array('I', (tfs[i] for i in order))
+            self._append_term(term, sum(tfs), doc_ids, tfs)
+
+        return self
+
+    def save(self, filepath):
+        """Simpan buffer terkompresi dan metadata ke disk menggunakan pickle."""
+        data = {
+            'block_size': self.block_size,
+            'term_slots': self.term_slots,
+            'cfs': self.cfs,
+            'dfs': self.dfs,
+            'data': bytes(self.data),
+            'skip_docs': self.skip_docs,
+            'skip_offsets': self.skip_offsets,
+            'skip_starts': self.skip_starts,
+            'data_ends': self.data_ends,
+            'documents': self.documents,
+            'collection_len': self.collection_len,
+        }
+
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+
+        with open(filepath, 'wb') as f:
+            pickle.dump(data, f)
+
+    def load(self, filepath):
+        """Muat index terkompresi dari disk."""
+        if not os.path.exists(filepath):
+            return False
+
+        with open(filepath, 'rb') as f:
+            data = pickle.load(f)
+            self.block_size = data.get('block_size', DEFAULT_BLOCK_SIZE)
+            self.term_slots = data.get('term_slots', {})
+            self.cfs = data.get('cfs', array('Q'))
+            self.dfs = data.get('dfs', array('I'))
+            self.data = data.get('data', b'')
+            self.skip_docs = data.get('skip_docs', array('I'))
+            self.skip_offsets = data.get('skip_offsets', array('Q'))
+            self.skip_starts = data.get('skip_starts', array('Q', [0]))
+            self.data_ends = data.get('data_ends', array('Q'))
+            self.documents = data.get('documents', {})
+            self.collection_len = data.get('collection_len', 0)
+            self.version += 1
+        return True
+
+    def _block_count(self, slot, block):
+        """Jumlah posting di blok (blok terakhir bisa lebih pendek)."""
+        first = self.skip_starts[slot]
+        return min(self.block_size, self.dfs[slot] - (block - first) * self.block_size)
+
+    def decode_block(self, slot, block):
+        """(doc_ids, tfs) satu blok; block adalah indeks global di skip_docs."""
+        n = self._block_count(slot, block)
+        start = self.skip_offsets[block]
+        end = self.skip_offsets[block + 1] if block + 1 < self.skip_starts[slot + 1] else self.data_ends[slot]
+        base = self.skip_docs[block - 1] if block > self.skip_starts[slot] else 0
+        gaps, pos = vbyte_decode(self.data, start, end, count=n)
+        tfs, _ = vbyte_decode(self.data, pos, end, count=n)
+        return delta_decode(gaps, base), tfs
+
+    def iter_blocks(self, term):
+        """Blok (doc_ids, tfs) berurutan; hanya blok yang diminta yang didekode."""
+        slot = self.term_slots.get(term)
+        if slot is None:
+            return
+        for block in range(self.skip_starts[slot], self.skip_starts[slot + 1]):
+            yield self.decode_block(slot, block)
+
+    def cursor(self, term):
+        """PostingsCursor untuk term (kosong bila term tidak ada)."""
+        return PostingsCursor(self, self.term_slots.get(term))
+
+    def terms(self):
+        """Seluruh term dalam index."""
+        return self.term_slots.keys()
+
+    def get_postings_arrays(self, term):
+        """(doc_ids, tfs) terdekode penuh sebagai array('I')."""
+        doc_ids, tfs = array('I'), array('I')
+        for block_docs, block_tfs in self.iter_blocks(term):
+            doc_ids.extend(block_docs)
+            tfs.extend(block_tfs)
+        return doc_ids, tfs
+
+    def get_postings(self, term):
+        """Ambil daftar posting untuk suatu term (didekode per blok saat diakses)."""
+        return CompressedPostings(self, self.term_slots.get(term))
+
+    def get_collection_freq(self, term):
+        """Frekuensi term di seluruh koleksi."""
+        slot = self.term_slots.get(term)
+        if slot is None:
+            return 0
+        return self.cfs[slot]
+
+    def get_doc_len(self, doc_id):
+        """Panjang dokumen (jumlah token)."""
+        return self.documents.get(doc_id, {}).get('doc_len', 0)
+
+    def get_collection_len(self):
+        """Total token dalam koleksi."""
+        return self.collection_len
+
+
+class CompressedPostings(Sequence):
+    """Daftar posting {'doc_id', 'tf'} yang didekode malas, satu blok sekali akses."""
+
+    def __init__(self, index, slot):
+        self._index = index
+        self._slot = slot
+        self._cached = (None, None)
+
+    def __len__(self):
+        return 0 if self._slot is None else self._index.dfs[self._slot]
+
+    def _block(self, block):
+        if self._cached[0] != block:
+            self._cached = (block, self._index.decode_block(self._slot, block))
+        return self._cached[1]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError(i)
+        size = self._index.block_size
+        doc_ids, tfs = self._block(self._index.skip_starts[self._slot] + i // size)
+        return {'doc_id': doc_ids[i % size], 'tf': tfs[i % size]}
+
+    def __iter__(self):
+        if self._slot is None:
+            return
+        index = self._index
+        for block in range(index.skip_starts[self._slot], index.skip_starts[self._slot + 1]):
+            doc_ids, tfs = index.decode_block(self._slot, block)
+            for doc_id, tf in zip(doc_ids, tfs):
+                yield {'doc_id': doc_id, 'tf': tf}
+
+
+class PostingsCursor:
+    """Kursor maju atas posting terkompresi dengan lompatan lewat skip pointer.
+
+    doc_id / tf menunjuk posting saat ini; doc_id None berarti habis.
+    """
+
+    def __init__(self, index, slot):
+        self._index = index
+        self._slot = slot
+        self.doc_id = None
+        self.tf = 0
+        if slot is None:
+            return
+        self._block = index.skip_starts[slot]
+        self._end_block = index.skip_starts[slot + 1]
+        self._docs, self._tfs, self._pos = [], [], 0
+        self._load(self._block)
+
+    def _load(self, block):
+        self._block = block
+        if block >= self._end_block:
+            self.doc_id = None
+            return
+        self._docs, self._tfs = self._index.decode_block(self._slot, block)
+        self._pos = 0
+        self.doc_id, self.tf = self._docs[0], self._tfs[0]
+
+    def next(self):
+        """Maju satu posting; hasil doc_id baru (None bila habis)."""
+        if self.doc_id is None:
+            return None
+        self._pos += 1
+        if self._pos < len(self._docs):
+            self.doc_id, self.tf = self._docs[self._pos], self._tfs[self._pos]
+        else:
+            self._load(self._block + 1)
+        return self.doc_id
+
+    def advance(self, target):
+        """Maju ke posting pertama dengan doc_id >= target; blok yang dilewati tidak didekode."""
+        if self.doc_id is None or self.doc_id >= target:
+            return self.doc_id
+        skip_docs = self._index.skip_docs
+        if skip_docs[self._block] < target:
+            block = bisect_left(skip_docs, target, self._block + 1, self._end_block)
+            self._load(block)
+            if self.doc_id is None:
+                return None
+        self._pos = bisect_left(self._docs, target, self._pos)
+        self.doc_id, self.tf = self._docs[self._pos], self._tfs[self._pos]
+        return self.doc_id
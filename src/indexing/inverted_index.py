@@ -1,48 +1,121 @@
 import pickle
 import os
+from bisect import bisect_left, insort
 from collections import Counter
+from src.indexing.segment import write_segment
+from src.indexing.codec import encode_sorted, decode_sorted
+
+
+def doc_term_counts(doc):
+    """(term_counts, doc_len) dokumen terproses, dari 'term_counts' atau 'tokens'."""
+    if 'term_counts' in doc:
+        term_counts = doc['term_counts']
+        return term_counts, doc.get('doc_len', sum(term_counts.values()))
+    tokens = doc['tokens']
+    return Counter(tokens), len(tokens)
 
 
 class InvertedIndex:
-    def __init__(self):
+    def __init__(self, positional=False):
         self.index = {}
         self.documents = {}
         self.collection_len = 0
+        # indeks maju doc_id -> term, agar dokumen dapat dihapus tanpa memindai kosakata
+        self.doc_terms = {}
+        # naik setiap kali isi index berubah (dipakai untuk invalidasi cache kueri)
+        self.version = 0
+        # posisi term disimpan terpisah dari posting (term -> {doc_id: bytes delta+VByte}),
+        # jadi kueri bag-of-words tidak pernah menyentuhnya
+        self.positional = positional
+        self.positions = {}
 
     def build_index(self, processed_documents):
-        """Bangun inverted index dengan menyimpan tf dan panjang dokumen."""
+        """Bangun inverted index dengan menyimpan tf dan panjang dokumen.
+
+        processed_documents dapat berupa generator; dokumen dikonsumsi satu
+        per satu dan boleh berisi 'tokens' atau 'term_counts' + 'doc_len'.
+        Index positional juga membutuhkan 'positions' (term -> daftar posisi).
+        """
         self.index = {}
         self.documents = {}
         self.collection_len = 0
+        self.doc_terms = {}
+        self.positions = {}
+        self.version += 1
 
         for doc in processed_documents:
-            doc_id = doc['id']
-            tokens = doc['tokens']
-            doc_len = len(tokens)
-            self.collection_len += doc_len
-
-            # simpan metadata + panjang dokumen
-            self.documents[doc_id] = {
-                **doc['metadata'],
-                'doc_len': doc_len,
-            }
+            self.add_document(doc)
 
-            term_counts = Counter(tokens)
-
-            for term, tf in term_counts.items():
-                if term not in self.index:
-                    self.index[term] = {
-                        'cf': 0,
-                        'postings': [],
-                    }
+        return self.index
 
-                self.index[term]['cf'] += tf
-                self.index[term]['postings'].append({
-                    'doc_id': doc_id,
-                    'tf': tf,
-                })
+    def add_document(self, doc):
+        """Tambahkan satu dokumen terproses; posting tetap terurut menurut doc_id."""
+        doc_id = doc['id']
+        if doc_id in self.documents:
+            raise ValueError(f"Dokumen {doc_id} sudah ada di index")
+        if self.positional and 'positions' not in doc:
+            raise ValueError(f"Dokumen {doc_id} tidak memuat posisi term (index positional)")
+        term_counts, doc_len = doc_term_counts(doc)
+        self.collection_len += doc_len
+        self.version += 1
+
+        # simpan metadata + panjang dokumen
+        self.documents[doc_id] = {
+            **doc['metadata'],
+            'doc_len': doc_len,
+        }
+        self.doc_terms[doc_id] = tuple(term_counts)
+
+        for term, tf in term_counts.items():
+            if term not in self.index:
+                self.index[term] = {
+                    'cf': 0,
+                    'postings': [],
+                }
+
+            entry = self.index[term]
+            entry['cf'] += tf
+            posting = {
+                'doc_id': doc_id,
+                'tf': tf,
+            }
+            postings = entry['postings']
+            if not postings or postings[-1]['doc_id'] < doc_id:
+                postings.append(posting)
+            else:
+                insort(postings, posting, key=lambda p: p['doc_id'])
+
+        if self.positional:
+            for term, positions in doc['positions'].items():
+                self.positions.setdefault(term, {})[doc_id] = encode_sorted(positions)
+
+    def remove_document(self, doc_id):
+        """Hapus dokumen dari index; cf, collection_len dan posting ikut diperbarui."""
+        if doc_id not in self.documents:
+            return False
+        self.version += 1
+        for term in self.doc_terms.pop(doc_id, ()):
+            entry = self.index.get(term)
+            if entry is None:
+                continue
+            postings = entry['postings']
+            pos = bisect_left(postings, doc_id, key=lambda p: p['doc_id'])
+            if pos < len(postings) and postings[pos]['doc_id'] == doc_id:
+                entry['cf'] -= postings.pop(pos)['tf']
+            if not postings:
+                del self.index[term]
+            term_positions = self.positions.get(term)
+            if term_positions is not None:
+                term_positions.pop(doc_id, None)
+                if not term_positions:
+                    del self.positions[term]
+        self.collection_len -= self.documents.pop(doc_id).get('doc_len', 0)
+        return True
 
-        return self.index
+    def update_document(self, doc):
+        """Ganti isi dokumen dengan doc_id yang sama (atau tambahkan bila belum ada)."""
+        self.remove_document(doc['id'])
+        self.add_document(doc)
 
     def save(self, filepath):
         """Save index and metadata to disk using pickle"""
@@ -50,6 +123,9 @@ class InvertedIndex:
             'index': self.index,
             'documents': self.documents,
             'collection_len': self.collection_len,
+            'doc_terms': self.doc_terms,
+            'positional': self.positional,
+            'positions': self.positions,
         }
 
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
@@ -57,6 +133,10 @@ class InvertedIndex:
         with open(filepath, 'wb') as f:
             pickle.dump(data, f)
 
+    def save_segment(self, dirpath):
+        """Simpan sebagai segmen biner mmap; buka kembali dengan SegmentIndex."""
+        write_segment(self, dirpath)
+
     def load(self, filepath):
         """Load index and metadata from disk"""
         if not os.path.exists(filepath):
@@ -67,14 +147,35 @@ class InvertedIndex:
             self.index = data.get('index', {})
             self.documents = data.get('documents', {})
             self.collection_len = data.get('collection_len', 0)
+            self.doc_terms = data.get('doc_terms') or self._rebuild_doc_terms()
+            self.positional = data.get('positional', False)
+            self.positions = data.get('positions', {})
+            self.version += 1
         return True
 
+    def _rebuild_doc_terms(self):
+        """Bentuk ulang indeks maju dari posting (untuk file index versi lama)."""
+        doc_terms = {doc_id: [] for doc_id in self.documents}
+        for term, entry in self.index.items():
+            for p in entry['postings']:
+                doc_terms.setdefault(p['doc_id'], []).append(term)
+        return {doc_id: tuple(terms) for doc_id, terms in doc_terms.items()}
+
+    def terms(self):
+        """Seluruh term dalam index."""
+        return self.index.keys()
+
     def get_postings(self, term):
         """Ambil daftar posting untuk suatu term."""
         if term in self.index:
             return self.index[term]['postings']
         return []
 
+    def get_positions(self, term, doc_id):
+        """Posisi term di dokumen (urut naik); kosong bila index tidak positional."""
+        encoded = self.positions.get(term, {}).get(doc_id)
+        return decode_sorted(encoded) if encoded else []
+
     def get_collection_freq(self, term):
         """Frekuensi term di seluruh koleksi."""
         if term in self.index:
@@ -0,0 +1,354 @@
+"""Format segmen index biner yang dibuka dengan mmap (pengganti pickle).
+
+Satu segmen adalah folder berisi tiga file:
+
+- ``terms.bin``    : kamus term terurut (byte UTF-8) + cf, offset dan df posting
+- ``postings.bin`` : seluruh doc_id (uint32) lalu seluruh tf (uint32)
+- ``docs.bin``     : tabel dokumen terurut doc_id (panjang + metadata JSON)
+
+Index positional menambah ``positions.bin``: per term (urutan kamus) tabel
+offset uint32 per posting lalu posisi tiap dokumen dalam delta + VByte.
+
+Semua bilangan little-endian. Membuka segmen hanya memetakan file; halaman
+posting baru dibaca dari disk ketika term tersebut dipakai oleh kueri, dan
+halaman yang sama dibagi antar proses yang membuka segmen yang sama.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+
+from src.indexing.codec import encode_sorted, decode_sorted
+
+SEGMENT_VERSION = 1
+
+TERMS_FILE = "terms.bin"
+POSTINGS_FILE = "postings.bin"
+DOCS_FILE = "docs.bin"
+POSITIONS_FILE = "positions.bin"
+
+# magic, versi, jumlah entri, collection_len
+_HEADER = struct.Struct("<4sIQQ")
+# term_off, cf, post_off, term_len, df
+_TERM_ENTRY = struct.Struct("<QQQII")
+# doc_id, doc_len, meta_off, meta_len
+_DOC_ENTRY = struct.Struct("<QQQQ")
+
+_MAGIC_TERMS = b"MNRT"
+_MAGIC_POSTINGS = b"MNRP"
+_MAGIC_DOCS = b"MNRD"
+_MAGIC_POSITIONS = b"MNRX"
+
+_LOOKUP_CACHE_SIZE = 65536
+
+
+def _u32(values):
+    buf = array("I", values)
+    if sys.byteorder != "little":
+        buf.byteswap()
+    return buf
+
+
+def _postings_arrays(index, term):
+    get_arrays = getattr(index, "get_postings_arrays", None)
+    if get_arrays is not None:
+        return get_arrays(term)
+    postings = index.get_postings(term)
+    return [p["doc_id"] for p in postings], [p["tf"] for p in postings]
+
+
+def _u64(values):
+    buf = array("Q", values)
+    if sys.byteorder != "little":
+        buf.byteswap()
+    return buf
+
+
+def _write_atomic(path, chunks):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(tmp, path)
+
+
+def write_segment(index, dirpath):
+    """Tulis index (InvertedIndex / ColumnarInvertedIndex / lainnya) sebagai segmen."""
+    os.makedirs(dirpath, exist_ok=True)
+
+    terms = sorted(index.terms(), key=lambda t: t.encode("utf-8"))
+    positional = getattr(index, "positional", False)
+    position_sections = []
+    term_entries = []
+    term_blob = bytearray()
+    doc_parts = []
+    tf_parts = []
+    post_off = 0
+    for term in terms:
+        encoded = term.encode("utf-8")
+        doc_ids, tfs = _postings_arrays(index, term)
+        df = len(doc_ids)
+        term_entries.append(_TERM_ENTRY.pack(
+            len(term_blob), index.get_collection_freq(term), post_off, len(encoded), df
+        ))
+        term_blob += encoded
+        doc_parts.append(_u32(doc_ids))
+        tf_parts.append(_u32(tfs))
+        post_off += df
+        if positional:
+            position_sections.append(_positions_section(index, term, doc_ids))
+
+    collection_len = index.get_collection_len()
+    _write_atomic(os.path.join(dirpath, POSTINGS_FILE), [
+        _HEADER.pack(_MAGIC_POSTINGS, SEGMENT_VERSION, post_off, collection_len),
+        *doc_parts,
+        *tf_parts,
+    ])
+    positions_path = os.path.join(dirpath, POSITIONS_FILE)
+    if positional:
+        section_offsets = [0]
+        for section in position_sections:
+            section_offsets.append(section_offsets[-1] + sum(len(part) for part in section))
+        _write_atomic(positions_path, [
+            _HEADER.pack(_MAGIC_POSITIONS, SEGMENT_VERSION, len(terms), collection_len),
+            _u64(section_offsets),
+            *(part for section in position_sections for part in section),
+        ])
+    elif os.path.exists(positions_path):
+        os.remove(positions_path)  # sisa segmen positional lama di folder yang sama
+    _write_atomic(os.path.join(dirpath, TERMS_FILE), [
+        _HEADER.pack(_MAGIC_TERMS, SEGMENT_VERSION, len(terms), collection_len),
+        *term_entries,
+        term_blob,
+    ])
+
+    doc_entries = []
+    meta_blob = bytearray()
+    for doc_id in sorted(index.documents):
+        meta = dict(index.documents[doc_id])
+        doc_len = meta.pop("doc_len", 0)
+        encoded = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+        doc_entries.append(_DOC_ENTRY.pack(doc_id, doc_len, len(meta_blob), len(encoded)))
+        meta_blob += encoded
+    _write_atomic(os.path.join(dirpath, DOCS_FILE), [
+        _HEADER.pack(_MAGIC_DOCS, SEGMENT_VERSION, len(doc_entries), collection_len),
+        *doc_entries,
+        meta_blob,
+    ])
+
+
+def _positions_section(index, term, doc_ids):
+    """Bagian positions.bin untuk satu term: offset uint32 (df + 1) lalu blob posisi."""
+    blobs = [encode_sorted(index.get_positions(term, doc_id)) for doc_id in doc_ids]
+    offsets = [0]
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+    return [_u32(offsets).tobytes(), *blobs]
+
+
+def _open_mmap(path, magic):
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < _HEADER.size:
+            raise ValueError(f"Segmen rusak: {path}")
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    file_magic, version, count, collection_len = _HEADER.unpack_from(mm, 0)
+    if file_magic != magic:
+        mm.close()
+        raise ValueError(f"Bukan file segmen: {path}")
+    if version != SEGMENT_VERSION:
+        mm.close()
+        raise ValueError(f"Versi segmen {version} tidak didukung (harap {SEGMENT_VERSION}): {path}")
+    return mm, count, collection_len
+
+
+class _DocTable(Mapping):
+    """Mapping doc_id -> metadata yang dibaca langsung dari docs.bin."""
+
+    def __init__(self, mm, count):
+        self._mm = mm
+        self._count = count
+        self._blob_start = _HEADER.size + count * _DOC_ENTRY.size
+        self._cache = {}
+
+    def _entry(self, i):
+        return _DOC_ENTRY.unpack_from(self._mm, _HEADER.size + i * _DOC_ENTRY.size)
+
+    def _find(self, doc_id):
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry = self._entry(mid)
+            if entry[0] < doc_id:
+                lo = mid + 1
+            elif entry[0] > doc_id:
+                hi = mid
+            else:
+                return entry
+        return None
+
+    def doc_len(self, doc_id):
+        if not isinstance(doc_id, int) or doc_id < 0:
+            return 0
+        entry = self._find(doc_id)
+        return entry[1] if entry else 0
+
+    def __getitem__(self, doc_id):
+        meta = self._cache.get(doc_id)
+        if meta is not None:
+            return meta
+        entry = self._find(doc_id) if isinstance(doc_id, int) and doc_id >= 0 else None
+        if entry is None:
+            raise KeyError(doc_id)
+        _, doc_len, meta_off, meta_len = entry
+        start = self._blob_start + meta_off
+        meta = json.loads(self._mm[start:start + meta_len].decode("utf-8"))
+        meta["doc_len"] = doc_len
+        self._cache[doc_id] = meta
+        return meta
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self._entry(i)[0]
+
+    def __len__(self):
+        return self._count
+
+
+class SegmentIndex:
+    """Index read-only di atas segmen mmap; API sama dengan InvertedIndex."""
+
+    # segmen tidak pernah berubah setelah dibuka
+    version = 0
+
+    def __init__(self, dirpath):
+        self.dirpath = dirpath
+        self._terms_mm, self._n_terms, self.collection_len = _open_mmap(
+            os.path.join(dirpath, TERMS_FILE), _MAGIC_TERMS
+        )
+        self._postings_mm, self._n_postings, _ = _open_mmap(
+            os.path.join(dirpath, POSTINGS_FILE), _MAGIC_POSTINGS
+        )
+        self._docs_mm, n_docs, _ = _open_mmap(os.path.join(dirpath, DOCS_FILE), _MAGIC_DOCS)
+        self.documents = _DocTable(self._docs_mm, n_docs)
+
+        positions_path = os.path.join(dirpath, POSITIONS_FILE)
+        self.positional = os.path.exists(positions_path)
+        self._positions_mm = None
+        if self.positional:
+            self._positions_mm, _, _ = _open_mmap(positions_path, _MAGIC_POSITIONS)
+            self._positions_start = _HEADER.size + (self._n_terms + 1) * 8
+
+        self._term_blob_start = _HEADER.size + self._n_terms * _TERM_ENTRY.size
+        start = _HEADER.size
+        size = self._n_postings * 4
+        view = memoryview(self._postings_mm)
+        self._doc_ids = view[start:start + size].cast("I")
+        self._tfs = view[start + size:start + 2 * size].cast("I")
+        self._lookup_cache = {}
+
+    def __reduce__(self):
+        # mmap tidak dapat di-pickle: proses penerima membuka ulang segmen yang sama
+        return (self.__class__, (self.dirpath,))
+
+    def close(self):
+        self._doc_ids.release()
+        self._tfs.release()
+        for mm in (self._terms_mm, self._postings_mm, self._docs_mm, self._positions_mm):
+            if mm is not None:
+                mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _term_at(self, i):
+        term_off, cf, post_off, term_len, df = _TERM_ENTRY.unpack_from(
+            self._terms_mm, _HEADER.size + i * _TERM_ENTRY.size
+        )
+        start = self._term_blob_start + term_off
+        return self._terms_mm[start:start + term_len], cf, post_off, df
+
+    def _lookup(self, term):
+        """Binary search kamus term; hasil (cf, post_off, df, nomor term) atau None."""
+        if term in self._lookup_cache:
+            return self._lookup_cache[term]
+        key = term.encode("utf-8")
+        lo, hi = 0, self._n_terms
+        found = None
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mid_term, cf, post_off, df = self._term_at(mid)
+            if mid_term < key:
+                lo = mid + 1
+            elif mid_term > key:
+                hi = mid
+            else:
+                found = (cf, post_off, df, mid)
+                break
+        if len(self._lookup_cache) >= _LOOKUP_CACHE_SIZE:
+            self._lookup_cache.clear()
+        self._lookup_cache[term] = found
+        return found
+
+    def terms(self):
+        """Seluruh term dalam segmen (urut byte UTF-8)."""
+        for i in range(self._n_terms):
+            yield self._term_at(i)[0].decode("utf-8")
+
+    def get_postings_arrays(self, term):
+        """Akses cepat: (doc_ids, tfs) sebagai memoryview langsung di atas mmap."""
+        entry = self._lookup(term)
+        if entry is None:
+            return self._doc_ids[0:0], self._tfs[0:0]
+        _, post_off, df, _ = entry
+        doc_ids = self._doc_ids[post_off:post_off + df]
+        tfs = self._tfs[post_off:post_off + df]
+        if sys.byteorder != "little":
+            doc_ids, tfs = array("I", doc_ids), array("I", tfs)
+            doc_ids.byteswap()
+            tfs.byteswap()
+        return doc_ids, tfs
+
+    def get_postings(self, term):
+        """Ambil daftar posting untuk suatu term."""
+        doc_ids, tfs = self.get_postings_arrays(term)
+        return [{'doc_id': doc_id, 'tf': tf} for doc_id, tf in zip(doc_ids, tfs)]
+
+    def get_positions(self, term, doc_id):
+        """Posisi term di dokumen (urut naik); kosong bila segmen tidak positional."""
+        if not self.positional:
+            return []
+        entry = self._lookup(term)
+        if entry is None:
+            return []
+        _, post_off, df, ordinal = entry
+        doc_ids, _ = self.get_postings_arrays(term)
+        i = bisect_left(doc_ids, doc_id)
+        if i >= df or doc_ids[i] != doc_id:
+            return []
+        mm = self._positions_mm
+        (section,) = struct.unpack_from("<Q", mm, _HEADER.size + ordinal * 8)
+        section += self._positions_start
+        start, end = struct.unpack_from("<II", mm, section + i * 4)
+        blob_start = section + (df + 1) * 4
+        return decode_sorted(mm, blob_start + start, blob_start + end)
+
+    def get_collection_freq(self, term):
+        """Frekuensi term di seluruh koleksi."""
+        entry = self._lookup(term)
+        return entry[0] if entry else 0
+
+    def get_doc_len(self, doc_id):
+        """Panjang dokumen (jumlah token)."""
+        return self.documents.doc_len(doc_id)
+
+    def get_collection_len(self):
+        """Total token dalam koleksi."""
+        return self.collection_len
@@ -0,0 +1,106 @@
+"""Pembagian index menjadi beberapa shard segmen dengan statistik koleksi global.
+
+Setiap shard adalah segmen biasa (lihat segment.py) yang hanya memuat
+posting dokumen miliknya, tetapi cf setiap term, daftar term dan
+collection_len tetap milik seluruh koleksi. Dengan begitu p(t|C) di setiap
+shard sama persis dengan index tunggal dan skor Dirichlet dapat dibandingkan
+(digabung) antar shard tanpa koreksi.
+"""
+import json
+import os
+from array import array
+from bisect import bisect_left
+
+from src.indexing.segment import write_segment
+
+MANIFEST_FILE = "shards.json"
+
+
+class ShardView:
+    """Tampilan satu shard atas index global, untuk write_segment.
+
+    doc_ids: himpunan doc_id milik shard. Posting difilter ke dokumen shard,
+    sedangkan terms(), get_collection_freq dan get_collection_len diteruskan
+    dari index global.
+    """
+
+    def __init__(self, index, doc_ids):
+        self.index = index
+        self.doc_ids = array('I', sorted(doc_ids))
+        self.documents = {doc_id: index.documents[doc_id] for doc_id in self.doc_ids}
+        self.positional = getattr(index, 'positional', False)
+
+    def _owns(self, doc_id):
+        i = bisect_left(self.doc_ids, doc_id)
+        return i < len(self.doc_ids) and self.doc_ids[i] == doc_id
+
+    def terms(self):
+        return self.index.terms()
+
+    def get_postings_arrays(self, term):
+        get_arrays = getattr(self.index, 'get_postings_arrays', None)
+        if get_arrays is not None:
+            pairs = zip(*get_arrays(term))
+        else:
+            pairs = ((p['doc_id'], p['tf']) for p in self.index.get_postings(term))
+        doc_ids, tfs = array('I'), array('I')
+        for doc_id, tf in pairs:
+            if self._owns(doc_id):
+                doc_ids.append(doc_id)
+                tfs.append(tf)
+        return doc_ids, tfs
+
+    def get_postings(self, term):
+        doc_ids, tfs = self.get_postings_arrays(term)
+        return [{'doc_id': doc_id, 'tf': tf} for doc_id, tf in zip(doc_ids, tfs)]
+
+    def get_positions(self, term, doc_id):
+        return self.index.get_positions(term, doc_id)
+
+    def get_collection_freq(self, term):
+        return self.index.get_collection_freq(term)
+
+    def get_doc_len(self, doc_id):
+        return self.index.get_doc_len(doc_id)
+
+    def get_collection_len(self):
+        return self.index.get_collection_len()
+
+
+def partition_documents(doc_ids, n_shards):
+    """Bagi doc_id (urut) secara round-robin agar ukuran shard seimbang."""
+    shards = [[] for _ in range(n_shards)]
+    for i, doc_id in enumerate(sorted(doc_ids)):
+        shards[i % n_shards].append(doc_id)
+    return shards
+
+
+def write_shards(index, dirpath, n_shards):
+    """Tulis index sebagai n_shards segmen di dirpath + manifest; hasil daftar folder shard."""
+    if n_shards < 1:
+        raise ValueError("n_shards harus >= 1")
+    os.makedirs(dirpath, exist_ok=True)
+    names = []
+    for i, doc_ids in enumerate(partition_documents(index.documents, n_shards)):
+        name = f"shard-{i:03d}"
+        write_segment(ShardView(index, doc_ids), os.path.join(dirpath, name))
+        names.append(name)
+
+    manifest = {
+        "n_shards": n_shards,
+        "shards": names,
+        "collection_len": index.get_collection_len(),
+        "documents": len(index.documents),
+    }
+    tmp = os.path.join(dirpath, MANIFEST_FILE + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(dirpath, MANIFEST_FILE))
+    return [os.path.join(dirpath, name) for name in names]
+
+
+def read_manifest(dirpath):
+    """Daftar folder shard dari manifest di dirpath."""
+    with open(os.path.join(dirpath, MANIFEST_FILE), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    return [os.path.join(dirpath, name) for name in manifest["shards"]]
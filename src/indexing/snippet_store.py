@@ -0,0 +1,255 @@
+"""Penyimpanan teks dokumen terkompresi untuk snippet pratinjau.
+
+Teks mentah hasil ekstraksi disimpan sekali saat indexing, setelah spasi
+dinormalisasi (sama dengan get_preview_snippet), dalam blok-blok zlib
+berukuran tetap di SQLite. Membaca potongan teks hanya mendekompresi blok
+yang dibutuhkan, dan pencarian term berhenti di blok pertama yang cocok,
+sehingga snippet dapat dibuat tanpa membuka file PDF/DOCX asli.
+
+Untuk setiap blok juga disimpan jumlah token sebelum blok dan posisi
+karakter token pertama di blok, sehingga jendela token dari index
+positional (best_passage) dipetakan ke teks dengan membaca blok yang
+dicakup jendela saja.
+"""
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+
+from src.preprocessing.normalizer import iter_token_spans
+
+DEFAULT_BLOCK_CHARS = 16 * 1024
+
+
+def normalize_whitespace(text):
+    """Baris baru dan spasi berurutan menjadi satu spasi."""
+    return ' '.join(text.split()) if text else ""
+
+
+def _token_index(text, size):
+    """Per blok: (jumlah token sebelum awal blok, awal token pertama di/sesudah blok), diratakan."""
+    index = array('q')
+    count = 0
+    boundary = 0
+    for start, _ in iter_token_spans(text):
+        while boundary <= start:
+            index.extend((count, start))
+            boundary += size
+        count += 1
+    while boundary < len(text):
+        index.extend((count, len(text)))
+        boundary += size
+    return index
+
+
+class SnippetStore:
+    """Teks ternormalisasi per dokumen, dikunci hash isi file.
+
+    path=":memory:" (default) menyimpan di memori proses; path file membuat
+    store persisten yang dapat dipakai ulang bersama index yang disimpan.
+    """
+
+    def __init__(self, path=":memory:", block_chars=DEFAULT_BLOCK_CHARS, cache_blocks=64):
+        directory = os.path.dirname(path) if path != ":memory:" else ""
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.block_chars = block_chars
+        self.cache_blocks = cache_blocks
+        self._blocks = OrderedDict()  # (key, nomor blok) -> str, LRU
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS texts ("
+            " key TEXT PRIMARY KEY,"
+            " length INTEGER NOT NULL,"
+            " block_chars INTEGER NOT NULL,"
+            " n_blocks INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS blocks ("
+            " key TEXT NOT NULL,"
+            " block INTEGER NOT NULL,"
+            " data BLOB NOT NULL,"
+            " PRIMARY KEY (key, block))"
+        )
+        # tabel terpisah agar store lama tetap terbaca (tanpa indeks: baca teks utuh)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS token_index ("
+            " key TEXT PRIMARY KEY,"
+            " data BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM texts").fetchone()[0]
+
+    def put(self, key, text, normalized=False):
+        """Simpan teks dokumen (dinormalisasi dulu kecuali normalized=True)."""
+        if not normalized:
+            text = normalize_whitespace(text)
+        size = self.block_chars
+        rows = [
+            (key, n, zlib.compress(text[start:start + size].encode("utf-8")))
+            for n, start in enumerate(range(0, len(text), size))
+        ]
+        token_index = _token_index(text, size).tobytes()
+        with self._lock:
+            self._drop_cached(key)
+            self._conn.execute("DELETE FROM blocks WHERE key = ?", (key,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO texts (key, length, block_chars, n_blocks) VALUES (?, ?, ?, ?)",
+                (key, len(text), size, len(rows)),
+            )
+            self._conn.executemany("INSERT INTO blocks (key, block, data) VALUES (?, ?, ?)", rows)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO token_index (key, data) VALUES (?, ?)", (key, token_index)
+            )
+            self._conn.commit()
+
+    def contains(self, key):
+        return self._info(key) is not None
+
+    def length(self, key):
+        """Panjang teks ternormalisasi (karakter); None bila tidak tersimpan."""
+        info = self._info(key)
+        return None if info is None else info[0]
+
+    def discard(self, key):
+        with self._lock:
+            self._drop_cached(key)
+            self._conn.execute("DELETE FROM blocks WHERE key = ?", (key,))
+            self._conn.execute("DELETE FROM token_index WHERE key = ?", (key,))
+            self._conn.execute("DELETE FROM texts WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def retain(self, keys):
+        """Buang semua teks yang kuncinya tidak ada di keys (mis. dokumen terhapus)."""
+        keep = set(keys)
+        with self._lock:
+            stale = [k for (k,) in self._conn.execute("SELECT key FROM texts") if k not in keep]
+        for key in stale:
+            self.discard(key)
+        return len(stale)
+
+    def _info(self, key):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT length, block_chars, n_blocks FROM texts WHERE key = ?", (key,)
+            ).fetchone()
+
+    def _drop_cached(self, key):
+        for cached_key in [k for k in self._blocks if k[0] == key]:
+            del self._blocks[cached_key]
+
+    def _block(self, key, n):
+        with self._lock:
+            text = self._blocks.get((key, n))
+            if text is not None:
+                self._blocks.move_to_end((key, n))
+                return text
+            row = self._conn.execute(
+                "SELECT data FROM blocks WHERE key = ? AND block = ?", (key, n)
+            ).fetchone()
+            text = zlib.decompress(row[0]).decode("utf-8") if row else ""
+            self._blocks[(key, n)] = text
+            if len(self._blocks) > self.cache_blocks:
+                self._blocks.popitem(last=False)
+            return text
+
+    def read(self, key, start, end):
+        """Teks[start:end] dengan hanya mendekompresi blok yang tercakup."""
+        info = self._info(key)
+        if info is None:
+            raise KeyError(key)
+        length, size, _ = info
+        start, end = max(0, start), min(length, end)
+        if start >= end:
+            return ""
+        parts = []
+        for n in range(start // size, (end - 1) // size + 1):
+            base = n * size
+            parts.append(self._block(key, n)[max(start - base, 0):end - base])
+        return "".join(parts)
+
+    def token_span(self, key, first, last):
+        """(start, end) karakter token ke-first sampai ke-last (urutan iter_token_spans), atau None.
+
+        Hanya blok dari token first sampai sesudah token last yang didekompresi.
+        """
+        info = self._info(key)
+        if info is None:
+            raise KeyError(key)
+        length, size, _ = info
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM token_index WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return self._token_span_full(key, first, last, length)  # store lama tanpa indeks token
+        index = array('q')
+        index.frombytes(row[0])
+        before = index[0::2]
+        if not before or last < first:
+            return None
+        n = bisect_right(before, first) - 1
+        m = bisect_right(before, last) - 1
+        base, count = index[2 * n + 1], before[n]
+        # token terakhir dapat melewati batas bloknya: ikutkan satu blok sesudahnya
+        end = min(length, (m + 2) * size)
+        start = None
+        for span_start, span_end in iter_token_spans(self.read(key, base, end)):
+            if count == first:
+                start = base + span_start
+            if count == last:
+                if base + span_end == end < length:
+                    break  # token mungkin terpotong di ujung bacaan
+                return None if start is None else (start, base + span_end)
+            count += 1
+        if end < length:
+            # token lebih panjang dari satu blok
+            return self._token_span_full(key, first, last, length)
+        return None
+
+    def _token_span_full(self, key, first, last, length):
+        start = None
+        for i, (span_start, span_end) in enumerate(iter_token_spans(self.read(key, 0, length))):
+            if i == first:
+                start = span_start
+            if i == last:
+                return None if start is None else (start, span_end)
+        return None
+
+    def find(self, key, term):
+        """(start, end) kemunculan pertama term (tanpa beda huruf besar/kecil) atau None."""
+        info = self._info(key)
+        if info is None:
+            raise KeyError(key)
+        _, size, n_blocks = info
+        if not term:
+            return (0, 0)
+        pattern = re.compile(re.escape(term), re.IGNORECASE)
+        # kecocokan IGNORECASE sepanjang term, jadi sisa blok sebelumnya cukup len(term)-1
+        overlap = len(term) - 1
+        tail = ""
+        for n in range(n_blocks):
+            block = self._block(key, n)
+            match = pattern.search(tail + block)
+            if match:
+                offset = n * size - len(tail)
+                return offset + match.start(), offset + match.end()
+            tail = (tail + block)[-overlap:] if overlap else ""
+        return None
@@ -1,96 +1,519 @@
 """Pipeline utilitas untuk preprocessing dan indexing dokumen."""
+import hashlib
 import os
-from src.utils.utils import baca_txt, baca_docx, baca_pdf, bersihkan_text, tokenizing
-from src.preprocessing.stopword import remove_stopwords
-from src.preprocessing.tala_stemmer import Stem_Tala_tokenizing
+import time
+from collections import Counter, deque
+from contextlib import nullcontext
+from src.utils.utils import bersihkan_text, tokenizing
+from src.utils.extractors import SUPPORTED_EXT, extract_text, iter_text
+from src.utils.instrumentation import METRICS, Metrics, TimedIterator
+from src.preprocessing.stopword import remove_stopwords, get_stopwords_list, use_stopwords, stopwords_fingerprint
+from src.preprocessing.tala_stemmer import Stem_Tala_tokenizing, stem_cache
+from src.preprocessing.normalizer import iter_clean_tokens
 from src.indexing.inverted_index import InvertedIndex
+from src.indexing.columnar_index import ColumnarInvertedIndex
+from src.indexing.compressed_index import CompressedInvertedIndex
+from src.indexing.snippet_store import normalize_whitespace
 from src.query.query_processor import QueryProcessor
 from src.retrieval.retrieval_engine import RetrievalEngine
 
-SUPPORTED_EXT = {".txt", ".docx", ".pdf"}
+# Naikkan bila aturan preprocessing berubah agar entri PreprocessCache lama tidak dipakai
+PREPROCESS_VERSION = "tala-1"
 
+# layout index dalam memori untuk build_models (index positional selalu "dict")
+INDEX_LAYOUTS = {
+    "dict": InvertedIndex,
+    "columnar": ColumnarInvertedIndex,
+    "compressed": CompressedInvertedIndex,
+}
 
-def _read_file(filepath, ext):
-    if ext == ".txt":
-        return baca_txt(filepath)
-    if ext == ".docx":
-        return baca_docx(filepath)
-    if ext == ".pdf":
-        return baca_pdf(filepath)
-    raise ValueError(f"Ekstensi tidak didukung: {ext}")
+# True di proses pekerja pool: durasi dicatat lokal lalu dikirim balik bersama dokumen
+_IN_WORKER = False
+_UNTIMED = Metrics(enabled=False)
 
 
-def preprocess_text(text):
-    """Bersihkan, tokenisasi, hapus stopword, dan stemming Tala."""
-    clean_text = bersihkan_text(text)
-    tokens = tokenizing(clean_text)
-    tokens_no_stop = remove_stopwords(tokens)
-    tokens_stem = Stem_Tala_tokenizing(tokens_no_stop)
+def preprocess_config_version():
+    """Versi konfigurasi preprocessing; bagian dari kunci PreprocessCache."""
+    return f"{PREPROCESS_VERSION}:{stopwords_fingerprint()}"
+
+
+def preprocess_text(text, metrics=None):
+    """Bersihkan, tokenisasi, hapus stopword, dan stemming Tala.
+
+    metrics (Metrics) mencatat durasi setiap langkah sebagai ingest.clean,
+    ingest.tokenize, ingest.stopword dan ingest.stem.
+    """
+    metrics = metrics or _UNTIMED
+    with metrics.stage("ingest.clean"):
+        clean_text = bersihkan_text(text)
+    with metrics.stage("ingest.tokenize"):
+        tokens = tokenizing(clean_text)
+    with metrics.stage("ingest.stopword"):
+        tokens_no_stop = remove_stopwords(tokens)
+    with metrics.stage("ingest.stem"):
+        tokens_stem = Stem_Tala_tokenizing(tokens_no_stop)
     return tokens_stem, tokens, tokens_no_stop, clean_text
 
 
-def process_directory(directory, ekstensi_file=None, progress_cb=None):
-    """Proses seluruh dokumen dalam folder menjadi daftar dokumen terproses."""
-    ekstensi = ekstensi_file or SUPPORTED_EXT
-    files = [
+def preprocess_counts(text, positions=None):
+    """Versi streaming preprocess_text: (term_counts, stats) tanpa menyimpan daftar token.
+
+    text boleh berupa string atau iterable potongan teks (extractors.iter_text).
+    Bila positions (dict) diberikan, posisi setiap term ikut dicatat ke
+    dalamnya: nomor urut token bersih, stopword tetap dihitung.
+    """
+    stopwords = get_stopwords_list()
+    stem = stem_cache.stem
+    term_counts = Counter()
+    n_tokens = n_no_stop = 0
+    for pos, token in enumerate(iter_clean_tokens(text)):
+        n_tokens += 1
+        if token in stopwords:
+            continue
+        n_no_stop += 1
+        term = stem(token)
+        term_counts[term] += 1
+        if positions is not None:
+            positions.setdefault(term, []).append(pos)
+    return term_counts, {
+        "tokens": n_tokens,
+        "after_stopword": n_no_stop,
+        "after_stem": n_no_stop,
+        "unique_stems": len(term_counts),
+    }
+
+
+def term_positions(tokens_raw, tokens_stem, stopwords=None):
+    """Posisi setiap term hasil stem pada daftar token bersih (sebelum stopword removal)."""
+    stopwords = get_stopwords_list() if stopwords is None else stopwords
+    kept = (pos for pos, token in enumerate(tokens_raw) if token not in stopwords)
+    positions = {}
+    for pos, term in zip(kept, tokens_stem):
+        positions.setdefault(term, []).append(pos)
+    return positions
+
+
+def file_hash(filepath):
+    """Hash isi file (sha1, dibaca per blok)."""
+    digest = hashlib.sha1()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_fingerprint(filepath):
+    """mtime (ns), ukuran dan hash isi; disimpan di metadata untuk re-scan inkremental."""
+    st = os.stat(filepath)
+    return {
+        "mtime": st.st_mtime_ns,
+        "size": st.st_size,
+        "hash": file_hash(filepath),
+    }
+
+
+def _list_files(directory, ekstensi):
+    return [
         (file, os.path.join(directory, file), os.path.splitext(file)[1].lower())
         for file in os.listdir(directory)
         if os.path.isfile(os.path.join(directory, file))
         and os.path.splitext(file)[1].lower() in ekstensi
     ]
 
-    processed_docs = []
-    total = len(files)
-
-    for idx, (filename, filepath, ext) in enumerate(files, 1):
-        try:
-            raw_text = _read_file(filepath, ext)
-            tokens_stem, tokens_raw, tokens_no_stop, clean_text = preprocess_text(raw_text)
-            
-            # Hitung kata dasar unik
-            unique_stems = set(tokens_stem)
-            
-            # Hitung frekuensi kata dasar (untuk tabel)
-            from collections import Counter
-            stem_freq = Counter(tokens_stem)
-            # Sort by frequency descending
-            stem_freq_sorted = sorted(stem_freq.items(), key=lambda x: x[1], reverse=True)
-
-            processed_docs.append({
+
+def _collect(chunks, parts):
+    """Teruskan potongan teks sambil menyimpannya ke parts."""
+    for chunk in chunks:
+        parts.append(chunk)
+        yield chunk
+
+
+def _with_metrics(doc, metrics):
+    """Lampirkan durasi lokal pekerja ke dokumen; _run_tasks menggabungkannya ke METRICS."""
+    if metrics is not METRICS and metrics.enabled:
+        doc["metrics"] = metrics.raw()
+    return doc
+
+
+def _process_file(task):
+    """Proses satu file; error dikembalikan (bukan dilempar) agar batch tetap jalan.
+
+    Mode lean hanya mengirim term_counts dan statistik: daftar token langsung
+    dibuang setelah dihitung, jadi ukuran hasil bergantung pada kosakata
+    dokumen, bukan panjangnya. extras dapat berisi "text" (teks ternormalisasi
+    untuk SnippetStore; diambil _run_tasks sebelum dokumen diteruskan),
+    "positions" (posisi term untuk index positional), "timings" (durasi per
+    tahap dikirim balik sebagai "metrics" bila berjalan di pool) dan "stages"
+    (preprocessing lean dipecah per langkah agar setiap langkah terukur).
+    """
+    idx, filename, filepath, ext, lean, fingerprint, extras = task
+    keep_text = "text" in extras
+    metrics = Metrics(enabled="timings" in extras) if _IN_WORKER else METRICS
+    try:
+        if not fingerprint:
+            with metrics.stage("ingest.hash"):
+                fingerprint = file_fingerprint(filepath)
+
+        if lean and "stages" in extras:
+            with metrics.stage("ingest.extract"):
+                raw_text = extract_text(filepath, ext)
+            tokens_stem, tokens_raw, tokens_no_stop, _ = preprocess_text(raw_text, metrics)
+            term_counts = Counter(tokens_stem)
+            stats = {
+                "tokens": len(tokens_raw),
+                "after_stopword": len(tokens_no_stop),
+                "after_stem": len(tokens_stem),
+                "unique_stems": len(term_counts),
+            }
+            positions = term_positions(tokens_raw, tokens_stem) if "positions" in extras else None
+            text = normalize_whitespace(raw_text) if keep_text else None
+            del raw_text, tokens_stem, tokens_raw, tokens_no_stop
+        elif lean:
+            # teks ditokenisasi per potongan (halaman/paragraf) tanpa disusun utuh,
+            # kecuali bila perlu disimpan untuk SnippetStore. Ekstraksi dan
+            # preprocessing berselang-seling, jadi durasinya dipisah lewat TimedIterator.
+            positions = {} if "positions" in extras else None
+            chunks = TimedIterator(iter_text(filepath, ext))
+            parts = [] if keep_text else None
+            start = time.perf_counter()
+            term_counts, stats = preprocess_counts(_collect(chunks, parts) if keep_text else chunks, positions)
+            metrics.observe("ingest.extract", chunks.elapsed)
+            metrics.observe("ingest.preprocess", time.perf_counter() - start - chunks.elapsed)
+            text = normalize_whitespace("".join(parts)) if keep_text else None
+            del parts
+
+        if lean:
+            metrics.incr("ingest.tokens", stats["tokens"])
+            doc = {
                 "id": idx,
-                "tokens": tokens_stem,
+                "term_counts": term_counts,
+                "doc_len": stats["after_stem"],
                 "metadata": {
                     "filename": filename,
                     "filepath": filepath,
+                    **fingerprint,
                 },
-                "stats": {
-                    "tokens": len(tokens_raw),
-                    "after_stopword": len(tokens_no_stop),
-                    "after_stem": len(tokens_stem),
-                    "unique_stems": len(unique_stems),
-                },
-                "preprocessing": {
-                    "raw_text": raw_text[:2000],  # Simpan 2000 karakter pertama
-                    "clean_text": clean_text[:2000],
-                    "tokens_raw": tokens_raw[:100],  # Simpan 100 token pertama
-                    "tokens_no_stop": tokens_no_stop[:100],
-                    "tokens_stem": tokens_stem[:100],
-                    "stem_frequency": stem_freq_sorted,  # Full frequency table sorted
-                },
-            })
+                "stats": stats,
+            }
+            if positions is not None:
+                doc["positions"] = positions
+            if keep_text:
+                doc["text"] = text
+            return _with_metrics(doc, metrics), None
+
+        with metrics.stage("ingest.extract"):
+            raw_text = extract_text(filepath, ext)
+        tokens_stem, tokens_raw, tokens_no_stop, clean_text = preprocess_text(raw_text, metrics)
+        metrics.incr("ingest.tokens", len(tokens_raw))
+
+        # Hitung kata dasar unik
+        unique_stems = set(tokens_stem)
+
+        # Hitung frekuensi kata dasar (untuk tabel)
+        stem_freq = Counter(tokens_stem)
+        # Sort by frequency descending
+        stem_freq_sorted = sorted(stem_freq.items(), key=lambda x: x[1], reverse=True)
+
+        doc = {
+            "id": idx,
+            "tokens": tokens_stem,
+            "metadata": {
+                "filename": filename,
+                "filepath": filepath,
+                **fingerprint,
+            },
+            "stats": {
+                "tokens": len(tokens_raw),
+                "after_stopword": len(tokens_no_stop),
+                "after_stem": len(tokens_stem),
+                "unique_stems": len(unique_stems),
+            },
+            "preprocessing": {
+                "raw_text": raw_text[:2000],  # Simpan 2000 karakter pertama
+                "clean_text": clean_text[:2000],
+                "tokens_raw": tokens_raw[:100],  # Simpan 100 token pertama
+                "tokens_no_stop": tokens_no_stop[:100],
+                "tokens_stem": tokens_stem[:100],
+                "stem_frequency": stem_freq_sorted,  # Full frequency table sorted
+            },
+        }
+        if "positions" in extras:
+            doc["positions"] = term_positions(tokens_raw, tokens_stem)
+        if keep_text:
+            doc["text"] = normalize_whitespace(raw_text)
+        return _with_metrics(doc, metrics), None
+    except Exception as exc:
+        return None, str(exc)
+
+
+def _cache_entry(doc):
+    """Bentuk entri PreprocessCache dari dokumen terproses (lean maupun lengkap)."""
+    term_counts = doc.get("term_counts") or Counter(doc["tokens"])
+    entry = {"term_counts": dict(term_counts), "stats": doc["stats"]}
+    if "preprocessing" in doc:
+        entry["preprocessing"] = {
+            key: value for key, value in doc["preprocessing"].items() if key != "stem_frequency"
+        }
+    if "positions" in doc:
+        entry["positions"] = doc["positions"]
+    return entry
+
 
+def _doc_from_cache(task, entry):
+    """Susun ulang dokumen terproses dari entri cache; None bila entri kurang lengkap."""
+    idx, filename, filepath, ext, lean, fingerprint, extras = task
+    if not lean and "preprocessing" not in entry:
+        return None
+    if "positions" in extras and "positions" not in entry:
+        return None
+    term_counts = Counter(entry["term_counts"])
+    doc = {
+        "id": idx,
+        "term_counts": term_counts,
+        "doc_len": entry["stats"]["after_stem"],
+        "metadata": {
+            "filename": filename,
+            "filepath": filepath,
+            **fingerprint,
+        },
+        "stats": entry["stats"],
+    }
+    if "positions" in extras:
+        doc["positions"] = entry["positions"]
+    if not lean:
+        doc["preprocessing"] = {
+            **entry["preprocessing"],
+            "stem_frequency": sorted(term_counts.items(), key=lambda x: x[1], reverse=True),
+        }
+    return doc
+
+
+def _init_worker(stopwords):
+    """Samakan set stopword proses pool dengan proses pemanggil (juga saat spawn)."""
+    global _IN_WORKER
+    _IN_WORKER = True
+    use_stopwords(stopwords)
+
+
+def _ordered_map(executor, fn, tasks, window):
+    """Seperti executor.map, tetapi paling banyak `window` tugas berjalan sekaligus."""
+    pending = deque()
+    for task in tasks:
+        pending.append(executor.submit(fn, task))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _run_tasks(tasks, progress_cb=None, workers=None, cache=None, snippets=None, positional=False):
+    """Jalankan _process_file untuk setiap tugas (serial atau process pool), berurutan.
+
+    Dengan cache (PreprocessCache), setiap file di-hash terlebih dahulu; file
+    yang hasilnya sudah tersimpan tidak dibaca ulang dan hanya sisanya yang
+    dikirim ke pool. Hasil baru disimpan ke cache. Dengan snippets
+    (SnippetStore), teks ternormalisasi setiap file yang dibaca disimpan ke
+    store dengan kunci hash isi file; file yang teksnya belum ada di store
+    selalu dibaca ulang walaupun term_counts-nya ada di cache. positional=True
+    menambahkan posisi term ("positions") ke setiap dokumen.
+    """
+    total = len(tasks)
+    version = preprocess_config_version()
+    extras = frozenset(
+        name for name, wanted in (
+            ("text", snippets is not None),
+            ("positions", positional),
+            ("timings", METRICS.enabled),
+            ("stages", METRICS.enabled and METRICS.detailed),
+        ) if wanted
+    )
+    tasks = [task[:6] + (extras,) for task in tasks]
+
+    cached = set()
+    if cache is not None:
+        prepared = []
+        for pos, task in enumerate(tasks):
+            try:
+                fingerprint = file_fingerprint(task[2])
+            except OSError:
+                fingerprint = None  # error dilaporkan oleh _process_file
+            if (fingerprint
+                    and (snippets is None or snippets.contains(fingerprint["hash"]))
+                    and cache.contains(fingerprint["hash"], version)):
+                cached.add(pos)
+            prepared.append(task[:5] + (fingerprint, extras))
+        tasks = prepared
+
+    misses = [task for pos, task in enumerate(tasks) if pos not in cached]
+    if workers and workers > 1 and len(misses) > 1:
+        # multiprocessing cukup mahal diimpor; hanya dimuat bila process pool dipakai
+        from concurrent.futures import ProcessPoolExecutor
+
+        executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(get_stopwords_list(),)
+        )
+        outputs = _ordered_map(executor, _process_file, misses, window=workers * 4)
+    else:
+        executor = None
+        outputs = map(_process_file, misses)
+
+    try:
+        for done, task in enumerate(tasks, 1):
+            doc = None
+            if done - 1 in cached:
+                entry = cache.get(task[5]["hash"], version)
+                doc = _doc_from_cache(task, entry) if entry else None
+                if doc:
+                    METRICS.incr("ingest.cache_hits")
+                # entri hilang/kurang lengkap: proses langsung di proses ini
+                doc, error = (doc, None) if doc else _process_file(task)
+            else:
+                doc, error = next(outputs)
+                if error is None and cache is not None:
+                    cache.put(doc["metadata"]["hash"], version, _cache_entry(doc))
+            if error is None and "text" in doc:
+                snippets.put(doc["metadata"]["hash"], doc.pop("text"), normalized=True)
+            if error is not None:
+                METRICS.incr("ingest.errors")
+                print(f"Error processing {task[1]}: {error}")
+                continue
+            METRICS.merge(doc.pop("metrics", None))
+            METRICS.incr("ingest.documents")
+            METRICS.incr("ingest.bytes", doc["metadata"].get("size", 0))
+            yield doc
             if progress_cb and total:
-                progress_cb(idx, total)
-        except Exception as exc:  # pragma: no cover - hanya logging
-            print(f"Error processing {filename}: {exc}")
+                progress_cb(done, total)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def iter_processed_documents(directory, ekstensi_file=None, progress_cb=None, workers=None, lean=True, cache=None,
+                             snippets=None, positional=False):
+    """Generator dokumen terproses, satu per file, sesuai urutan file.
+
+    Dengan lean=True (default) setiap dokumen berisi term_counts dan doc_len
+    alih-alih daftar token, sehingga dapat langsung dikonsumsi oleh
+    InvertedIndex.build_index tanpa menampung seluruh koleksi di memori.
+    workers > 1 membagi file ke process pool dengan jumlah tugas berjalan
+    yang dibatasi; progress_cb tetap dipanggil dari proses pemanggil.
+    cache (PreprocessCache) melewati ekstraksi dan preprocessing untuk file
+    yang isinya tidak berubah. snippets (SnippetStore) menyimpan teks setiap
+    dokumen agar pratinjau tidak perlu membaca file asli lagi. positional=True
+    menyertakan posisi term untuk InvertedIndex(positional=True).
+    """
+    ekstensi = ekstensi_file or SUPPORTED_EXT
+    files = _list_files(directory, ekstensi)
+    tasks = [
+        (idx, filename, filepath, ext, lean, None)
+        for idx, (filename, filepath, ext) in enumerate(files, 1)
+    ]
+    yield from _run_tasks(tasks, progress_cb, workers, cache, snippets, positional)
+
+
+def process_directory(directory, ekstensi_file=None, progress_cb=None, workers=None, cache=None, snippets=None,
+                      positional=False):
+    """Proses seluruh dokumen dalam folder menjadi daftar dokumen terproses.
+
+    workers > 1 membagi file ke process pool; hasil tetap diterima sesuai
+    urutan file dan progress_cb tetap dipanggil dari proses pemanggil.
+    """
+    return list(iter_processed_documents(
+        directory, ekstensi_file, progress_cb, workers=workers, lean=False, cache=cache, snippets=snippets,
+        positional=positional,
+    ))
+
+
+def rescan_directory(directory, inverted_index, ekstensi_file=None, progress_cb=None, workers=None, lean=True, cache=None,
+                     snippets=None, lock=None):
+    """Sinkronkan index dengan isi folder tanpa membangun ulang seluruh index.
+
+    File yang mtime dan ukurannya sama dilewati; bila berbeda tetapi hash isi
+    sama, hanya metadata yang diperbarui. File baru ditambahkan, file berubah
+    diproses ulang dengan doc_id yang sama, dan file yang hilang dihapus.
+    Mengembalikan dict berisi dokumen 'added', 'updated', doc_id 'removed'
+    dan jumlah 'unchanged'.
+
+    lock (mis. threading.RLock yang juga dipegang pencarian) diambil sekali
+    selama index diubah, setelah semua file selesai diproses; pencarian dari
+    thread lain tidak pernah melihat index yang setengah diperbarui.
+    """
+    ekstensi = ekstensi_file or SUPPORTED_EXT
+    directory = os.path.normpath(directory)
+    known = {
+        os.path.normpath(meta.get('filepath', '')): doc_id
+        for doc_id, meta in inverted_index.documents.items()
+        if os.path.dirname(os.path.normpath(meta.get('filepath', ''))) == directory
+    }
+    next_id = max(inverted_index.documents, default=0) + 1
+
+    tasks = []
+    unchanged = 0
+    seen = set()
+    for filename, filepath, ext in _list_files(directory, ekstensi):
+        filepath = os.path.normpath(filepath)
+        seen.add(filepath)
+        doc_id = known.get(filepath)
+        if doc_id is None:
+            tasks.append((next_id, filename, filepath, ext, lean, None))
+            next_id += 1
+            continue
+
+        meta = inverted_index.documents[doc_id]
+        st = os.stat(filepath)
+        if meta.get('mtime') == st.st_mtime_ns and meta.get('size') == st.st_size:
+            unchanged += 1
+            continue
+        if meta.get('hash') == file_hash(filepath):
+            meta['mtime'], meta['size'] = st.st_mtime_ns, st.st_size
+            unchanged += 1
+            continue
+        tasks.append((doc_id, filename, filepath, ext, lean, None))
+
+    changes = {'added': [], 'updated': [], 'removed': [], 'unchanged': unchanged}
+    positional = getattr(inverted_index, 'positional', False)
+    docs = list(_run_tasks(tasks, progress_cb, workers, cache, snippets, positional))
+    with lock or nullcontext():
+        for doc in docs:
+            with METRICS.stage("ingest.index_update"):
+                if doc['id'] in inverted_index.documents:
+                    inverted_index.update_document(doc)
+                    changes['updated'].append(doc)
+                else:
+                    inverted_index.add_document(doc)
+                    changes['added'].append(doc)
+
+        for filepath, doc_id in known.items():
+            if filepath not in seen:
+                inverted_index.remove_document(doc_id)
+                changes['removed'].append(doc_id)
+
+    return changes
 
-    return processed_docs
 
+def build_models(processed_docs, positional=False, layout="dict"):
+    """Bangun inverted index, query processor, dan retrieval engine (LM Dirichlet).
 
-def build_models(processed_docs):
-    """Bangun inverted index, query processor, dan retrieval engine (LM Dirichlet)."""
-    inverted_index = InvertedIndex()
-    inverted_index.build_index(processed_docs)
+    processed_docs boleh berupa list maupun generator iter_processed_documents().
+    positional=True membangun index dengan posisi term (dokumen harus memuat
+    'positions') untuk kueri frasa dan kedekatan. layout memilih kelas index
+    (lihat INDEX_LAYOUTS); "columnar" dan "compressed" (delta + VByte) jauh
+    lebih hemat memori tetapi tidak mendukung posisi maupun pembaruan per
+    dokumen.
+    """
+    if layout not in INDEX_LAYOUTS:
+        raise ValueError(f"Layout index tidak dikenal: {layout}")
+    if layout == "dict":
+        inverted_index = InvertedIndex(positional=positional)
+    elif positional:
+        raise ValueError(f"Layout {layout} tidak menyimpan posisi term")
+    else:
+        inverted_index = INDEX_LAYOUTS[layout]()
+    # waktu menunggu dokumen dari generator (ekstraksi/preprocessing) tidak dihitung
+    docs = TimedIterator(processed_docs)
+    start = time.perf_counter()
+    inverted_index.build_index(docs)
+    METRICS.observe("ingest.index_build", time.perf_counter() - start - docs.elapsed)
 
     query_processor = QueryProcessor()
     engine = RetrievalEngine(inverted_index)
@@ -0,0 +1,119 @@
+"""Cache hasil preprocessing di disk (SQLite), dikunci hash isi file + versi konfigurasi."""
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class PreprocessCache:
+    """Menyimpan term_counts, statistik dan pratinjau preprocessing per file.
+
+    Kunci = (hash isi file, versi konfigurasi preprocessing), sehingga file
+    yang sama di lokasi berbeda tetap kena cache, dan perubahan aturan
+    preprocessing otomatis membuat entri lama tidak terpakai. Total ukuran
+    dibatasi max_bytes; entri yang paling lama tidak dipakai dibuang dahulu.
+    """
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " hash TEXT NOT NULL,"
+            " version TEXT NOT NULL,"
+            " value BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_used REAL NOT NULL,"
+            " PRIMARY KEY (hash, version))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def contains(self, file_hash, version):
+        """Cek keberadaan entri tanpa membacanya; hasil negatif dihitung sebagai miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM entries WHERE hash = ? AND version = ?", (file_hash, version)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+        return row is not None
+
+    def get(self, file_hash, version):
+        """Entri tersimpan (dict) atau None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM entries WHERE hash = ? AND version = ?", (file_hash, version)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE entries SET last_used = ? WHERE hash = ? AND version = ?",
+                (time.time(), file_hash, version),
+            )
+            self._conn.commit()
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, file_hash, version, entry):
+        """Simpan entri lalu buang entri terlama bila melewati max_bytes."""
+        value = zlib.compress(json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (hash, version, value, size, last_used)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (file_hash, version, value, len(value), time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT hash, version, size FROM entries ORDER BY last_used"
+        ).fetchall()
+        for file_hash, version, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute(
+                "DELETE FROM entries WHERE hash = ? AND version = ?", (file_hash, version)
+            )
+            total -= size
+
+    def size_bytes(self):
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def stats(self):
+        """Jumlah hit/miss dan hit rate sejak cache dibuka."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size_bytes": self.size_bytes(),
+        }
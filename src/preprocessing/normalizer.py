@@ -0,0 +1,85 @@
+"""Normalizer satu lintasan: cleaning + tokenizing + stopword removal.
+
+Hasilnya sama persis dengan rantai lama
+``remove_stopwords(tokenizing(bersihkan_text(text)))``, tetapi tabel
+translate dikompilasi sekali saat import, teks hanya disalin dua kali
+(lower + translate) dan token dihasilkan satu per satu (lazy). Input boleh
+berupa string atau iterable potongan teks (misalnya per halaman PDF).
+"""
+import re
+import string
+
+from src.preprocessing.stopword import get_stopwords_list
+
+# karakter yang dihapus bersihkan_text selain string.punctuation
+_EXTRA_REMOVED = "…—–"
+
+
+class _CleanTable(dict):
+    """Tabel str.translate: tanda baca dan digit dihapus.
+
+    Digit Unicode non-ASCII (kategori Nd, sama dengan regex \\d) tidak
+    didaftarkan di awal; karakter itu dikenali saat pertama kali ditemui.
+    """
+
+    def __missing__(self, codepoint):
+        value = None if chr(codepoint).isdecimal() else codepoint
+        self[codepoint] = value
+        return value
+
+
+_CLEAN_TABLE = _CleanTable.fromkeys(map(ord, string.punctuation + _EXTRA_REMOVED + string.digits))
+_TOKEN_RE = re.compile(r"\S+")
+_TRAILING_WORD_RE = re.compile(r"\S*\Z")
+# token utuh yang masih menyisakan karakter setelah cleaning (\d = digit Unicode, sama dengan _CleanTable)
+_KEPT_TOKEN_RE = re.compile(r"(?<!\S)(?=\S*?[^\s" + re.escape(string.punctuation + _EXTRA_REMOVED) + r"\d])\S+")
+
+
+def _clean_tokens(text):
+    for match in _TOKEN_RE.finditer(text.lower().translate(_CLEAN_TABLE)):
+        yield match.group()
+
+
+def iter_clean_tokens(source):
+    """Token hasil bersihkan_text + tokenizing, satu per satu.
+
+    Untuk input berupa potongan teks, sisa kata di ujung potongan disambung
+    ke potongan berikutnya sehingga batas potongan tidak memecah kata.
+    """
+    if not source:
+        return
+    if not isinstance(source, str) and not hasattr(source, "__iter__"):
+        source = str(source)
+    if isinstance(source, str):
+        yield from _clean_tokens(source)
+        return
+
+    carry = ""
+    for chunk in source:
+        if not chunk:
+            continue
+        buf = carry + str(chunk)
+        cut = _TRAILING_WORD_RE.search(buf).start()
+        carry = buf[cut:]
+        if cut:
+            yield from _clean_tokens(buf[:cut])
+    if carry:
+        yield from _clean_tokens(carry)
+
+
+def iter_tokens(source, stopwords=None):
+    """Token setelah cleaning, tokenizing dan stopword removal, satu per satu."""
+    stopwords = get_stopwords_list() if stopwords is None else stopwords
+    for token in iter_clean_tokens(source):
+        if token not in stopwords:
+            yield token
+
+
+def iter_token_spans(text):
+    """(start, end) setiap token iter_clean_tokens(text) pada string text asli.
+
+    Token ke-i di sini sama dengan token ke-i iter_clean_tokens, sehingga
+    posisi di index positional dapat dipetakan kembali ke teks (snippet).
+    """
+    for match in _KEPT_TOKEN_RE.finditer(text):
+        yield match.span()
@@ -1,6 +1,10 @@
-def get_stopwords_list():
-    # Daftar stopword manual bahasa Indonesia
-    return {
+import hashlib
+import os
+import threading
+from itertools import filterfalse
+
+# Daftar stopword manual bahasa Indonesia
+BUILTIN_STOPWORDS = frozenset({
         "yang", "untuk", "pada", "ke", "para", "namun", "menurut", "antara", "dia", "dua",
         "ia", "seperti", "jika", "jika", "sehingga", "kembali", "dan", "tidak", "ini", "karena",
         "kepada", "oleh", "saat", "harus", "sementara", "setelah", "belum", "kami", "sekitar",
@@ -15,10 +19,115 @@ def get_stopwords_list():
         "juga", "nggak", "mari", "nanti", "melainkan", "oh", "ok", "seharusnya", "sebetulnya",
         "setiap", "setidaknya", "sesuatu", "pasti", "saja", "toh", "ya", "walau", "tolong",
         "tentu", "amat", "apalagi", "bagaimanapun"
-    }
+})
+
+_lock = threading.Lock()
+_active = BUILTIN_STOPWORDS
+_sources = ()
+_include_builtin = True
+_mtimes = {}
+
+
+def get_stopwords_list():
+    """Set stopword aktif (frozenset, dibangun sekali; bukan salinan baru per panggilan)."""
+    return _active
+
+
+def use_stopwords(words):
+    """Jadikan kumpulan kata ini set stopword aktif."""
+    global _active
+    with _lock:
+        _active = frozenset(w.lower() for w in words)
+    return _active
+
+
+def read_stopword_file(path):
+    """Kata dari file stopword (satu kata per baris, '#' komentar)."""
+    words = set()
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            word = line.split('#', 1)[0].strip().lower()
+            if word:
+                words.add(word)
+    return words
+
+
+def load_stopwords(paths=(), include_builtin=True, skip_missing=False):
+    """Bangun set aktif dari daftar bawaan + file (satu kata per baris, '#' komentar)."""
+    global _active, _sources, _include_builtin, _mtimes
+    words = set(BUILTIN_STOPWORDS) if include_builtin else set()
+    mtimes = {}
+    for path in paths:
+        if skip_missing and not os.path.exists(path):
+            continue
+        words |= read_stopword_file(path)
+        mtimes[path] = os.stat(path).st_mtime_ns
+    with _lock:
+        _active = frozenset(words)
+        _sources = tuple(paths)
+        _include_builtin = include_builtin
+        _mtimes = mtimes
+    return _active
+
+
+def reload_stopwords(force=False):
+    """Muat ulang file dari load_stopwords bila ada yang berubah; True jika set berganti."""
+    if not _sources:
+        return False
+    changed = force or any(
+        not os.path.exists(path) or os.stat(path).st_mtime_ns != _mtimes.get(path)
+        for path in _sources
+    )
+    if not changed:
+        return False
+    load_stopwords(_sources, _include_builtin, skip_missing=True)
+    return True
+
+
+def stopwords_fingerprint(stopwords=None):
+    """Sidik jari pendek set stopword, untuk kunci cache preprocessing."""
+    stopwords = _active if stopwords is None else stopwords
+    if stopwords == BUILTIN_STOPWORDS:
+        return "builtin"
+    return hashlib.sha1("\n".join(sorted(stopwords)).encode('utf-8')).hexdigest()[:12]
+
+
+def corpus_stopwords(inverted_index, top_n=50, min_df_ratio=None):
+    """Stopword khusus koleksi dari statistik InvertedIndex.
+
+    Mengambil top_n term dengan collection frequency tertinggi, ditambah
+    (bila min_df_ratio diisi) term yang muncul di setidaknya proporsi
+    dokumen tersebut. Term index adalah hasil stemming, jadi set ini untuk
+    menyaring token yang sudah di-stem (mis. vektor kueri).
+    """
+    terms = list(inverted_index.terms())
+    ranked = sorted(terms, key=inverted_index.get_collection_freq, reverse=True)
+    words = set(ranked[:top_n])
+    n_docs = len(inverted_index.documents)
+    if min_df_ratio is not None and n_docs:
+        words.update(
+            term for term in terms
+            if len(inverted_index.get_postings(term)) / n_docs >= min_df_ratio
+        )
+    return frozenset(words)
+
+
+def write_stopword_file(words, path, header=None):
+    """Tulis kata (urut) dalam format yang dibaca read_stopword_file."""
+    with open(path, 'w', encoding='utf-8') as f:
+        if header:
+            f.write(f"# {header}\n")
+        for word in sorted(words):
+            f.write(word + "\n")
+
+
+def filter_stopwords(tokens, stopwords=None):
+    """Saring token yang sudah lowercase secara massal (tanpa lower() per token)."""
+    stopwords = _active if stopwords is None else stopwords
+    return list(filterfalse(stopwords.__contains__, tokens))
 
-def remove_stopwords(tokens):
-    stopwords = get_stopwords_list()
+def remove_stopwords(tokens, stopwords=None):
+    stopwords = _active if stopwords is None else stopwords
     # Filter token yang ada di dalam set stopwords
     filtered_tokens = [word for word in tokens if word.lower() not in stopwords]
     return filtered_tokens
@@ -0,0 +1,170 @@
+"""Mesin stemming Tala terkompilasi: tabel aturan + satu lintasan per kata.
+
+Hasilnya identik dengan stem_tala_word, tetapi aturan prefiks/sufiks sudah
+dikompilasi menjadi tabel keputusan yang dipilih dari satu karakter (huruf
+pertama untuk prefiks, huruf terakhir untuk sufiks). Kata diproses sebagai
+rentang [start, end) pada string asal, jadi tidak ada potongan string baru
+sampai hasil akhir, kecuali substitusi meny/mem/peny/pem yang memang
+mengganti huruf.
+
+Engine ini adalah stem_fn bawaan stem_cache (tala_stemmer); stem_tala_word
+tetap menjadi acuan aturan untuk uji kesetaraan.
+"""
+from src.preprocessing.tala_rules import (
+    MIN_ROOT_LEN,
+    MIN_SYLLABLES,
+    PARTIKEL,
+    SANDANG,
+    VOWELS,
+)
+
+# kondisi huruf setelah prefiks
+_ANY, _VOWEL, _CONSONANT, _CONSONANT_ER = 0, 1, 2, 3
+
+# (prefiks, kondisi, panjang minimum kata, jumlah huruf dibuang, huruf pengganti, tag)
+# Urutan dalam tiap kelompok sama dengan urutan pemeriksaan di tala_stemmer.
+_PREFIX1_TABLE = {
+    "m": (
+        ("meny", _VOWEL, 5, 4, "s", "meng"),
+        ("mem", _VOWEL, 4, 3, "p", "meng"),
+        ("mem", _CONSONANT, 5, 3, "", "meng"),
+        ("meng", _ANY, 6, 4, "", "meng"),
+        ("men", _ANY, 5, 3, "", "meng"),
+        ("me", _ANY, 4, 2, "", "meng"),
+    ),
+    "p": (
+        ("peny", _VOWEL, 5, 4, "s", "peng"),
+        ("pem", _VOWEL, 4, 3, "p", "peng"),
+        ("pem", _CONSONANT, 5, 3, "", "peng"),
+        ("peng", _ANY, 6, 4, "", "peng"),
+        ("pen", _ANY, 5, 3, "", "peng"),
+    ),
+    "d": (("di", _ANY, 4, 2, "", "di"),),
+    "t": (("ter", _ANY, 5, 3, "", "ter"),),
+    "k": (("ke", _ANY, 4, 2, "", "ke"),),
+}
+
+_PREFIX2_TABLE = {
+    "b": (
+        ("belajar", _ANY, 7, 3, "", "ber"),
+        ("be", _CONSONANT_ER, 5, 2, "", "ber"),
+        ("ber", _ANY, 5, 3, "", "ber"),
+        ("bel", _ANY, 5, 3, "", "ber"),
+    ),
+    "p": (
+        ("pelajar", _ANY, 7, 3, "", "per"),
+        ("per", _ANY, 5, 3, "", "per"),
+        ("pel", _ANY, 5, 3, "", "per"),
+        ("pe", _ANY, 4, 2, "", "per"),
+    ),
+}
+
+# huruf terakhir -> (sufiks, tag prefiks yang melarang pelepasan sufiks)
+_SUFFIX_TABLE = {
+    "n": (
+        ("kan", frozenset(("ke", "peng"))),
+        ("an", frozenset(("di", "meng", "ter"))),
+    ),
+    "i": (("i", frozenset(("ber", "ke", "peng"))),),
+}
+
+
+def _group_by_len(endings):
+    """Kelompokkan akhiran menurut panjang (terpanjang dulu) untuk endswith bertuple."""
+    lengths = sorted({len(e) for e in endings}, reverse=True)
+    return tuple((n, tuple(e for e in endings if len(e) == n)) for n in lengths)
+
+
+_PARTIKEL_GROUPS = _group_by_len(PARTIKEL)
+_SANDANG_GROUPS = _group_by_len(SANDANG)
+_VOWEL_CHARS = tuple(sorted(VOWELS))
+
+
+def _is_valid_root(w, start, end):
+    if end - start < MIN_ROOT_LEN:
+        return False
+    vowels = 0
+    for v in _VOWEL_CHARS:
+        vowels += w.count(v, start, end)
+        if vowels >= MIN_SYLLABLES:
+            return True
+    return False
+
+
+def _strip_ending(w, start, end, groups):
+    for n, endings in groups:
+        if end - start - n >= MIN_ROOT_LEN and w.endswith(endings, end - n, end):
+            return end - n
+    return end
+
+
+def _apply_prefix(table, w, start, end):
+    """Cocokkan aturan prefiks pertama yang berlaku; hasil (w, start, end, tag)."""
+    rules = table.get(w[start]) if end > start else None
+    if rules is None:
+        return w, start, end, None
+    n = end - start
+    for prefix, cond, min_len, strip, head, tag in rules:
+        if n < min_len or not w.startswith(prefix, start, end):
+            continue
+        if cond:
+            nxt = w[start + len(prefix)]
+            if cond == _VOWEL:
+                if nxt not in VOWELS:
+                    continue
+            elif nxt in VOWELS:
+                continue
+            elif cond == _CONSONANT_ER and not w.startswith("er", start + 3, end):
+                continue
+        if head:
+            w = head + w[start + strip:end]
+            return w, 0, len(w), tag
+        return w, start + strip, end, tag
+    return w, start, end, None
+
+
+def _remove_suffix(w, start, end, tags):
+    rules = _SUFFIX_TABLE.get(w[end - 1]) if end > start else None
+    if rules is None:
+        return end
+    for suf, blocked in rules:
+        if w.endswith(suf, start, end):
+            cand_end = end - len(suf)
+            if not _is_valid_root(w, start, cand_end):
+                continue
+            if not blocked.isdisjoint(tags):
+                continue
+            return cand_end
+    return end
+
+
+def stem_tala_word_compiled(word: str) -> str:
+    """Setara stem_tala_word untuk token hasil tokenizing (tanpa spasi/baris baru)."""
+    if not word or len(word) < MIN_ROOT_LEN:
+        return word
+
+    w, start, end = word, 0, len(word)
+    end = _strip_ending(w, start, end, _PARTIKEL_GROUPS)
+    end = _strip_ending(w, start, end, _SANDANG_GROUPS)
+
+    w, start, end, prefix1 = _apply_prefix(_PREFIX1_TABLE, w, start, end)
+    tags = (prefix1,) if prefix1 else ()
+
+    cand_end = _remove_suffix(w, start, end, tags)
+    if cand_end != end:
+        w, start, end, prefix2 = _apply_prefix(_PREFIX2_TABLE, w, start, cand_end)
+    else:
+        w, start, end, prefix2 = _apply_prefix(_PREFIX2_TABLE, w, start, end)
+        if prefix2:
+            tags += (prefix2,)
+        end = _remove_suffix(w, start, end, tags)
+
+    if not _is_valid_root(w, start, end):
+        return word
+    if start == 0 and end == len(w):
+        return w
+    return w[start:end]
+
+
+def Stem_Tala_tokenizing_compiled(tokens):
+    return [stem_tala_word_compiled(tok) for tok in tokens if tok]
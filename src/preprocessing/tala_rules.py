@@ -0,0 +1,9 @@
+"""Tabel aturan Tala yang dipakai bersama tala_stemmer dan tala_compiled."""
+
+PARTIKEL = ("lah", "kah", "pun")
+SANDANG = ("nya", "ku", "mu")
+SUFFIX = ("kan", "an", "i")
+
+MIN_ROOT_LEN = 2
+MIN_SYLLABLES = 2
+VOWELS = set("aiueo")
@@ -1,8 +1,11 @@
+import json
+import os
 import re
+import threading
+from collections import OrderedDict
 
-PARTIKEL = ("lah", "kah", "pun")
-SANDANG = ("nya", "ku", "mu")
-SUFFIX = ("kan", "an", "i")
+from src.preprocessing.tala_rules import MIN_ROOT_LEN, MIN_SYLLABLES, PARTIKEL, SANDANG, SUFFIX, VOWELS
+from src.preprocessing.tala_compiled import stem_tala_word_compiled
 
 SPECIAL_PREFIX = (
     (re.compile(r"^meny([aiueo].*)$"), lambda m: "s" + m.group(1)),
@@ -13,10 +16,6 @@ SPECIAL_PREFIX = (
     (re.compile(r"^pem([^aiueo].*)$"), lambda m: m.group(1)),
 )
 
-MIN_ROOT_LEN = 2
-MIN_SYLLABLES = 2 
-VOWELS = set("aiueo")
-
 
 def _count_syllables(word: str) -> int:
     """Hitung jumlah suku kata berdasarkan jumlah vokal."""
@@ -166,8 +165,100 @@ def stem_tala_word(word: str) -> str:
     return word
 
 
+class StemCache:
+    """Memo LRU terbatas untuk fungsi stemming, aman dipakai lintas thread.
+
+    Teks alami mengulang kata yang sama terus-menerus, jadi hasil stemming
+    disimpan per kata. Cache dapat diisi awal (warm) dan disimpan/dimuat
+    sebagai JSON agar tetap hangat antar eksekusi.
+    """
+
+    def __init__(self, maxsize=100_000, stem_fn=stem_tala_word):
+        self.maxsize = maxsize
+        self.stem_fn = stem_fn
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def stem(self, word):
+        with self._lock:
+            result = self._data.get(word)
+            if result is not None:
+                self._data.move_to_end(word)
+                self.hits += 1
+                return result
+            self.misses += 1
+        result = self.stem_fn(word)
+        with self._lock:
+            self._data[word] = result
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return result
+
+    def stem_tokens(self, tokens):
+        return [self.stem(tok) for tok in tokens if tok]
+
+    def warm(self, words):
+        """Isi cache dengan daftar kata (tanpa mengubah statistik hit/miss)."""
+        for word in words:
+            if not word:
+                continue
+            result = self.stem_fn(word)
+            with self._lock:
+                self._data[word] = result
+                if len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Jumlah hit/miss, hit rate dan ukuran cache saat ini."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+    def save(self, path):
+        """Simpan pasangan kata -> stem (urut LRU) ke file JSON."""
+        with self._lock:
+            items = list(self._data.items())
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(items, f, ensure_ascii=False)
+
+    def load(self, path):
+        """Muat hasil save(); entri dianggap dihasilkan oleh stem_fn yang sama."""
+        if not os.path.exists(path):
+            return False
+        with open(path, 'r', encoding='utf-8') as f:
+            items = json.load(f)
+        with self._lock:
+            for word, result in items:
+                self._data[word] = result
+                self._data.move_to_end(word)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return True
+
+
+# stem_tala_word_compiled: hasil sama dengan stem_tala_word (tests/test_tala_compiled.py), lebih cepat
+stem_cache = StemCache(stem_fn=stem_tala_word_compiled)
+
+
 def Stem_Tala_tokenizing(tokens):
-    return [stem_tala_word(tok) for tok in tokens if tok]
+    return stem_cache.stem_tokens(tokens)
 
 
 # def hitung_frekuensi_stem_tala(stemmed_tokens):
@@ -1,11 +1,18 @@
+import re
 from collections import Counter
-from src.utils.utils import tokenizing
-from src.preprocessing.stopword import remove_stopwords
-from src.preprocessing.tala_stemmer import Stem_Tala_tokenizing
-from src.utils.utils import bersihkan_text
+from src.preprocessing.normalizer import iter_tokens, iter_clean_tokens
+from src.preprocessing.stopword import get_stopwords_list
+from src.preprocessing.tala_stemmer import Stem_Tala_tokenizing, stem_cache
+from src.utils.instrumentation import METRICS
+
+_PHRASE_RE = re.compile(r'"([^"]+)"')
 
 
 class QueryProcessor:
+    def __init__(self, corpus_stopwords=None):
+        # term ter-stem yang terlalu umum di koleksi (stopword.corpus_stopwords)
+        self.corpus_stopwords = frozenset(corpus_stopwords or ())
+
     def preprocess_query(self, query_text):
         """
         menjalankan step2 preprocessing
@@ -13,17 +20,43 @@ class QueryProcessor:
         2. Tokenizing
         3. Stopword removal
         4. Stemming
+
+        Langkah 1-3 dijalankan sekaligus oleh normalizer satu lintasan.
         """
-        clean_text = bersihkan_text(query_text)
-        tokens = tokenizing(clean_text)
-        tokens_no_stop = remove_stopwords(tokens)
-        stemmed_tokens = Stem_Tala_tokenizing(tokens_no_stop)
+        stemmed_tokens = Stem_Tala_tokenizing(iter_tokens(query_text))
         return stemmed_tokens
 
     def transform_query(self, query_text):
         """
         Mengubah kueri menjadi frekuensi term untuk LM ]
+        Term di corpus_stopwords dibuang, kecuali bila kueri hanya berisi term itu.
         """
-        tokens = self.preprocess_query(query_text)
-        term_freq = Counter(tokens)
+        METRICS.incr("search.queries")
+        with METRICS.stage("search.transform_query"):
+            tokens = self.preprocess_query(query_text)
+            term_freq = Counter(tokens)
+            if self.corpus_stopwords:
+                kept = Counter({t: f for t, f in term_freq.items() if t not in self.corpus_stopwords})
+                if kept:
+                    term_freq = kept
         return term_freq, tokens
+
+    def extract_phrases(self, query_text):
+        """
+        Frasa dalam tanda kutip, mis. "sistem informasi".
+        Tiap frasa berupa daftar (term, offset): offset dihitung pada token
+        bersih termasuk stopword, sama seperti posisi di index positional.
+        Frasa yang hanya berisi stopword diabaikan.
+        """
+        stopwords = get_stopwords_list()
+        phrases = []
+        for phrase_text in _PHRASE_RE.findall(query_text):
+            phrase = [
+                (stem_cache.stem(token), offset)
+                for offset, token in enumerate(iter_clean_tokens(phrase_text))
+                if token not in stopwords
+            ]
+            if phrase:
+                base = phrase[0][1]
+                phrases.append([(term, offset - base) for term, offset in phrase])
+        return phrases
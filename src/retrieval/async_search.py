@@ -0,0 +1,170 @@
+"""Pencarian asinkron: kueri dan pratinjau dikerjakan di thread pekerja.
+
+Tidak bergantung pada Tk. Semua callback dikirim lewat ``dispatch`` (untuk
+Tk: ``app.after(0, fn)``) sehingga hanya thread utama yang menyentuh widget.
+Setiap submit() membatalkan pencarian sebelumnya: tugas yang sudah usang
+tidak membaca file lagi dan hasilnya tidak pernah dikirim.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+from src.utils.instrumentation import METRICS
+from src.utils.view_helpers import get_preview_snippet, normalize_scores, passage_snippet
+
+
+class SearchTicket:
+    """Penanda satu permintaan pencarian; cancel() bila sudah digantikan."""
+
+    def __init__(self, query, top_k, proximity=False):
+        self.query = query
+        self.top_k = top_k
+        self.proximity = proximity
+        # durasi tahap pencarian kueri ini (ms), diisi sebelum on_results
+        self.stages = {}
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+
+class AsyncSearcher:
+    """Menjalankan transform_query + engine.search + get_preview_snippet di latar belakang.
+
+    Urutan callback untuk satu tiket (semuanya lewat dispatch):
+    on_results(ticket, results, q_tokens, elapsed_ms) sekali, lalu
+    on_preview(ticket, index, preview) per hasil begitu snippet siap, lalu
+    on_done(ticket). Bila terjadi exception: on_error(ticket, exc).
+
+    index_lock (mis. threading.RLock) dipegang selama kueri dan selama
+    pratinjau membaca posisi term; pemanggil yang memperbarui index dari
+    thread lain memegang lock yang sama (lihat pipeline.rescan_directory).
+    """
+
+    def __init__(self, dispatch, preview_workers=2, preview_length=200, index_lock=None):
+        self.dispatch = dispatch
+        self.preview_length = preview_length
+        self.index_lock = index_lock or nullcontext()
+        self._search_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="miner-search")
+        self._preview_pool = ThreadPoolExecutor(max_workers=preview_workers, thread_name_prefix="miner-preview")
+        self._lock = threading.Lock()
+        self._current = None
+
+    def submit(self, query, query_processor, engine, top_k=20,
+               on_results=None, on_preview=None, on_done=None, on_error=None, snippets=None, proximity=False):
+        """Mulai pencarian baru dan batalkan yang sedang berjalan; hasil: SearchTicket.
+
+        snippets (SnippetStore) dipakai untuk pratinjau bila memuat teks dokumen.
+        Pada index positional, kueri dengan frasa ("...") disaring lewat
+        search_positional; skor kedekatan term hanya dipakai bila proximity=True.
+        Kueri lain memakai engine.search sehingga peringkatnya sama dengan CLI.
+        """
+        ticket = SearchTicket(query, top_k, proximity)
+        with self._lock:
+            if self._current is not None:
+                self._current.cancel()
+            self._current = ticket
+        callbacks = (on_results, on_preview, on_done, on_error)
+        self._search_pool.submit(self._run_search, ticket, query_processor, engine, callbacks, snippets)
+        return ticket
+
+    def cancel(self):
+        """Batalkan pencarian yang sedang berjalan (bila ada)."""
+        with self._lock:
+            if self._current is not None:
+                self._current.cancel()
+                self._current = None
+
+    def shutdown(self):
+        self.cancel()
+        self._search_pool.shutdown(wait=False)
+        self._preview_pool.shutdown(wait=False)
+
+    def _emit(self, ticket, callback, *args):
+        if callback is None or ticket.cancelled:
+            return
+
+        def _call():
+            # periksa lagi di thread utama: kueri baru bisa datang di antaranya
+            if not ticket.cancelled:
+                callback(ticket, *args)
+
+        self.dispatch(_call)
+
+    def _run_search(self, ticket, query_processor, engine, callbacks, snippets):
+        on_results, on_preview, on_done, on_error = callbacks
+        if ticket.cancelled:
+            return
+        try:
+            # satu thread pencarian: selisih total tahap = durasi tahap kueri ini
+            # (search.snippet dicatat thread pratinjau dan tidak ikut)
+            before = METRICS.stage_totals("search.")
+            start = time.perf_counter()
+            q_vector, q_tokens = query_processor.transform_query(ticket.query)
+            positional = getattr(engine.inverted_index, 'positional', False)
+            phrases = query_processor.extract_phrases(ticket.query) if positional else []
+            with self.index_lock:
+                if phrases or (positional and ticket.proximity):
+                    # frasa dalam tanda kutip, ditambah skor kedekatan term bila diminta
+                    results = engine.search_positional(
+                        q_vector, top_k=ticket.top_k, phrases=phrases, proximity=ticket.proximity,
+                    )
+                else:
+                    results = engine.search(q_vector, top_k=ticket.top_k)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            ticket.stages = {
+                name: (total - before.get(name, 0.0)) * 1000
+                for name, total in METRICS.stage_totals("search.").items()
+                if name != "search.snippet" and total > before.get(name, 0.0)
+            }
+
+            normalize_scores(results)
+            for res in results:
+                res['preview'] = None  # belum dimuat
+                res['query_terms'] = q_tokens
+        except Exception as e:
+            self._emit(ticket, on_error, e)
+            return
+
+        self._emit(ticket, on_results, results, q_tokens, elapsed_ms)
+        if not results:
+            self._emit(ticket, on_done)
+            return
+
+        remaining = [len(results)]
+        remaining_lock = threading.Lock()
+
+        def _preview(index, doc_id, metadata):
+            try:
+                if ticket.cancelled:
+                    return
+                preview = None
+                key = metadata.get('hash')
+                with METRICS.stage("search.snippet"):
+                    if positional and snippets is not None and key and snippets.contains(key):
+                        # jendela dengan term kueri terbanyak, bukan kemunculan pertama
+                        with self.index_lock:
+                            passage = engine.best_passage(doc_id, q_tokens)
+                        if passage is not None:
+                            preview = passage_snippet(snippets, key, passage, max_length=self.preview_length)
+                    if preview is None:
+                        preview = get_preview_snippet(
+                            metadata['filepath'], q_tokens, max_length=self.preview_length,
+                            store=snippets, key=key,
+                        )
+                self._emit(ticket, on_preview, index, preview)
+            finally:
+                with remaining_lock:
+                    remaining[0] -= 1
+                    finished = remaining[0] == 0
+                if finished:
+                    self._emit(ticket, on_done)
+
+        # diajukan sesuai ranking sehingga kartu teratas terisi lebih dulu
+        for index, res in enumerate(results):
+            self._preview_pool.submit(_preview, index, res['doc_id'], res['metadata'])
@@ -0,0 +1,190 @@
+"""Pencarian batch untuk evaluasi offline dan run file format TREC.
+
+search_batch menilai banyak kueri sekaligus dengan rumus yang sama persis
+dengan RetrievalEngine.search: kueri diurutkan menurut term termahal (df
+terbesar) agar kueri yang berbagi posting berdekatan, setiap daftar posting
+didekode sekali lalu disimpan di cache terbatas, dan p(t|C) serta panjang
+dokumen dihitung sekali untuk seluruh batch. Dengan workers > 1 kelompok
+kueri dibagi ke process pool.
+"""
+import csv
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+# jumlah posting maksimum yang ditahan cache posting per batch
+DEFAULT_CACHE_POSTINGS = 2_000_000
+
+_WORKER_ENGINE = None
+
+
+class _BatchScorer:
+    """Cache posting, p(t|C) dan panjang dokumen yang dipakai bersama oleh kueri batch."""
+
+    def __init__(self, engine, cache_postings=DEFAULT_CACHE_POSTINGS):
+        self.engine = engine
+        self.index = engine.inverted_index
+        self.cache_postings = cache_postings
+        self._postings = OrderedDict()  # term -> [(doc_id, tf)], LRU
+        self._cached = 0
+        self._p_collection = {}
+        self._doc_lens = {}
+
+    def postings(self, term):
+        pairs = self._postings.get(term)
+        if pairs is not None:
+            self._postings.move_to_end(term)
+            return pairs
+        pairs = list(self.engine._iter_postings(term))
+        self._postings[term] = pairs
+        self._cached += len(pairs)
+        while self._cached > self.cache_postings and len(self._postings) > 1:
+            _, old = self._postings.popitem(last=False)
+            self._cached -= len(old)
+        return pairs
+
+    def p_collection(self, term):
+        p = self._p_collection.get(term)
+        if p is None:
+            p = self._p_collection[term] = self.engine._collection_prob(term)
+        return p
+
+    def doc_len(self, doc_id):
+        doc_len = self._doc_lens.get(doc_id)
+        if doc_len is None:
+            doc_len = self._doc_lens[doc_id] = self.index.get_doc_len(doc_id)
+        return doc_len
+
+    def search(self, query_terms, top_k):
+        """Sama dengan RetrievalEngine.search, hasil (doc_id, score, hits)."""
+        query_stats = [(term, qtf, self.p_collection(term)) for term, qtf in query_terms.items()]
+        candidates = defaultdict(dict)
+        for term, _, _ in query_stats:
+            for doc_id, tf in self.postings(term):
+                candidates[doc_id][term] = tf
+
+        results = []
+        for doc_id in sorted(candidates):
+            score, hits = self.engine._score_doc(query_stats, candidates[doc_id], self.doc_len(doc_id))
+            if hits == 0:
+                continue
+            results.append((doc_id, score, hits))
+        results.sort(key=lambda x: x[1], reverse=True)
+        return results[:top_k]
+
+
+def _group_queries(engine, queries):
+    """Urutkan (qid, query_terms) menurut term dengan df terbesar, lalu term-term lainnya."""
+    index = engine.inverted_index
+    df = {}
+
+    def term_df(term):
+        if term not in df:
+            get_arrays = getattr(index, 'get_postings_arrays', None)
+            df[term] = len(get_arrays(term)[0]) if get_arrays is not None else len(index.get_postings(term))
+        return df[term]
+
+    def key(item):
+        terms = sorted(item[1], key=lambda t: (-term_df(t), t))
+        return tuple(terms)
+
+    return sorted(queries, key=key)
+
+
+def _score_chunk(engine, chunk, top_k, cache_postings):
+    if not hasattr(engine, '_score_doc'):
+        # engine lain (mis. numpy/sharded): tetap satu per satu
+        return {
+            qid: [(r['doc_id'], r['score'], r['hits']) for r in engine.search(query_terms, top_k=top_k)]
+            for qid, query_terms in chunk
+        }
+    scorer = _BatchScorer(engine, cache_postings)
+    return {qid: scorer.search(query_terms, top_k) for qid, query_terms in chunk}
+
+
+def _init_worker(engine):
+    global _WORKER_ENGINE
+    _WORKER_ENGINE = engine
+
+
+def _score_chunk_worker(chunk, top_k, cache_postings):
+    return _score_chunk(_WORKER_ENGINE, chunk, top_k, cache_postings)
+
+
+def search_batch(engine, queries, top_k=10, workers=None, cache_postings=DEFAULT_CACHE_POSTINGS):
+    """Cari banyak kueri sekaligus; hasil {qid: [hasil seperti engine.search]}.
+
+    queries: dict atau iterable (qid, query_terms) dengan query_terms berupa
+    Counter/dict term -> qtf (lihat transform_queries). Hasil setiap kueri
+    identik dengan engine.search(query_terms, top_k). workers > 1 membagi
+    kelompok kueri ke process pool; engine dikirim sekali per proses, jadi
+    index harus dapat di-pickle (SegmentIndex dibuka ulang dari foldernya).
+    """
+    items = list(queries.items()) if isinstance(queries, dict) else list(queries)
+    ordered = _group_queries(engine, items)
+
+    if workers and workers > 1 and len(ordered) > 1:
+        # potongan berurutan: kueri yang berbagi term tetap di pekerja yang sama
+        size = -(-len(ordered) // workers)
+        chunks = [ordered[i:i + size] for i in range(0, len(ordered), size)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(engine,)) as executor:
+            futures = [executor.submit(_score_chunk_worker, chunk, top_k, cache_postings) for chunk in chunks]
+            scored = {}
+            for future in futures:
+                scored.update(future.result())
+    else:
+        scored = _score_chunk(engine, ordered, top_k, cache_postings)
+
+    documents = engine.inverted_index.documents
+    return {
+        qid: [
+            {
+                'doc_id': doc_id,
+                'score': score,
+                'hits': hits,
+                'metadata': documents[doc_id],
+            }
+            for doc_id, score, hits in scored[qid]
+        ]
+        for qid, _ in items
+    }
+
+
+def transform_queries(query_processor, queries):
+    """{qid: teks kueri} atau iterable (qid, teks) -> [(qid, query_terms)]."""
+    items = queries.items() if isinstance(queries, dict) else queries
+    return [(qid, query_processor.transform_query(text)[0]) for qid, text in items]
+
+
+def read_queries_tsv(path):
+    """Baca file kueri 'qid<TAB>teks kueri' per baris; baris kosong/# diabaikan."""
+    queries = []
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.reader(f, delimiter='\t'):
+            if not row or not row[0].strip() or row[0].startswith('#'):
+                continue
+            queries.append((row[0].strip(), '\t'.join(row[1:]).strip()))
+    return queries
+
+
+def default_docno(result):
+    """Nomor dokumen TREC: nama file dari metadata, atau doc_id."""
+    return result['metadata'].get('filename') or str(result['doc_id'])
+
+
+def write_trec_run(results, out, run_tag="miner", docno=default_docno):
+    """Tulis hasil search_batch sebagai run TREC: 'qid Q0 docno rank score tag'.
+
+    out boleh berupa path atau objek file teks. Spasi di docno diganti '_'
+    agar kolom tetap terpisah; skor ditulis penuh agar urutan trec_eval sama.
+    """
+    if isinstance(out, str):
+        with open(out, 'w', encoding='utf-8') as f:
+            return write_trec_run(results, f, run_tag, docno)
+
+    lines = 0
+    for qid, ranked in results.items():
+        for rank, res in enumerate(ranked, 1):
+            name = '_'.join(str(docno(res)).split())
+            out.write(f"{qid} Q0 {name} {rank} {res['score']:.17g} {run_tag}\n")
+            lines += 1
+    return lines
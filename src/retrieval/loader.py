@@ -0,0 +1,130 @@
+"""Membuka index tersimpan (pickle, segmen mmap, atau shard) sebagai engine pencarian."""
+import os
+
+from src.indexing.inverted_index import InvertedIndex
+from src.indexing.segment import SegmentIndex, TERMS_FILE
+from src.indexing.shards import MANIFEST_FILE
+from src.preprocessing.stopword import read_stopword_file
+from src.retrieval.retrieval_engine import RetrievalEngine
+
+# nama file di dalam folder keluaran `miner index`
+INDEX_FILE = "index.pkl"
+SEGMENT_DIR = "segment"
+SHARDS_DIR = "shards"
+CORPUS_STOPWORDS_FILE = "corpus_stopwords.txt"
+
+# engine yang dapat dipilih lewat load_engine(..., engine=...) / opsi --engine
+ENGINES = ("default", "maxscore", "numpy")
+
+
+def make_engine(index, mu=2000, engine="default"):
+    """Engine pencarian bernama engine (lihat ENGINES) di atas index."""
+    if engine == "default":
+        return RetrievalEngine(index, mu)
+    if engine == "maxscore":
+        from src.retrieval.maxscore import MaxScoreRetrievalEngine
+
+        return MaxScoreRetrievalEngine(index, mu)
+    if engine == "numpy":
+        # numpy hanya diimpor bila engine ini dipilih
+        from src.retrieval.numpy_engine import NumpyRetrievalEngine
+
+        return NumpyRetrievalEngine(index, mu)
+    raise ValueError(f"Engine tidak dikenal: {engine} (pilihan: {', '.join(ENGINES)})")
+
+
+def resolve_index_path(path):
+    """Folder keluaran `miner index` -> segmen/shard/pickle di dalamnya; path lain apa adanya."""
+    if os.path.isdir(path) and not os.path.exists(os.path.join(path, TERMS_FILE)) \
+            and not os.path.exists(os.path.join(path, MANIFEST_FILE)):
+        if os.path.exists(os.path.join(path, SEGMENT_DIR, TERMS_FILE)):
+            return os.path.join(path, SEGMENT_DIR)
+        if os.path.exists(os.path.join(path, SHARDS_DIR, MANIFEST_FILE)):
+            return os.path.join(path, SHARDS_DIR)
+        if os.path.exists(os.path.join(path, INDEX_FILE)):
+            return os.path.join(path, INDEX_FILE)
+    return path
+
+
+def load_corpus_stopwords(path):
+    """Stopword koleksi dari `miner index --corpus-stopwords` untuk index di path; kosong bila tidak ada.
+
+    File hanya dicari di folder milik index itu sendiri: path bila berupa
+    folder (keluaran `miner index`, segmen, atau shard), atau folder berisi
+    index.pkl. Folder induk tidak pernah diperiksa, karena bisa memuat file
+    milik index lain.
+    """
+    if os.path.isdir(path):
+        directory = path
+    elif os.path.basename(path) == INDEX_FILE:
+        directory = os.path.dirname(os.path.abspath(path))
+    else:
+        return frozenset()
+    candidate = os.path.join(directory, CORPUS_STOPWORDS_FILE)
+    if os.path.isfile(candidate):
+        return frozenset(read_stopword_file(candidate))
+    return frozenset()
+
+
+def convert_pickle(path, segment_dir=None):
+    """Ubah index pickle lama menjadi segmen (bawaan <path>.segment); hasil folder segmen.
+
+    pickle.load dapat menjalankan kode sembarang: panggil hanya untuk file
+    index yang tepercaya (lihat `miner convert`).
+    """
+    index = InvertedIndex()
+    if not index.load(path):
+        raise FileNotFoundError(f"Index tidak ditemukan: {path}")
+    segment_dir = segment_dir or path + ".segment"
+    index.save_segment(segment_dir)
+    return segment_dir
+
+
+def load_engine(path, mu=2000, mmap=False, engine="default", allow_pickle=False):
+    """Engine untuk index di path: folder shard, folder segmen, atau file pickle.
+
+    engine memilih evaluator kueri (lihat ENGINES); "maxscore" memberi hasil
+    yang sama dengan "default" tetapi melewati dokumen yang tidak mungkin
+    masuk top-k, dan lebih cepat untuk koleksi besar. "numpy" menyalin
+    posting ke array NumPy saat dibuka (tidak berbagi halaman mmap) dan
+    tidak tersedia untuk index ber-shard.
+
+    File pickle lama dibuka lewat segmen hasil konversinya (<path>.segment,
+    lihat convert_pickle) bila segmen itu tidak lebih lama dari pickle.
+    Tanpa segmen tersebut pickle hanya dibaca bila allow_pickle=True;
+    mmap=True lalu menyimpan segmennya sekali agar proses-proses pekerja
+    dapat berbagi halaman index.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Engine tidak dikenal: {engine} (pilihan: {', '.join(ENGINES)})")
+    path = resolve_index_path(path)
+    if os.path.isdir(path):
+        if os.path.exists(os.path.join(path, MANIFEST_FILE)):
+            if engine == "numpy":
+                raise ValueError("Engine numpy tidak mendukung index ber-shard")
+            # process pool (multiprocessing) hanya diimpor untuk index ber-shard
+            from src.retrieval.sharded_engine import ShardedRetrievalEngine
+
+            return ShardedRetrievalEngine.open(path, mu=mu, maxscore=engine == "maxscore")
+        if os.path.exists(os.path.join(path, TERMS_FILE)):
+            return make_engine(SegmentIndex(path), mu, engine)
+        raise FileNotFoundError(f"Folder {path} bukan segmen maupun shard index")
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Index tidak ditemukan: {path}")
+    segment_dir = path + ".segment"
+    segment_terms = os.path.join(segment_dir, TERMS_FILE)
+    if os.path.exists(segment_terms) and os.path.getmtime(segment_terms) >= os.path.getmtime(path):
+        return make_engine(SegmentIndex(segment_dir), mu, engine)
+    if not allow_pickle:
+        raise ValueError(
+            f"{path} adalah index pickle lama yang belum dikonversi; jalankan "
+            f"`python miner.py convert {path}` (hanya untuk file tepercaya)"
+        )
+
+    if not mmap:
+        index = InvertedIndex()
+        if not index.load(path):
+            raise FileNotFoundError(f"Index tidak ditemukan: {path}")
+        return make_engine(index, mu, engine)
+    return make_engine(SegmentIndex(convert_pickle(path, segment_dir)), mu, engine)
@@ -0,0 +1,213 @@
+"""Evaluasi kueri document-at-a-time dengan pruning MaxScore untuk top-k."""
+import heapq
+import math
+from bisect import bisect_left
+
+from src.retrieval.retrieval_engine import RetrievalEngine
+from src.utils.instrumentation import METRICS
+
+
+class MaxScoreRetrievalEngine(RetrievalEngine):
+    """RetrievalEngine dengan top-k heap dan early termination gaya MaxScore.
+
+    Skor Dirichlet dokumen d dipecah per term kueri t:
+
+        qtf * log((tf + mu * p_t) / (|d| + mu))
+
+    Untuk dokumen yang memuat t, kontribusi itu paling besar ub_t (maksimum
+    atas posting t, dihitung sekali lalu disimpan). Untuk dokumen yang tidak
+    memuat t, kontribusinya paling besar bg_t (memakai panjang dokumen
+    terpendek). Sehingga skor(d) <= sum(bg) + sum gain_t untuk term yang
+    memuat d, dengan gain_t = ub_t - bg_t. Term dengan gain kecil yang
+    jumlahnya tidak cukup untuk melewati skor terburuk di heap menjadi
+    "non-esensial": dokumen yang hanya muncul di posting term tersebut tidak
+    pernah diperiksa, dan kursor posting mereka hanya dimajukan (advance) ke
+    kandidat dari term esensial. Pada CompressedInvertedIndex advance
+    melompat lewat skip pointer sehingga blok yang dilewati tidak didekode.
+
+    Skor akhir dihitung dengan rumus yang sama persis dengan search(), dan
+    urutan (skor menurun, doc_id menaik) sama dengan pemindaian lengkap.
+    """
+
+    def __init__(self, inverted_index, mu=2000):
+        super().__init__(inverted_index, mu)
+        self._bounds = {}
+        self._bounds_key = None
+        self._min_doc_len = 0
+
+    def _cursor(self, term):
+        """Kursor posting term (terurut doc_id): PostingsCursor bila index menyediakan cursor()."""
+        cursor = getattr(self.inverted_index, 'cursor', None)
+        if cursor is not None:
+            return cursor(term)
+        get_arrays = getattr(self.inverted_index, 'get_postings_arrays', None)
+        if get_arrays is not None:
+            return _ArrayCursor(*get_arrays(term))
+        postings = self.inverted_index.get_postings(term)
+        return _ArrayCursor([p['doc_id'] for p in postings], [p['tf'] for p in postings])
+
+    def _check_bounds_cache(self):
+        key = (getattr(self.inverted_index, 'version', 0), self.mu)
+        if key != self._bounds_key:
+            self._bounds = {}
+            self._bounds_key = key
+            self._min_doc_len = min(
+                (self.inverted_index.get_doc_len(doc_id) for doc_id in self.inverted_index.documents),
+                default=0,
+            )
+
+    def _term_upper_bound(self, term, p_collection):
+        """max log((tf + mu*p) / (|d| + mu)) atas posting term (per unit qtf)."""
+        bound = self._bounds.get(term)
+        if bound is None:
+            mu_p = self.mu * p_collection
+            bound = -math.inf
+            for doc_id, tf in self._iter_postings(term):
+                denom = self.inverted_index.get_doc_len(doc_id) + self.mu
+                if denom > 0:
+                    bound = max(bound, math.log((tf + mu_p) / denom))
+            self._bounds[term] = bound
+        return bound
+
+    def precompute_bounds(self):
+        """Hitung upper bound semua term sekaligus (mis. setelah index dibangun)."""
+        self._check_bounds_cache()
+        for term in self.inverted_index.terms():
+            self._term_upper_bound(term, self._collection_prob(term))
+
+    def _background_bound(self, p_collection):
+        """Batas atas kontribusi term yang tidak muncul di dokumen (per unit qtf)."""
+        mu_p = self.mu * p_collection
+        denom = self._min_doc_len + self.mu
+        if mu_p <= 0 or denom <= 0:
+            return 0.0  # search() tidak menambahkan log(0)
+        return math.log(mu_p / denom)
+
+    def search(self, query_terms, top_k=10):
+        """Top-k Query Likelihood Dirichlet dengan pruning; hasil sama dengan search_exhaustive."""
+        if top_k <= 0:
+            return []
+        with METRICS.stage("search.scoring"):
+            heap = self._score_heap(query_terms, top_k)
+
+        with METRICS.stage("search.topk"):
+            heap.sort(key=lambda item: (-item[0], -item[1]))
+            return [
+                {
+                    'doc_id': -neg_doc_id,
+                    'score': score,
+                    'hits': hits,
+                    'metadata': self.inverted_index.documents[-neg_doc_id],
+                }
+                for score, neg_doc_id, hits in heap
+            ]
+
+    def _score_heap(self, query_terms, top_k):
+        """Heap top-k (skor, -doc_id, hits) hasil pemindaian MaxScore, belum terurut."""
+        self._check_bounds_cache()
+
+        query_stats = []
+        lists = []
+        total_bg = 0.0
+        for term, qtf in query_terms.items():
+            p_collection = self._collection_prob(term)
+            query_stats.append((term, qtf, p_collection))
+            bg = qtf * self._background_bound(p_collection)
+            total_bg += bg
+            cursor = self._cursor(term)
+            if cursor.doc_id is None:
+                continue
+            ub = qtf * self._term_upper_bound(term, p_collection)
+            lists.append((max(ub - bg, 0.0), term, cursor))
+        if not lists:
+            return []
+
+        # gain kecil dulu: prefiks daftar ini kandidat non-esensial
+        lists.sort(key=lambda item: item[0])
+        prefix_gain = []
+        acc = 0.0
+        for item in lists:
+            acc += item[0]
+            prefix_gain.append(acc)
+
+        heap = []  # (skor, -doc_id): elemen terburuk di heap[0]
+        threshold = -math.inf
+        n_essential_start = 0
+
+        def _can_beat(bound):
+            # toleransi kecil agar pembulatan float tidak membuang kandidat sah
+            return bound >= threshold - 1e-9 * (1.0 + abs(threshold))
+
+        while True:
+            # term esensial: lists[n_essential_start:]
+            essential = lists[n_essential_start:]
+            doc_id = None
+            for _, _, cursor in essential:
+                candidate = cursor.doc_id
+                if candidate is not None and (doc_id is None or candidate < doc_id):
+                    doc_id = candidate
+            if doc_id is None:
+                break
+
+            doc_tfs = {}
+            bound = total_bg
+            for gain, term, cursor in essential:
+                if cursor.doc_id == doc_id:
+                    doc_tfs[term] = cursor.tf
+                    cursor.next()
+                    bound += gain
+
+            # periksa term non-esensial, gain terbesar dulu, berhenti bila mustahil masuk
+            for i in range(n_essential_start - 1, -1, -1):
+                if not _can_beat(bound + prefix_gain[i]):
+                    break
+                gain, term, cursor = lists[i]
+                if cursor.advance(doc_id) == doc_id:
+                    doc_tfs[term] = cursor.tf
+                    bound += gain
+            else:
+                if _can_beat(bound):
+                    doc_len = self.inverted_index.get_doc_len(doc_id)
+                    score, hits = self._score_doc(query_stats, doc_tfs, doc_len)
+                    if hits > 0:
+                        if len(heap) < top_k:
+                            heapq.heappush(heap, (score, -doc_id, hits))
+                        elif score > heap[0][0]:
+                            heapq.heapreplace(heap, (score, -doc_id, hits))
+                        if len(heap) == top_k and heap[0][0] > threshold:
+                            threshold = heap[0][0]
+                            while (n_essential_start < len(lists)
+                                   and not _can_beat(total_bg + prefix_gain[n_essential_start])):
+                                n_essential_start += 1
+
+        return heap
+
+
+class _ArrayCursor:
+    """Kursor di atas kolom (doc_ids, tfs) terurut; API sama dengan PostingsCursor."""
+
+    __slots__ = ('_doc_ids', '_tfs', '_pos', 'doc_id', 'tf')
+
+    def __init__(self, doc_ids, tfs):
+        self._doc_ids = doc_ids
+        self._tfs = tfs
+        self._pos = 0
+        self._load()
+
+    def _load(self):
+        if self._pos < len(self._doc_ids):
+            self.doc_id, self.tf = self._doc_ids[self._pos], self._tfs[self._pos]
+        else:
+            self.doc_id, self.tf = None, 0
+
+    def next(self):
+        self._pos += 1
+        self._load()
+        return self.doc_id
+
+    def advance(self, target):
+        if self.doc_id is None or self.doc_id >= target:
+            return self.doc_id
+        self._pos = bisect_left(self._doc_ids, target, self._pos + 1)
+        self._load()
+        return self.doc_id
@@ -0,0 +1,116 @@
+"""Backend Query Likelihood (Dirichlet) berbasis array NumPy."""
+import numpy as np
+
+from src.utils.instrumentation import METRICS
+
+
+class NumpyRetrievalEngine:
+    """Pengganti RetrievalEngine: posting disimpan sebagai array NumPy kontigu.
+
+    Snapshot diambil dari InvertedIndex saat konstruksi dan diambil ulang
+    otomatis bila versi index berubah (atau panggil refresh() secara manual).
+    """
+
+    def __init__(self, inverted_index, mu=2000):
+        self.inverted_index = inverted_index
+        self.mu = mu
+        self.refresh()
+
+    def refresh(self):
+        """Salin index ke array: panjang dokumen, doc slot dan tf per posting."""
+        index = self.inverted_index
+        self.version = getattr(index, 'version', 0)
+        doc_ids = sorted(index.documents)
+        self.doc_ids = doc_ids
+        self.doc_lens = np.asarray(
+            [index.get_doc_len(doc_id) for doc_id in doc_ids], dtype=np.float64
+        )
+
+        self.term_slices = {}
+        self.collection_freq = {}
+        doc_chunks, tf_chunks = [], []
+        offset = 0
+        get_arrays = getattr(index, 'get_postings_arrays', None)
+        for term in index.terms():
+            if get_arrays is not None:
+                docs, tfs = get_arrays(term)
+                docs = np.frombuffer(docs, dtype=np.uint32)
+                tfs = np.frombuffer(tfs, dtype=np.uint32)
+            else:
+                postings = index.get_postings(term)
+                docs = np.fromiter((p['doc_id'] for p in postings), dtype=np.int64, count=len(postings))
+                tfs = np.fromiter((p['tf'] for p in postings), dtype=np.float64, count=len(postings))
+            doc_chunks.append(docs)
+            tf_chunks.append(tfs)
+            self.term_slices[term] = (offset, offset + len(docs))
+            self.collection_freq[term] = index.get_collection_freq(term)
+            offset += len(docs)
+
+        # doc_id -> slot (posisi dalam doc_ids terurut)
+        all_docs = np.concatenate(doc_chunks) if doc_chunks else np.zeros(0, dtype=np.int64)
+        self.postings_docs = np.searchsorted(np.asarray(doc_ids, dtype=np.int64), all_docs).astype(np.int32)
+        self.postings_tfs = (np.concatenate(tf_chunks) if tf_chunks else np.zeros(0)).astype(np.float64)
+        self.collection_len = index.get_collection_len()
+
+    def _collection_prob(self, term):
+        if self.collection_len == 0:
+            return 0.0
+        cf = self.collection_freq.get(term, 0)
+        # Jika term tidak ada di koleksi, berikan probabilitas minimum
+        if cf == 0:
+            return 1.0 / self.collection_len
+        return cf / self.collection_len
+
+    def _term_postings(self, term):
+        start, end = self.term_slices.get(term, (0, 0))
+        return self.postings_docs[start:end], self.postings_tfs[start:end]
+
+    def search(self, query_terms, top_k=10):
+        """Skor Query Likelihood Dirichlet; format hasil sama dengan RetrievalEngine."""
+        if getattr(self.inverted_index, 'version', 0) != self.version:
+            self.refresh()
+        with METRICS.stage("search.scoring"):
+            terms = [(term, qtf, *self._term_postings(term)) for term, qtf in query_terms.items()]
+            matched = [docs for _, _, docs, _ in terms if len(docs)]
+            if not matched or top_k <= 0:
+                return []
+
+            # kandidat = gabungan posting term kueri; inverse memetakan posting -> kandidat
+            candidates, inverse = np.unique(np.concatenate(matched), return_inverse=True)
+            denom = self.doc_lens[candidates] + self.mu
+            scores = np.zeros(len(candidates), dtype=np.float64)
+            hits = np.zeros(len(candidates), dtype=np.int64)
+
+            pos = 0
+            for term, qtf, docs, tfs in terms:
+                tf = np.zeros(len(candidates), dtype=np.float64)
+                n = len(docs)
+                if n:
+                    tf[inverse[pos:pos + n]] = tfs
+                    hits[inverse[pos:pos + n]] += qtf
+                    pos += n
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    smoothed = (tf + self.mu * self._collection_prob(term)) / denom
+                    scores += np.where(smoothed > 0, qtf * np.log(np.where(smoothed > 0, smoothed, 1.0)), 0.0)
+
+        with METRICS.stage("search.topk"):
+            valid = np.flatnonzero(denom != 0)
+            if len(valid) > top_k:
+                # ambang top-k via argpartition, lalu ikutkan semua skor yang seri
+                top = np.argpartition(-scores[valid], top_k - 1)[:top_k]
+                kth = scores[valid[top]].min()
+                valid = valid[scores[valid] >= kth]
+            # urut skor menurun, seri diurutkan menurut doc_id
+            order = valid[np.lexsort((candidates[valid], -scores[valid]))][:top_k]
+
+            documents = self.inverted_index.documents
+            results = []
+            for i in order:
+                doc_id = self.doc_ids[candidates[i]]
+                results.append({
+                    'doc_id': doc_id,
+                    'score': float(scores[i]),
+                    'hits': int(hits[i]),
+                    'metadata': documents[doc_id],
+                })
+            return results
@@ -0,0 +1,96 @@
+"""Cache hasil pencarian (LRU + TTL) di depan RetrievalEngine."""
+import threading
+import time
+from collections import OrderedDict
+
+
+class CachedRetrievalEngine:
+    """Membungkus engine apa pun yang punya search(query_terms, top_k).
+
+    Kunci cache = vektor term kueri yang sudah di-stem (urut), mu dan top_k;
+    search_positional juga menyertakan frasa dan parameter kedekatan.
+    Seluruh isi cache dibuang otomatis ketika inverted_index.version berubah,
+    sehingga hasil tidak pernah berasal dari index versi lama. Atribut lain
+    (inverted_index, mu, ...) diteruskan ke engine asli.
+    """
+
+    def __init__(self, engine, maxsize=512, ttl=None):
+        self.engine = engine
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._data = OrderedDict()
+        self._version = self._index_version()
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        if name == 'engine':
+            raise AttributeError(name)
+        return getattr(self.engine, name)
+
+    def _index_version(self):
+        return getattr(self.engine.inverted_index, 'version', 0)
+
+    def _key(self, query_terms, top_k):
+        return tuple(sorted(query_terms.items())), self.engine.mu, top_k
+
+    def search(self, query_terms, top_k=10):
+        """Sama dengan engine.search; hasil berupa salinan dict agar aman diubah pemanggil."""
+        return self._cached(
+            self._key(query_terms, top_k),
+            lambda: self.engine.search(query_terms, top_k=top_k),
+        )
+
+    def search_positional(self, query_terms, top_k=10, phrases=(), proximity=True, alpha=0.3):
+        """Sama dengan engine.search_positional; frasa dan parameter kedekatan ikut dalam kunci."""
+        key = ('positional', self._key(query_terms, top_k), tuple(map(tuple, phrases)), proximity, alpha)
+        return self._cached(
+            key,
+            lambda: self.engine.search_positional(
+                query_terms, top_k=top_k, phrases=phrases, proximity=proximity, alpha=alpha,
+            ),
+        )
+
+    def _cached(self, key, compute):
+        now = time.monotonic()
+        with self._lock:
+            version = self._index_version()
+            if version != self._version:
+                self._data.clear()
+                self._version = version
+                self.invalidations += 1
+            entry = self._data.get(key)
+            if entry is not None and (self.ttl is None or now - entry[1] <= self.ttl):
+                self._data.move_to_end(key)
+                self.hits += 1
+                return [dict(r) for r in entry[0]]
+            self.misses += 1
+
+        results = compute()
+        with self._lock:
+            # jangan simpan hasil bila index berubah selama pencarian
+            if self._index_version() == version:
+                self._data[key] = ([dict(r) for r in results], now)
+                self._data.move_to_end(key)
+                if len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+        return results
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """Jumlah hit/miss, hit rate, invalidasi dan ukuran cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
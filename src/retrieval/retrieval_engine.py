@@ -1,6 +1,11 @@
 import math
 from collections import defaultdict
 
+from src.utils.instrumentation import METRICS
+
+# kedalaman rerank search_positional: top_k * faktor ini kandidat QL teratas
+POSITIONAL_POOL_FACTOR = 10
+
 
 class RetrievalEngine:
     def __init__(self, inverted_index, mu=2000):
@@ -17,8 +22,190 @@ class RetrievalEngine:
             return 1.0 / collection_len
         return cf / collection_len
 
+    def _iter_postings(self, term):
+        """Pasangan (doc_id, tf); pakai blok terkompresi atau array mentah bila index menyediakannya."""
+        iter_blocks = getattr(self.inverted_index, 'iter_blocks', None)
+        if iter_blocks is not None:
+            return (pair for doc_ids, tfs in iter_blocks(term) for pair in zip(doc_ids, tfs))
+        get_arrays = getattr(self.inverted_index, 'get_postings_arrays', None)
+        if get_arrays is not None:
+            return zip(*get_arrays(term))
+        return ((p['doc_id'], p['tf']) for p in self.inverted_index.get_postings(term))
+
+    def _score_doc(self, query_stats, doc_tfs, doc_len):
+        """Skor LM Dirichlet satu dokumen; term tanpa posting memakai skor latar (tf=0)."""
+        denom = doc_len + self.mu
+        if denom == 0:
+            return 0.0, 0
+        score = 0.0
+        hits = 0
+        for term, qtf, p_collection in query_stats:
+            tf = doc_tfs.get(term, 0)
+            smoothed = (tf + self.mu * p_collection) / denom
+            if smoothed > 0:
+                score += qtf * math.log(smoothed)
+            if tf > 0:
+                hits += qtf  # catat ada kecocokan term
+        return score, hits
+
     def search(self, query_terms, top_k=10):
-        """Hitung skor Query Likelihood dengan smoothing Dirichlet."""
+        """Hitung skor Query Likelihood dengan smoothing Dirichlet.
+
+        Term-at-a-time: hanya posting milik term kueri yang dibaca. Dokumen
+        tanpa kecocokan disembunyikan, jadi cukup dokumen kandidat yang diberi
+        skor; kontribusi term yang tidak muncul di dokumen tersebut dihitung
+        dari skor latar mu * p(t|C) / (|d| + mu).
+        """
+        with METRICS.stage("search.scoring"):
+            query_stats = [
+                (term, qtf, self._collection_prob(term))
+                for term, qtf in query_terms.items()
+            ]
+
+            # kumpulkan tf kandidat: doc_id -> {term: tf}
+            candidates = defaultdict(dict)
+            for term, _, _ in query_stats:
+                for doc_id, tf in self._iter_postings(term):
+                    candidates[doc_id][term] = tf
+
+            results = []
+            # urutan doc_id menjaga tie-breaking sama seperti pemindaian penuh
+            for doc_id in sorted(candidates):
+                doc_len = self.inverted_index.get_doc_len(doc_id)
+                score, hits = self._score_doc(query_stats, candidates[doc_id], doc_len)
+                if hits == 0:
+                    continue  # sembunyikan dokumen tanpa kecocokan query
+                results.append({
+                    'doc_id': doc_id,
+                    'score': score,
+                    'hits': hits,
+                    'metadata': self.inverted_index.documents[doc_id],
+                })
+
+        with METRICS.stage("search.topk"):
+            results.sort(key=lambda x: x['score'], reverse=True)
+            return results[:top_k]
+
+    def _require_positions(self):
+        if not getattr(self.inverted_index, 'positional', False):
+            raise ValueError("Index tidak menyimpan posisi term; bangun dengan positional=True")
+
+    def phrase_frequency(self, phrase, doc_id):
+        """Jumlah kemunculan frasa [(term, offset), ...] di dokumen."""
+        self._require_positions()
+        get_positions = self.inverted_index.get_positions
+        starts = None
+        # mulai dari term dengan posisi paling sedikit
+        for positions, offset in sorted(
+            ((get_positions(term, doc_id), offset) for term, offset in phrase),
+            key=lambda item: len(item[0]),
+        ):
+            candidates = {pos - offset for pos in positions}
+            starts = candidates if starts is None else starts & candidates
+            if not starts:
+                return 0
+        return len(starts) if starts else 0
+
+    def min_distance(self, terms, doc_id):
+        """Jarak terdekat (dalam token) antara dua term berbeda di dokumen; None bila < 2 term."""
+        self._require_positions()
+        tagged = []
+        present = 0
+        for i, term in enumerate(terms):
+            positions = self.inverted_index.get_positions(term, doc_id)
+            if positions:
+                present += 1
+                tagged.extend((pos, i) for pos in positions)
+        if present < 2:
+            return None
+        tagged.sort()
+        best = None
+        for (pos_a, term_a), (pos_b, term_b) in zip(tagged, tagged[1:]):
+            if term_a != term_b and (best is None or pos_b - pos_a < best):
+                best = pos_b - pos_a
+        return best
+
+    def search_positional(self, query_terms, top_k=10, phrases=(), proximity=True, alpha=0.3):
+        """Query Likelihood + syarat frasa + skor kedekatan term (butuh index positional).
+
+        Dokumen wajib memuat setiap frasa di phrases (lihat
+        QueryProcessor.extract_phrases). Dengan proximity=True skor ditambah
+        log(alpha + exp(-d)), d = jarak terdekat dua term kueri berbeda di
+        dokumen (panjang dokumen bila hanya satu term yang muncul), sehingga
+        dokumen yang memuat term kueri berdekatan naik peringkatnya.
+
+        Hanya top_k * POSITIONAL_POOL_FACTOR kandidat QL teratas yang di-rerank
+        (bukan seluruh dokumen); pool digandakan bila setelah filter frasa
+        tersisa kurang dari top_k dokumen dan masih ada kandidat lain.
+        """
+        self._require_positions()
+        if top_k <= 0:
+            return []
+        if not phrases and not proximity:
+            return self.search(query_terms, top_k=top_k)
+        terms = list(query_terms)
+
+        pool = top_k * POSITIONAL_POOL_FACTOR
+        while True:
+            results = self.search(query_terms, top_k=pool)
+            ranked = self._rerank_positional(results, terms, phrases, proximity, alpha)
+            if len(ranked) >= top_k or len(results) < pool:
+                return ranked[:top_k]
+            pool *= 2
+
+    def _rerank_positional(self, results, terms, phrases, proximity, alpha):
+        ranked = []
+        with METRICS.stage("search.proximity"):
+            for res in results:
+                doc_id = res['doc_id']
+                if phrases:
+                    phrase_tfs = [self.phrase_frequency(phrase, doc_id) for phrase in phrases]
+                    if not all(phrase_tfs):
+                        continue
+                    res['phrase_tf'] = sum(phrase_tfs)
+                if proximity:
+                    dist = self.min_distance(terms, doc_id)
+                    res['min_dist'] = dist
+                    if dist is None:
+                        dist = self.inverted_index.get_doc_len(doc_id)
+                    res['score'] += math.log(alpha + math.exp(-dist))
+                ranked.append(res)
+        ranked.sort(key=lambda x: (-x['score'], x['doc_id']))
+        return ranked
+
+    def best_passage(self, doc_id, query_terms, window=20):
+        """(token awal, token akhir) jendela berisi term kueri paling beragam, lalu paling banyak.
+
+        Posisi mengacu ke token bersih dokumen (lihat normalizer.iter_token_spans);
+        None bila tidak ada term kueri di dokumen.
+        """
+        self._require_positions()
+        tagged = sorted(
+            (pos, term)
+            for term in set(query_terms)
+            for pos in self.inverted_index.get_positions(term, doc_id)
+        )
+        if not tagged:
+            return None
+        best_key, best = None, None
+        counts = {}
+        right = 0
+        for left, (start, _) in enumerate(tagged):
+            while right < len(tagged) and tagged[right][0] < start + window:
+                term = tagged[right][1]
+                counts[term] = counts.get(term, 0) + 1
+                right += 1
+            key = (len(counts), right - left)
+            if best_key is None or key > best_key:
+                best_key, best = key, (start, tagged[right - 1][0])
+            term = tagged[left][1]
+            counts[term] -= 1
+            if not counts[term]:
+                del counts[term]
+        return best
+
+    def search_exhaustive(self, query_terms, top_k=10):
+        """Pemindaian seluruh dokumen per term kueri (referensi untuk verifikasi)."""
         scores = defaultdict(float)
         hits = defaultdict(int)
 
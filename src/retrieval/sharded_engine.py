@@ -0,0 +1,156 @@
+"""Pencarian scatter-gather atas shard segmen (lihat indexing/shards.py).
+
+Kueri dikirim ke semua shard sekaligus; setiap shard mengembalikan top-k
+lokal, lalu hasilnya digabung menjadi top-k global dengan urutan yang sama
+dengan index tunggal (skor menurun, doc_id menaik). Karena cf dan
+collection_len di setiap shard bersifat global, skor per dokumen identik
+dengan skor dari index tunggal.
+"""
+import heapq
+import os
+from collections import ChainMap
+from concurrent.futures import ProcessPoolExecutor
+
+from src.indexing.segment import SegmentIndex
+from src.indexing.shards import MANIFEST_FILE, read_manifest
+from src.retrieval.maxscore import MaxScoreRetrievalEngine
+from src.retrieval.retrieval_engine import RetrievalEngine
+
+# engine per (folder shard, mu, maxscore) di setiap proses pekerja; segmen dibuka sekali
+_WORKER_ENGINES = {}
+
+
+def _engine_cls(maxscore):
+    return MaxScoreRetrievalEngine if maxscore else RetrievalEngine
+
+
+def _open_engine(path, mu, maxscore):
+    key = (path, mu, maxscore)
+    engine = _WORKER_ENGINES.get(key)
+    if engine is None:
+        engine = _engine_cls(maxscore)(SegmentIndex(path), mu)
+        _WORKER_ENGINES[key] = engine
+    return engine
+
+
+def _shard_hits(engine, query_terms, top_k):
+    return [
+        (res['score'], res['doc_id'], res['hits'])
+        for res in engine.search(query_terms, top_k=top_k)
+    ]
+
+
+def _init_worker(paths, mu, maxscore):
+    """Buka semua segmen shard di proses pekerja (halaman mmap dibagi antar proses)."""
+    for path in paths:
+        _open_engine(path, mu, maxscore)
+
+
+def _search_shard(path, mu, maxscore, query_items, top_k):
+    return _shard_hits(_open_engine(path, mu, maxscore), dict(query_items), top_k)
+
+
+class _ShardedIndexView:
+    """Statistik index gabungan untuk pemanggil yang butuh engine.inverted_index."""
+
+    # shard dibaca dari segmen yang tidak berubah setelah dibuka
+    version = 0
+
+    def __init__(self, shards):
+        self.shards = shards
+        self.documents = ChainMap(*(shard.documents for shard in shards))
+
+    def terms(self):
+        return self.shards[0].terms() if self.shards else iter(())
+
+    def get_postings(self, term):
+        postings = [p for shard in self.shards for p in shard.get_postings(term)]
+        postings.sort(key=lambda p: p['doc_id'])
+        return postings
+
+    def get_collection_freq(self, term):
+        return self.shards[0].get_collection_freq(term) if self.shards else 0
+
+    def get_doc_len(self, doc_id):
+        for shard in self.shards:
+            doc_len = shard.get_doc_len(doc_id)
+            if doc_len:
+                return doc_len
+        return 0
+
+    def get_collection_len(self):
+        return self.shards[0].get_collection_len() if self.shards else 0
+
+
+class ShardedRetrievalEngine:
+    """search(query_terms, top_k) di atas beberapa shard, dengan process pool opsional.
+
+    workers > 1 menjalankan pencarian shard di ProcessPoolExecutor yang
+    membuka segmen sekali per proses; workers None/0/1 menjalankan semua shard
+    di proses ini. maxscore=True memakai MaxScoreRetrievalEngine per shard.
+    """
+
+    def __init__(self, shard_paths, mu=2000, workers=None, maxscore=False):
+        self.shard_paths = [os.path.abspath(path) for path in shard_paths]
+        self.mu = mu
+        self.maxscore = maxscore
+        self.workers = workers
+        self.inverted_index = _ShardedIndexView([SegmentIndex(path) for path in self.shard_paths])
+        # engine lokal untuk mode tanpa pool
+        self._engines = [_engine_cls(maxscore)(shard, mu) for shard in self.inverted_index.shards]
+        self._executor = None
+        if workers and workers > 1:
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self.shard_paths, mu, maxscore),
+            )
+
+    @classmethod
+    def open(cls, dirpath, **kwargs):
+        """Buka shard dari folder hasil write_shards (berisi shards.json)."""
+        if not os.path.exists(os.path.join(dirpath, MANIFEST_FILE)):
+            raise FileNotFoundError(f"{MANIFEST_FILE} tidak ditemukan di {dirpath}")
+        return cls(read_manifest(dirpath), **kwargs)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        for shard in self.inverted_index.shards:
+            shard.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def search(self, query_terms, top_k=10):
+        """Top-k global; urutan dan skor sama dengan RetrievalEngine atas index tunggal."""
+        if top_k <= 0 or not self.shard_paths:
+            return []
+        if self._executor is not None:
+            args = (self.mu, self.maxscore, tuple(query_terms.items()), top_k)
+            futures = [self._executor.submit(_search_shard, path, *args) for path in self.shard_paths]
+            shard_results = [future.result() for future in futures]
+        else:
+            for engine in self._engines:
+                engine.mu = self.mu
+            shard_results = [_shard_hits(engine, query_terms, top_k) for engine in self._engines]
+
+        merged = heapq.nsmallest(
+            top_k,
+            (hit for hits in shard_results for hit in hits),
+            key=lambda hit: (-hit[0], hit[1]),
+        )
+        documents = self.inverted_index.documents
+        return [
+            {
+                'doc_id': doc_id,
+                'score': score,
+                'hits': hits,
+                'metadata': documents[doc_id],
+            }
+            for score, doc_id, hits in merged
+        ]
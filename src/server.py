@@ -0,0 +1,380 @@
+"""Layanan pencarian HTTP/JSON tanpa UI (asyncio, hanya pustaka standar).
+
+Index dimuat sekali saat start lalu dipakai oleh semua permintaan:
+
+    python -m src.server --index data/segment --port 8080
+    python -m src.server --index data/segment --workers 4 --engine maxscore
+    python -m src.server --index data/segment --docs dokumen/   # bangun bila belum ada
+
+Endpoint:
+
+- ``GET  /search?q=...&k=10``  atau ``POST /search`` dengan JSON {"q": ..., "k": ...}
+- ``GET  /health``              status dan jumlah dokumen
+- ``GET  /stats``               statistik cache kueri dan permintaan
+- ``GET  /metrics``             durasi tahap pencarian (format teks Prometheus)
+
+Pencarian (CPU) dijalankan di thread pool agar event loop tetap melayani
+koneksi lain; setiap permintaan dibatasi waktu baca header/body dan waktu
+pencarian. Index selalu dibuka sebagai segmen mmap; index pickle lama harus
+dikonversi dulu dengan `python miner.py convert` (server tidak pernah
+memanggil pickle.load). Mode multi-worker mem-fork beberapa proses
+yang berbagi satu socket, sehingga halaman index dibagi antar proses oleh
+sistem operasi. Pada mode multi-worker, /stats
+dan /metrics melaporkan proses pekerja yang menerima koneksi tersebut.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from src.query.query_processor import QueryProcessor
+from src.retrieval.loader import ENGINES, load_corpus_stopwords, load_engine
+from src.retrieval.query_cache import CachedRetrievalEngine
+from src.utils.instrumentation import METRICS
+
+DEFAULT_TOP_K = 10
+MAX_TOP_K = 1000
+MAX_BODY_BYTES = 64 * 1024
+MAX_HEADER_LINES = 100
+
+
+def build_index(docs_dir, index_path, workers=None):
+    """Bangun index dari folder dokumen lewat pipeline.build_models lalu simpan sebagai segmen di index_path."""
+    # pipeline (pembaca docx/pdf) hanya dibutuhkan saat membangun index
+    from src.pipeline import build_models, iter_processed_documents
+
+    docs = iter_processed_documents(docs_dir, workers=workers)
+    inverted_index, _, _ = build_models(docs)
+    inverted_index.save_segment(index_path)
+    return inverted_index
+
+
+class _HttpError(Exception):
+    def __init__(self, status, message=None):
+        super().__init__(message or status.phrase)
+        self.status = status
+
+
+class _PlainText:
+    """Payload non-JSON untuk _respond (mis. /metrics)."""
+
+    def __init__(self, text, content_type="text/plain; charset=utf-8"):
+        self.text = text
+        self.content_type = content_type
+
+
+class SearchService:
+    """Handler HTTP di atas engine + QueryProcessor; satu instance per proses."""
+
+    def __init__(self, engine, query_processor=None, search_timeout=5.0, io_timeout=10.0,
+                 threads=None, max_pending=64, cache_size=1024):
+        self.engine = CachedRetrievalEngine(engine, maxsize=cache_size) if cache_size else engine
+        self.query_processor = query_processor or QueryProcessor()
+        self.search_timeout = search_timeout
+        self.io_timeout = io_timeout
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=threads or min(8, (os.cpu_count() or 1) + 2),
+                                            thread_name_prefix="miner-http")
+        self._pending = 0
+        self.requests = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.started = time.time()
+
+    def _search(self, query, top_k):
+        start = time.perf_counter()
+        q_vector, q_tokens = self.query_processor.transform_query(query)
+        results = self.engine.search(q_vector, top_k=top_k)
+        return {
+            "query": query,
+            "terms": q_tokens,
+            "took_ms": round((time.perf_counter() - start) * 1000, 3),
+            "total": len(results),
+            "results": [
+                {
+                    "doc_id": res['doc_id'],
+                    "score": res['score'],
+                    "hits": res['hits'],
+                    "filename": res['metadata'].get('filename'),
+                    "filepath": res['metadata'].get('filepath'),
+                }
+                for res in results
+            ],
+        }
+
+    async def _handle_search(self, params):
+        query = str(params.get("q") or "").strip()
+        if not query:
+            raise _HttpError(HTTPStatus.BAD_REQUEST, "parameter q wajib diisi")
+        try:
+            top_k = int(params.get("k") or DEFAULT_TOP_K)
+        except (TypeError, ValueError):
+            raise _HttpError(HTTPStatus.BAD_REQUEST, "parameter k harus bilangan bulat")
+        top_k = max(1, min(top_k, MAX_TOP_K))
+
+        if self._pending >= self.max_pending:
+            raise _HttpError(HTTPStatus.SERVICE_UNAVAILABLE, "server sibuk, coba lagi")
+        loop = asyncio.get_running_loop()
+        self._pending += 1
+        future = self._executor.submit(self._search, query, top_k)
+        # thread pencarian tidak dapat dihentikan paksa: slot baru dilepas saat
+        # pencarian benar-benar selesai, bukan saat permintaan menyerah (timeout)
+        future.add_done_callback(lambda _: self._release_soon(loop))
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.search_timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise _HttpError(HTTPStatus.GATEWAY_TIMEOUT, "pencarian melewati batas waktu")
+
+    def _release_soon(self, loop):
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:
+            pass  # event loop sudah ditutup
+
+    def _release(self):
+        self._pending -= 1
+
+    def _stats(self):
+        stats = {
+            "pid": os.getpid(),
+            "uptime_s": round(time.time() - self.started, 1),
+            "requests": self.requests,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "pending": self._pending,
+        }
+        if isinstance(self.engine, CachedRetrievalEngine):
+            stats["cache"] = self.engine.stats()
+        return stats
+
+    async def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        if url.path == "/health":
+            return {"status": "ok", "documents": len(self.engine.inverted_index.documents)}
+        if url.path == "/stats":
+            return self._stats()
+        if url.path == "/metrics":
+            return _PlainText(METRICS.to_prometheus(), "text/plain; version=0.0.4; charset=utf-8")
+        if url.path == "/search":
+            if method == "GET":
+                params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            elif method == "POST":
+                try:
+                    params = json.loads(body or b"{}")
+                except ValueError:
+                    raise _HttpError(HTTPStatus.BAD_REQUEST, "body bukan JSON yang valid")
+                if not isinstance(params, dict):
+                    raise _HttpError(HTTPStatus.BAD_REQUEST, "body harus objek JSON")
+            else:
+                raise _HttpError(HTTPStatus.METHOD_NOT_ALLOWED)
+            return await self._handle_search(params)
+        raise _HttpError(HTTPStatus.NOT_FOUND)
+
+    @staticmethod
+    async def _readline(reader):
+        """Satu baris request/header; baris melebihi batas StreamReader (64 KiB) -> 431."""
+        try:
+            return await reader.readline()
+        except (ValueError, asyncio.LimitOverrunError):
+            raise _HttpError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+
+    async def _read_request(self, reader):
+        """(method, target, headers, body) atau None bila koneksi ditutup klien."""
+        line = await self._readline(reader)
+        if not line:
+            return None
+        try:
+            method, target, _ = line.decode("latin-1").split()
+        except ValueError:
+            raise _HttpError(HTTPStatus.BAD_REQUEST, "request line tidak valid")
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            header = await self._readline(reader)
+            if header in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = header.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise _HttpError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise _HttpError(HTTPStatus.BAD_REQUEST, "Content-Length tidak valid")
+        if length < 0:
+            raise _HttpError(HTTPStatus.BAD_REQUEST, "Content-Length tidak valid")
+        if length > MAX_BODY_BYTES:
+            raise _HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, headers, body
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        if isinstance(payload, _PlainText):
+            body, content_type = payload.text.encode("utf-8"), payload.content_type
+        else:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            content_type = "application/json; charset=utf-8"
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def handle_connection(self, reader, writer):
+        """Layani satu koneksi (HTTP/1.1 keep-alive) sampai ditutup atau timeout."""
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), self.io_timeout)
+                except asyncio.TimeoutError:
+                    break  # koneksi diam terlalu lama
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except _HttpError as exc:
+                    await self._respond(writer, exc.status, {"error": str(exc)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+
+                method, target, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                self.requests += 1
+                try:
+                    status, payload = HTTPStatus.OK, await self.dispatch(method, target, body)
+                except _HttpError as exc:
+                    status, payload = exc.status, {"error": str(exc)}
+                except Exception as exc:
+                    self.errors += 1
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(exc)}
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def make_socket(host, port, backlog=1024):
+    """Socket listening yang dapat dibagi ke proses-proses pekerja."""
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.setblocking(False)
+    return sock
+
+
+async def _serve(service, sock):
+    server = await asyncio.start_server(service.handle_connection, sock=sock)
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows: andalkan KeyboardInterrupt
+    async with server:
+        await stop.wait()
+
+
+def _run_worker(sock, index_path, mu, engine_name, options):
+    engine = load_engine(index_path, mu, mmap=True, engine=engine_name)
+    query_processor = QueryProcessor(corpus_stopwords=load_corpus_stopwords(index_path))
+    service = SearchService(engine, query_processor, **options)
+    try:
+        asyncio.run(_serve(service, sock))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+def serve(index_path, host="127.0.0.1", port=8080, workers=1, mu=2000, engine="default", **options):
+    """Jalankan server sampai dihentikan (SIGINT/SIGTERM).
+
+    workers > 1 memerlukan fork (Linux/macOS): setiap proses membuka segmen
+    mmap yang sama dan menerima koneksi dari socket yang sama.
+    """
+    sock = make_socket(host, port)
+    print(f"MINER search service di http://{host}:{sock.getsockname()[1]} (workers={workers})")
+    if workers <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+        if workers > 1:
+            print("fork tidak tersedia; berjalan dengan satu worker")
+        _run_worker(sock, index_path, mu, engine, options)
+        return
+
+    # siapkan segmen sekali sebelum fork agar pekerja tidak menulisnya bersamaan
+    load_engine(index_path, mu, mmap=True, engine=engine)
+    ctx = multiprocessing.get_context("fork")
+    procs = [
+        ctx.Process(target=_run_worker, args=(sock, index_path, mu, engine, options), daemon=True)
+        for _ in range(workers)
+    ]
+    for proc in procs:
+        proc.start()
+    # SIGTERM ke proses induk juga menghentikan semua pekerja
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        for proc in procs:
+            proc.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            proc.join()
+        sock.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Layanan pencarian HTTP MINER")
+    parser.add_argument("--index", required=True,
+                        help="folder keluaran `miner index`, folder segmen/shard, atau pickle yang sudah dikonversi")
+    parser.add_argument("--docs", default=None, help="folder dokumen; segmen dibangun di --index bila belum ada")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=1, help="jumlah proses (berbagi index mmap)")
+    parser.add_argument("--mu", type=float, default=2000)
+    parser.add_argument("--engine", choices=ENGINES, default="default",
+                        help="evaluator kueri: maxscore (top-k dengan pruning) atau numpy (skor tervektorisasi); "
+                             "hasil sama dengan default")
+    parser.add_argument("--timeout", type=float, default=5.0, help="batas waktu pencarian (detik)")
+    parser.add_argument("--io-timeout", type=float, default=10.0, help="batas waktu baca permintaan (detik)")
+    parser.add_argument("--threads", type=int, default=None, help="thread pencarian per proses")
+    parser.add_argument("--cache-size", type=int, default=1024, help="ukuran cache kueri (0 = mati)")
+    args = parser.parse_args(argv)
+    if args.docs and not os.path.exists(args.index):
+        print(f"Membangun index dari {args.docs} ...")
+        build_index(args.docs, args.index)
+    try:
+        serve(
+            args.index, args.host, args.port, args.workers, args.mu, args.engine,
+            search_timeout=args.timeout, io_timeout=args.io_timeout,
+            threads=args.threads, cache_size=args.cache_size,
+        )
+    except (FileNotFoundError, ValueError) as exc:
+        parser.exit(2, f"{exc}\n")
+
+
+if __name__ == "__main__":
+    main()
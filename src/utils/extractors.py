@@ -0,0 +1,295 @@
+"""Registry ekstraktor teks per format dokumen.
+
+Setiap ekstraktor adalah generator yang menghasilkan teks sepotong demi
+sepotong (per blok, paragraf atau halaman), sehingga preprocessing dapat
+langsung men-tokenisasi potongan tanpa menyusun seluruh teks dokumen
+(lihat normalizer.iter_clean_tokens). Format baru cukup didaftarkan:
+
+    @register_extractor(".rtf", timeout=30)
+    def iter_rtf(path):
+        ...
+        yield potongan_teks
+
+Pendaftaran sebaiknya dilakukan saat modul diimpor agar juga berlaku di
+proses pekerja pipeline. Batas ukuran file diperiksa sebelum membaca.
+
+Batas waktu bersifat best-effort secara bawaan: diperiksa setiap kali
+ekstraktor menghasilkan potongan dan setelah ia selesai, sehingga satu
+halaman yang macet di dalam pustaka pembaca tidak dapat diinterupsi.
+Ekstraktor yang didaftarkan dengan isolate=True (bawaan untuk PDF)
+dijalankan di proses anak yang dihentikan paksa begitu batas waktu lewat;
+ini memberi batas keras dengan biaya satu proses per file.
+"""
+import multiprocessing
+import os
+import re
+import time
+from html.parser import HTMLParser
+
+# batas bawaan; dapat diganti per format saat register_extractor
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+DEFAULT_TIMEOUT = 120.0
+
+TEXT_CHUNK_CHARS = 1 << 20
+
+_EXTRACTORS = {}
+# himpunan ekstensi terdaftar; objek yang sama dipakai pipeline.SUPPORTED_EXT
+SUPPORTED_EXT = set()
+
+
+class ExtractionError(Exception):
+    """File tidak dapat diekstrak: format tidak didukung, terlalu besar, atau terlalu lama."""
+
+
+class Extractor:
+    def __init__(self, name, func, extensions, max_bytes=DEFAULT_MAX_BYTES, timeout=DEFAULT_TIMEOUT, isolate=False):
+        self.name = name
+        self.func = func
+        self.extensions = tuple(extensions)
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.isolate = isolate
+
+    def __repr__(self):
+        return f"Extractor({self.name!r}, {self.extensions})"
+
+
+def register_extractor(extensions, max_bytes=DEFAULT_MAX_BYTES, timeout=DEFAULT_TIMEOUT, name=None, isolate=False):
+    """Dekorator: daftarkan generator func(path) -> potongan teks untuk ekstensi tersebut.
+
+    max_bytes / timeout None berarti tanpa batas. isolate=True menjalankan
+    func di proses anak agar timeout dapat ditegakkan secara paksa (func
+    harus fungsi tingkat modul). Pendaftaran ulang ekstensi yang sama
+    menggantikan ekstraktor sebelumnya.
+    """
+    if isinstance(extensions, str):
+        extensions = (extensions,)
+    extensions = [ext.lower() if ext.startswith(".") else "." + ext.lower() for ext in extensions]
+
+    def decorator(func):
+        extractor = Extractor(name or func.__name__, func, extensions, max_bytes, timeout, isolate)
+        for ext in extensions:
+            _EXTRACTORS[ext] = extractor
+            SUPPORTED_EXT.add(ext)
+        return func
+
+    return decorator
+
+
+def get_extractor(ext):
+    """Extractor untuk ekstensi (mis. ".pdf"), atau None."""
+    return _EXTRACTORS.get(ext.lower())
+
+
+def iter_text(filepath, ext=None, max_bytes=None, timeout=None, isolate=None):
+    """Potongan teks file; batas ukuran/waktu dan isolate bawaan format bila tidak diberikan.
+
+    Melempar ExtractionError bila format tidak terdaftar, file melebihi
+    max_bytes, atau ekstraksi melewati timeout detik (lihat docstring modul
+    untuk kapan batas waktu ditegakkan secara paksa).
+    """
+    ext = (ext or os.path.splitext(filepath)[1]).lower()
+    extractor = _EXTRACTORS.get(ext)
+    if extractor is None:
+        raise ExtractionError(f"Ekstensi tidak didukung: {ext}")
+    max_bytes = extractor.max_bytes if max_bytes is None else max_bytes
+    timeout = extractor.timeout if timeout is None else timeout
+
+    size = os.path.getsize(filepath)
+    if max_bytes is not None and size > max_bytes:
+        raise ExtractionError(f"File terlalu besar untuk {extractor.name}: {size} > {max_bytes} byte")
+
+    isolate = extractor.isolate if isolate is None else isolate
+    if timeout is None:
+        yield from (chunk for chunk in extractor.func(filepath) if chunk)
+        return
+
+    deadline = time.monotonic() + timeout
+    chunks = _isolated_chunks(extractor.func, filepath, deadline, timeout) if isolate else extractor.func(filepath)
+    for chunk in chunks:
+        if time.monotonic() > deadline:
+            raise _timeout_error(filepath, timeout)
+        if chunk:
+            yield chunk
+    # pekerjaan setelah potongan terakhir (mis. parser.close()) juga dihitung
+    if time.monotonic() > deadline:
+        raise _timeout_error(filepath, timeout)
+
+
+def _timeout_error(filepath, timeout):
+    return ExtractionError(f"Ekstraksi {os.path.basename(filepath)} melewati {timeout:g} detik")
+
+
+def _extract_to_pipe(func, filepath, conn):
+    """Isi proses anak: kirim potongan func(filepath) lewat pipe."""
+    try:
+        for chunk in func(filepath):
+            if chunk:
+                conn.send(("chunk", chunk))
+        conn.send(("done", None))
+    except Exception as exc:
+        conn.send(("error", f"{type(exc).__name__}: {exc}"))
+    finally:
+        conn.close()
+
+
+def _isolated_chunks(func, filepath, deadline, timeout):
+    """Potongan func(filepath) dari proses anak; anak dihentikan paksa bila deadline lewat."""
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+    recv, send = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_extract_to_pipe, args=(func, filepath, send), daemon=True)
+    proc.start()
+    send.close()
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not recv.poll(remaining):
+                raise _timeout_error(filepath, timeout)
+            try:
+                kind, value = recv.recv()
+            except EOFError:
+                raise ExtractionError(f"Proses ekstraksi {os.path.basename(filepath)} berhenti tanpa hasil")
+            if kind == "done":
+                return
+            if kind == "error":
+                raise ExtractionError(f"Ekstraksi {os.path.basename(filepath)} gagal: {value}")
+            yield value
+    finally:
+        recv.close()
+        if proc.is_alive():
+            proc.kill()
+        proc.join()
+
+
+def extract_text(filepath, ext=None, max_bytes=None, timeout=None):
+    """Seluruh teks file (potongan iter_text digabung sekali)."""
+    return "".join(iter_text(filepath, ext, max_bytes, timeout))
+
+
+@register_extractor(".txt", timeout=None)
+def iter_txt(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for chunk in iter(lambda: f.read(TEXT_CHUNK_CHARS), ""):
+            yield chunk
+
+
+@register_extractor(".docx")
+def iter_docx(path):
+    """Per paragraf; hasil gabungan sama dengan '\\n'.join(paragraf)."""
+    import docx
+
+    for i, par in enumerate(docx.Document(path).paragraphs):
+        yield par.text if i == 0 else "\n" + par.text
+
+
+@register_extractor(".pdf", isolate=True)
+def iter_pdf(path):
+    """Per halaman, masing-masing diakhiri baris baru."""
+    import PyPDF2
+
+    with open(path, "rb") as f:
+        for page in PyPDF2.PdfReader(f).pages:
+            yield (page.extract_text() or "") + "\n"
+
+
+class _HtmlText(HTMLParser):
+    """Kumpulkan teks yang terlihat; isi script/style diabaikan."""
+
+    _SKIP = {"script", "style", "noscript", "template"}
+    _BLOCK = {"p", "div", "br", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6", "title", "section", "article"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIP:
+            self._skip += 1
+        elif tag in self._BLOCK:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in self._SKIP and self._skip:
+            self._skip -= 1
+        elif tag in self._BLOCK:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+    def take(self):
+        text = "".join(self.parts)
+        self.parts = []
+        return text
+
+
+@register_extractor((".html", ".htm"))
+def iter_html(path):
+    parser = _HtmlText()
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for chunk in iter(lambda: f.read(TEXT_CHUNK_CHARS), ""):
+            parser.feed(chunk)
+            yield parser.take()
+    parser.close()
+    yield parser.take()
+
+
+_MD_CODE_FENCE = re.compile(r"^\s*(```|~~~)")
+_MD_IMAGE = re.compile(r"!\[([^\]]*)\]\([^)]*\)")
+_MD_LINK = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+_MD_REF_DEF = re.compile(r"^\s*\[[^\]]+\]:\s*\S+.*$")
+_MD_TAG = re.compile(r"<[^>]+>")
+
+
+@register_extractor((".md", ".markdown"))
+def iter_markdown(path):
+    """Per baris; target tautan/gambar dan tag HTML dibuang, teks tautan dipertahankan.
+
+    Sisa markup (#, *, `, >) adalah tanda baca yang sudah dihapus saat cleaning.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if _MD_CODE_FENCE.match(line) or _MD_REF_DEF.match(line):
+                yield "\n"
+                continue
+            line = _MD_IMAGE.sub(r"\1", line)
+            line = _MD_LINK.sub(r"\1", line)
+            yield _MD_TAG.sub(" ", line)
+
+
+_ODT_NS = "{urn:oasis:names:tc:opendocument:xmlns:text:1.0}"
+_ODT_BLOCKS = {_ODT_NS + "p", _ODT_NS + "h"}
+# elemen kosong yang mewakili spasi; tanpa ini kata di kedua sisinya menyatu
+_ODT_SPACES = {_ODT_NS + "s": " ", _ODT_NS + "tab": "\t", _ODT_NS + "line-break": "\n"}
+
+
+def _odt_text(elem):
+    parts = [elem.text or ""]
+    for child in elem:
+        parts.append(_ODT_SPACES.get(child.tag) or _odt_text(child))
+        parts.append(child.tail or "")
+    return "".join(parts)
+
+
+@register_extractor(".odt")
+def iter_odt(path):
+    """Per paragraf/judul dari content.xml (zip + iterparse, tanpa pustaka tambahan)."""
+    import zipfile
+    from xml.etree import ElementTree
+
+    with zipfile.ZipFile(path) as archive, archive.open("content.xml") as content:
+        depth = 0
+        for event, elem in ElementTree.iterparse(content, events=("start", "end")):
+            if elem.tag not in _ODT_BLOCKS:
+                continue
+            if event == "start":
+                depth += 1
+                continue
+            depth -= 1
+            if depth == 0:
+                # paragraf bersarang (mis. di dalam catatan) ikut dalam teks induknya
+                yield _odt_text(elem) + "\n"
+                elem.clear()
@@ -0,0 +1,285 @@
+"""Instrumentasi ringan: durasi per tahap dan counter untuk ingestion dan pencarian.
+
+Semua modul mencatat ke METRICS (global, aman dipakai banyak thread):
+
+    with METRICS.stage("search.scoring"):
+        ...
+    METRICS.incr("ingest.documents")
+
+Nama tahap yang dipakai:
+
+- ingestion: ingest.hash, ingest.extract, ingest.preprocess (clean + tokenize +
+  stopword + stem dalam satu lintasan), atau bila detailed=True
+  ingest.clean / ingest.tokenize / ingest.stopword / ingest.stem,
+  ingest.index_build / ingest.index_update, ingest.save, ingest.save_segment
+- pencarian: search.load_index, search.transform_query, search.scoring,
+  search.topk, search.proximity, search.snippet, search.output
+
+Hasil dapat diekspor sebagai JSON (to_json) atau format teks Prometheus
+(to_prometheus). profile(stage) memasang cProfile atau tracemalloc pada satu
+tahap; hanya tahap yang berjalan di proses ini yang terprofil (tahap di
+process pool pipeline hanya dikirim balik sebagai durasi).
+"""
+import json
+import re
+import sys
+import threading
+import time
+
+
+def _stage_label(stage):
+    escaped = stage.replace("\\", "\\\\").replace('"', '\\"')
+    return '{stage="' + escaped + '"}'
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    def __init__(self, metrics, name, mode):
+        self.metrics = metrics
+        self.name = name
+        self.mode = mode
+        self.profiler = None
+
+    def __enter__(self):
+        if self.mode == "cprofile":
+            self.profiler = self.metrics._profiler(self.name)
+            try:
+                self.profiler.enable()
+            except ValueError:
+                self.profiler = None  # profiler lain sedang aktif (tahap bersarang)
+        elif self.mode == "tracemalloc":
+            import tracemalloc
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        if self.profiler is not None:
+            self.profiler.disable()
+        elif self.mode == "tracemalloc":
+            import tracemalloc
+
+            self.metrics._record_peak(self.name, tracemalloc.get_traced_memory()[1])
+        self.metrics.observe(self.name, elapsed)
+        return False
+
+
+class TimedIterator:
+    """Iterator pembungkus yang menjumlahkan waktu untuk menghasilkan item (elapsed)."""
+
+    def __init__(self, iterable):
+        self._iterator = iter(iterable)
+        self.elapsed = 0.0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            return next(self._iterator)
+        finally:
+            self.elapsed += time.perf_counter() - start
+
+
+class Metrics:
+    """Durasi per tahap (jumlah panggilan, total, maksimum) dan counter bernama.
+
+    enabled=False membuat stage() dan incr() tidak melakukan apa pun.
+    detailed=True meminta pipeline memecah preprocessing per langkah
+    (lebih lambat: token disimpan sebagai daftar).
+    """
+
+    def __init__(self, enabled=True, detailed=False):
+        self.enabled = enabled
+        self.detailed = detailed
+        self._lock = threading.Lock()
+        self._stages = {}  # nama -> [count, total_s, max_s]
+        self._counters = {}
+        self._peaks = {}
+        self._profile_modes = {}
+        self._profilers = {}
+
+    def stage(self, name):
+        """Context manager yang mencatat durasi blok sebagai tahap name."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, self._profile_modes.get(name))
+
+    def observe(self, name, seconds, count=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            entry = self._stages.get(name)
+            if entry is None:
+                self._stages[name] = [count, seconds, seconds]
+            else:
+                entry[0] += count
+                entry[1] += seconds
+                if seconds > entry[2]:
+                    entry[2] = seconds
+
+    def incr(self, name, value=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def stage_totals(self, prefix=""):
+        """{nama tahap: total detik} untuk tahap berawalan prefix; selisih dua panggilan = durasi di antaranya."""
+        with self._lock:
+            return {name: entry[1] for name, entry in self._stages.items() if name.startswith(prefix)}
+
+    def raw(self):
+        """Salinan data mentah yang dapat di-pickle, untuk merge() di proses lain."""
+        with self._lock:
+            return {
+                "stages": {name: list(entry) for name, entry in self._stages.items()},
+                "counters": dict(self._counters),
+            }
+
+    def merge(self, raw):
+        """Gabungkan hasil raw() dari proses lain (mis. pekerja pipeline)."""
+        if not self.enabled or not raw:
+            return
+        with self._lock:
+            for name, (count, total, peak) in raw.get("stages", {}).items():
+                entry = self._stages.get(name)
+                if entry is None:
+                    self._stages[name] = [count, total, peak]
+                else:
+                    entry[0] += count
+                    entry[1] += total
+                    entry[2] = max(entry[2], peak)
+            for name, value in raw.get("counters", {}).items():
+                self._counters[name] = self._counters.get(name, 0) + value
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+            self._peaks.clear()
+            self._profilers.clear()
+
+    # --- profiling -------------------------------------------------------
+
+    def profile(self, stage, mode="cprofile"):
+        """Pasang profiler pada tahap: mode "cprofile", "tracemalloc", atau None untuk melepas."""
+        if mode not in (None, "cprofile", "tracemalloc"):
+            raise ValueError(f"mode profil tidak dikenal: {mode}")
+        with self._lock:
+            if mode is None:
+                self._profile_modes.pop(stage, None)
+            else:
+                self._profile_modes[stage] = mode
+
+    def _profiler(self, stage):
+        with self._lock:
+            profiler = self._profilers.get(stage)
+            if profiler is None:
+                import cProfile
+
+                profiler = self._profilers[stage] = cProfile.Profile()
+            return profiler
+
+    def _record_peak(self, stage, peak):
+        with self._lock:
+            if peak > self._peaks.get(stage, 0):
+                self._peaks[stage] = peak
+
+    def profile_stats(self, stage, sort="cumulative", limit=25):
+        """Laporan pstats untuk tahap yang diprofil dengan cProfile (teks), atau None."""
+        profiler = self._profilers.get(stage)
+        if profiler is None:
+            return None
+        import io
+        import pstats
+
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def dump_profile(self, stage, path):
+        """Simpan data cProfile tahap ke file (dibaca dengan pstats/snakeviz); False bila tidak ada."""
+        profiler = self._profilers.get(stage)
+        if profiler is None:
+            return False
+        profiler.dump_stats(path)
+        return True
+
+    # --- ekspor ----------------------------------------------------------
+
+    def snapshot(self):
+        """{"stages": {nama: {count, total_s, mean_ms, max_ms[, peak_bytes]}}, "counters": {...}}."""
+        with self._lock:
+            stages = {}
+            for name, (count, total, peak) in sorted(self._stages.items()):
+                stages[name] = {
+                    "count": count,
+                    "total_s": total,
+                    "mean_ms": total / count * 1000 if count else 0.0,
+                    "max_ms": peak * 1000,
+                }
+                if name in self._peaks:
+                    stages[name]["peak_bytes"] = self._peaks[name]
+            return {"stages": stages, "counters": dict(sorted(self._counters.items()))}
+
+    def to_json(self, indent=2):
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self, prefix="miner"):
+        """Format eksposisi teks Prometheus (versi 0.0.4)."""
+        snap = self.snapshot()
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            if not samples:
+                return
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{prefix}_{name}{labels} {value!r}")
+
+        stages = snap["stages"]
+        family("stage_seconds_total", "counter", "Total durasi per tahap.",
+               [(_stage_label(s), float(v["total_s"])) for s, v in stages.items()])
+        family("stage_calls_total", "counter", "Jumlah eksekusi per tahap.",
+               [(_stage_label(s), v["count"]) for s, v in stages.items()])
+        family("stage_seconds_max", "gauge", "Durasi terlama satu eksekusi tahap.",
+               [(_stage_label(s), v["max_ms"] / 1000) for s, v in stages.items()])
+        family("stage_peak_bytes", "gauge", "Puncak memori tracemalloc per tahap.",
+               [(_stage_label(s), v["peak_bytes"]) for s, v in stages.items() if "peak_bytes" in v])
+        for name, value in snap["counters"].items():
+            metric = re.sub(r"[^a-zA-Z0-9_]", "_", name) + "_total"
+            family(metric, "counter", f"Counter {name}.", [("", value)])
+        return "\n".join(lines) + "\n"
+
+    def report(self, out=None):
+        """Tabel ringkas tahap dan counter (untuk CLI)."""
+        out = out or sys.stderr
+        snap = self.snapshot()
+        if snap["stages"]:
+            print(f"  {'tahap':<24} {'n':>7} {'total ms':>11} {'rata2 ms':>10} {'maks ms':>10}", file=out)
+        for name, v in snap["stages"].items():
+            peak = f"  puncak {v['peak_bytes'] / 1024:.0f} KiB" if "peak_bytes" in v else ""
+            print(f"  {name:<24} {v['count']:>7} {v['total_s'] * 1000:>11.1f} {v['mean_ms']:>10.3f} "
+                  f"{v['max_ms']:>10.3f}{peak}", file=out)
+        for name, value in snap["counters"].items():
+            print(f"  {name:<24} {value:>7}", file=out)
+
+
+METRICS = Metrics()
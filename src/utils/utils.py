@@ -1,33 +1,28 @@
-import docx
-import PyPDF2
 import string
 import re 
 
+_PUNCT_TABLE = str.maketrans('', '', string.punctuation)
+
+# pembaca per format ada di registry extractors; fungsi di bawah hanya pintasan
+# (diimpor saat dipakai agar tokenizing/cleaning tetap ringan diimpor)
 def baca_txt(path_file):
-    with open(path_file, 'r', encoding='utf-8') as file:
-        return file.read()
-    
+    from src.utils.extractors import extract_text
+    return extract_text(path_file, ".txt")
+
 def baca_docx(path_file):
-    doc = docx.Document(path_file)
-    text = []
-    for pars in doc.paragraphs:
-        text.append(pars.text)
-    return '\n'.join(text)
+    from src.utils.extractors import extract_text
+    return extract_text(path_file, ".docx")
 
 def baca_pdf(path_file):
-    text = "" 
-    with open(path_file, 'rb') as file:
-        reader = PyPDF2.PdfReader(file)
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-    return text
+    from src.utils.extractors import extract_text
+    return extract_text(path_file, ".pdf")
 
 def bersihkan_text(text):
     if not text:
         return ""
     text = str(text) 
     text = text.lower()
-    text = text.translate(str.maketrans('', '', string.punctuation))
+    text = text.translate(_PUNCT_TABLE)
     text = re.sub(r'[""''…—–-]', '', text)
     text = re.sub(r'\d+', '', text)
     text = ' '.join(text.split())
@@ -1,7 +1,8 @@
 """Helper untuk tampilan: highlight dan snippet pratinjau."""
 import re
 import os
-from src.utils.utils import baca_txt, baca_docx, baca_pdf
+from src.utils.extractors import extract_text, get_extractor
+from src.indexing.snippet_store import normalize_whitespace
 
 
 def highlight_text(text: str, query_terms):
@@ -13,43 +14,84 @@ def highlight_text(text: str, query_terms):
     return highlighted
 
 
-def get_preview_snippet(filepath: str, query_terms, max_length: int = 200):
-    """Ambil potongan teks dengan konteks term kueri."""
+def _cut_snippet(length, span, read, max_length):
+    """Potong konteks di sekitar span (start, end); tanpa span ambil awal teks."""
+    if span is None:
+        snippet = read(0, max_length)
+        if length > max_length:
+            snippet += "..."
+        return snippet
+    start = max(0, span[0] - 50)
+    end = min(length, span[1] + 150)
+    snippet = read(start, end)
+    if start > 0:
+        snippet = "..." + snippet
+    if end < length:
+        snippet = snippet + "..."
+    return snippet
+
+
+def snippet_from_store(store, key, query_terms, max_length: int = 200):
+    """Snippet dari SnippetStore: hanya blok teks yang dibutuhkan yang didekompresi."""
+    span = None
+    for term in query_terms:
+        span = store.find(key, term)
+        if span is not None:
+            break
+    return _cut_snippet(store.length(key), span, lambda a, b: store.read(key, a, b), max_length)
+
+
+def passage_snippet(store, key, passage, max_length: int = 200):
+    """Snippet untuk jendela token (awal, akhir) dari RetrievalEngine.best_passage."""
+    length = store.length(key)
+    if length is None:
+        return None
+    # hanya blok yang dicakup jendela token yang didekompresi
+    span = store.token_span(key, *passage)
+    if span is None:
+        return None
+    return _cut_snippet(length, span, lambda a, b: store.read(key, a, b), max_length)
+
+
+def get_preview_snippet(filepath: str, query_terms, max_length: int = 200, store=None, key=None):
+    """Ambil potongan teks dengan konteks term kueri.
+
+    Bila store (SnippetStore) memuat key (hash isi file), teks diambil dari
+    store; file asli hanya dibaca bila teksnya belum tersimpan.
+    """
     try:
+        if store is not None and key and store.contains(key):
+            return snippet_from_store(store, key, query_terms, max_length)
+
         ext = os.path.splitext(filepath)[1].lower()
-        if ext == '.txt':
-            text = baca_txt(filepath)
-        elif ext == '.docx':
-            text = baca_docx(filepath)
-        elif ext == '.pdf':
-            text = baca_pdf(filepath)
-        else:
+        if get_extractor(ext) is None:
             return ""
 
-        text = text.replace('\n', ' ').replace('\r', ' ')
-        text = ' '.join(text.split())
+        text = normalize_whitespace(extract_text(filepath, ext))
 
-        best_snippet = ""
+        span = None
         for term in query_terms:
             pattern = re.compile(re.escape(term), re.IGNORECASE)
             match = pattern.search(text)
             if match:
-                start = max(0, match.start() - 50)
-                end = min(len(text), match.end() + 150)
-                snippet = text[start:end]
-                if start > 0:
-                    snippet = "..." + snippet
-                if end < len(text):
-                    snippet = snippet + "..."
-                best_snippet = snippet
+                span = match.span()
                 break
 
-        if not best_snippet:
-            best_snippet = text[:max_length]
-            if len(text) > max_length:
-                best_snippet += "..."
-
-        return best_snippet
+        return _cut_snippet(len(text), span, lambda a, b: text[a:b], max_length)
 
     except Exception:
         return "[Preview tidak tersedia]"
+
+
+def normalize_scores(results):
+    """Normalisasi skor ke 0-1 untuk tampilan; log-prob asli disimpan di raw_score."""
+    if not results:
+        return results
+    raw_scores = [r['score'] for r in results]
+    min_s, max_s = min(raw_scores), max(raw_scores)
+    denom = (max_s - min_s) if max_s != min_s else 1.0
+    for res in results:
+        res['raw_score'] = res['score']
+        res['score'] = (res['score'] - min_s) / denom
+        res['hits'] = res.get('hits', 0)
+    return results
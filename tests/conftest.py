@@ -0,0 +1,67 @@
+"""Fixture bersama: koleksi sintetis dengan doc_id yang datang tidak berurutan."""
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+VOCAB = [f"t{i:03d}" for i in range(120)]
+
+
+def make_documents(n_docs=300, seed=7, positional=False):
+    """Dokumen terproses (format iter_processed_documents) dengan term berdistribusi Zipf.
+
+    doc_id diacak dan tidak berurutan agar posting yang tidak disortir ketahuan.
+    """
+    rng = random.Random(seed)
+    weights = [1.0 / (rank + 1) for rank in range(len(VOCAB))]
+    doc_ids = rng.sample(range(1, n_docs * 5), n_docs)
+    docs = []
+    for doc_id in doc_ids:
+        tokens = rng.choices(VOCAB, weights, k=rng.randint(1, 80))
+        doc = {
+            'id': doc_id,
+            'tokens': tokens,
+            'metadata': {'filename': f"doc{doc_id}.txt", 'filepath': f"/tmp/doc{doc_id}.txt"},
+        }
+        if positional:
+            positions = {}
+            for pos, term in enumerate(tokens):
+                positions.setdefault(term, []).append(pos)
+            doc['positions'] = positions
+        docs.append(doc)
+    return docs
+
+
+def make_queries(n_queries=200, seed=11):
+    """Vektor kueri {term: qtf}, termasuk term umum, langka, dan yang tidak ada di koleksi."""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(n_queries):
+        terms = rng.sample(VOCAB + ["tidakada"], rng.randint(1, 6))
+        queries.append({term: rng.randint(1, 2) for term in terms})
+    return queries
+
+
+def ranking(results):
+    """(doc_id, skor dibulatkan) agar perbedaan pembulatan float tidak dianggap beda."""
+    return [(res['doc_id'], round(res['score'], 9)) for res in results]
+
+
+def exhaustive_ranking(engine, query_terms, top_k):
+    """Referensi search_exhaustive dengan seri diurutkan menurut doc_id seperti search()."""
+    results = engine.search_exhaustive(query_terms, top_k=len(engine.inverted_index.documents))
+    results.sort(key=lambda res: (-round(res['score'], 9), res['doc_id']))
+    return ranking(results[:top_k])
+
+
+@pytest.fixture(scope="session")
+def documents():
+    return make_documents()
+
+
+@pytest.fixture(scope="session")
+def queries():
+    return make_queries()
@@ -0,0 +1,73 @@
+import threading
+
+from conftest import make_documents, ranking
+from src.indexing.inverted_index import InvertedIndex
+from src.retrieval.async_search import AsyncSearcher
+from src.retrieval.retrieval_engine import RetrievalEngine
+
+
+class _QueryProcessor:
+    """Kueri sudah berupa term index dipisah spasi; frasa ditulis dalam tanda kutip."""
+
+    def transform_query(self, query):
+        tokens = query.replace('"', '').split()
+        return {term: tokens.count(term) for term in tokens}, tokens
+
+    def extract_phrases(self, query):
+        parts = query.split('"')[1::2]
+        return [[(term, offset) for offset, term in enumerate(part.split())] for part in parts]
+
+
+def _run(engine, query, **kwargs):
+    searcher = AsyncSearcher(lambda fn: fn())
+    done = threading.Event()
+    out = {}
+
+    def on_results(ticket, results, q_tokens, elapsed_ms):
+        out['results'] = [{**res, 'score': res['raw_score']} for res in results]
+        done.set()
+
+    def on_error(ticket, error):
+        out['error'] = error
+        done.set()
+
+    try:
+        searcher.submit(query, _QueryProcessor(), engine, top_k=10,
+                        on_results=on_results, on_error=on_error, **kwargs)
+        assert done.wait(10)
+    finally:
+        searcher.shutdown()
+    if 'error' in out:
+        raise out['error']
+    return ranking(out['results'])
+
+
+def _engine():
+    index = InvertedIndex(positional=True)
+    index.build_index(make_documents(n_docs=120, positional=True))
+    return RetrievalEngine(index)
+
+
+def test_plain_query_uses_search():
+    engine = _engine()
+    query = "t001 t005 t020"
+    expected = ranking(engine.search(_QueryProcessor().transform_query(query)[0], top_k=10))
+    assert _run(engine, query) == expected
+
+
+def test_proximity_only_when_requested():
+    engine = _engine()
+    query = "t001 t005 t020"
+    q_vector = _QueryProcessor().transform_query(query)[0]
+    expected = ranking(engine.search_positional(q_vector, top_k=10, proximity=True))
+    assert _run(engine, query, proximity=True) == expected
+
+
+def test_phrase_query_filters_without_proximity():
+    engine = _engine()
+    query = '"t000 t001" t003'
+    q_vector = _QueryProcessor().transform_query(query)[0]
+    phrases = _QueryProcessor().extract_phrases(query)
+    expected = ranking(engine.search_positional(q_vector, top_k=10, phrases=phrases, proximity=False))
+    assert expected
+    assert _run(engine, query) == expected
@@ -0,0 +1,21 @@
+from src.indexing.columnar_index import ColumnarInvertedIndex
+from src.indexing.inverted_index import InvertedIndex
+
+
+def test_postings_sorted_by_doc_id(documents):
+    columnar = ColumnarInvertedIndex().build_index(documents)
+    for term in columnar.terms():
+        doc_ids, _ = columnar.get_postings_arrays(term)
+        assert list(doc_ids) == sorted(doc_ids)
+
+
+def test_same_postings_as_inverted_index(documents):
+    index = InvertedIndex()
+    index.build_index(documents)
+    columnar = ColumnarInvertedIndex().build_index(documents)
+    assert sorted(columnar.terms()) == sorted(index.terms())
+    for term in index.terms():
+        assert columnar.get_postings(term) == index.get_postings(term)
+        assert columnar.get_collection_freq(term) == index.get_collection_freq(term)
+    assert columnar.get_collection_len() == index.get_collection_len()
+    assert columnar.documents == index.documents
@@ -0,0 +1,31 @@
+from bisect import bisect_left
+
+from src.indexing.compressed_index import CompressedInvertedIndex
+from src.indexing.inverted_index import InvertedIndex
+
+
+def test_same_postings_as_inverted_index(documents):
+    index = InvertedIndex()
+    index.build_index(documents)
+    compressed = CompressedInvertedIndex(block_size=8).build_index(documents)
+    for term in index.terms():
+        assert list(compressed.get_postings(term)) == index.get_postings(term)
+        assert compressed.get_collection_freq(term) == index.get_collection_freq(term)
+
+
+def test_cursor_advance_matches_bisect(documents):
+    compressed = CompressedInvertedIndex(block_size=8).build_index(documents)
+    for term in compressed.terms():
+        doc_ids, tfs = compressed.get_postings_arrays(term)
+        cursor = compressed.cursor(term)
+        last = doc_ids[-1]
+        for target in range(doc_ids[0] - 1, last + 3, 7):
+            pos = bisect_left(doc_ids, target)
+            expected = doc_ids[pos] if pos < len(doc_ids) else None
+            assert cursor.advance(target) == expected
+            if expected is not None:
+                assert cursor.tf == tfs[pos]
+
+
+def test_cursor_missing_term():
+    assert CompressedInvertedIndex().cursor("tidakada").doc_id is None
@@ -0,0 +1,65 @@
+import time
+
+import pytest
+
+from src.utils import extractors
+from src.utils.extractors import ExtractionError, extract_text, iter_text, register_extractor
+
+
+def _slow_tail(path):
+    yield "awal "
+    time.sleep(0.3)  # pekerjaan setelah potongan terakhir
+
+
+def _stuck(path):
+    yield "awal "
+    time.sleep(30)  # pustaka pembaca yang macet di dalam satu potongan
+    yield "akhir"
+
+
+def _broken(path):
+    yield "awal "
+    raise RuntimeError("rusak")
+
+
+@pytest.fixture
+def sample(tmp_path):
+    registered = []
+
+    def register(ext, func, **kwargs):
+        register_extractor(ext, **kwargs)(func)
+        registered.append(ext)
+        path = tmp_path / f"contoh{ext}"
+        path.write_text("isi", encoding="utf-8")
+        return str(path)
+
+    yield register
+    for ext in registered:
+        extractors._EXTRACTORS.pop(ext, None)
+        extractors.SUPPORTED_EXT.discard(ext)
+
+
+def test_deadline_checked_after_last_chunk(sample):
+    path = sample(".lambatakhir", _slow_tail, timeout=0.1)
+    with pytest.raises(ExtractionError):
+        extract_text(path)
+
+
+def test_isolated_extraction_is_killed_at_deadline(sample):
+    path = sample(".macet", _stuck, timeout=0.5, isolate=True)
+    start = time.monotonic()
+    with pytest.raises(ExtractionError):
+        extract_text(path)
+    assert time.monotonic() - start < 5
+
+
+def test_isolated_extraction_reports_errors(sample):
+    path = sample(".rusak", _broken, isolate=True)
+    with pytest.raises(ExtractionError, match="rusak"):
+        extract_text(path)
+
+
+def test_isolated_same_text(tmp_path):
+    path = tmp_path / "contoh.md"
+    path.write_text("# Judul\n\nTeks [tautan](http://contoh) di sini.\n", encoding="utf-8")
+    assert "".join(iter_text(str(path), isolate=True)) == extract_text(str(path))
@@ -0,0 +1,63 @@
+import pytest
+
+from src.indexing.inverted_index import InvertedIndex
+from src.indexing.segment import SegmentIndex
+from src.preprocessing.stopword import write_stopword_file
+from src.retrieval.loader import (
+    CORPUS_STOPWORDS_FILE, INDEX_FILE, SEGMENT_DIR, convert_pickle, load_corpus_stopwords, load_engine,
+)
+
+
+def _index(documents):
+    index = InvertedIndex()
+    index.build_index(documents[:20])
+    return index
+
+
+def test_corpus_stopwords_from_output_folder(documents, tmp_path):
+    _index(documents).save_segment(str(tmp_path / SEGMENT_DIR))
+    write_stopword_file(["t000", "t001"], str(tmp_path / CORPUS_STOPWORDS_FILE))
+    assert load_corpus_stopwords(str(tmp_path)) == {"t000", "t001"}
+
+
+def test_corpus_stopwords_next_to_index_pkl(documents, tmp_path):
+    _index(documents).save(str(tmp_path / INDEX_FILE))
+    write_stopword_file(["t000"], str(tmp_path / CORPUS_STOPWORDS_FILE))
+    assert load_corpus_stopwords(str(tmp_path / INDEX_FILE)) == {"t000"}
+
+
+def test_corpus_stopwords_ignore_parent_folder(documents, tmp_path):
+    # segmen lain di folder yang kebetulan memuat stopword milik index berbeda
+    _index(documents).save_segment(str(tmp_path / "lain"))
+    _index(documents).save(str(tmp_path / "lama.pkl"))
+    write_stopword_file(["t000"], str(tmp_path / CORPUS_STOPWORDS_FILE))
+    assert load_corpus_stopwords(str(tmp_path / "lain")) == frozenset()
+    assert load_corpus_stopwords(str(tmp_path / "lama.pkl")) == frozenset()
+
+
+def test_legacy_pickle_needs_explicit_opt_in(documents, tmp_path, monkeypatch):
+    path = str(tmp_path / "lama.pkl")
+    _index(documents).save(path)
+
+    def _no_unpickle(*args, **kwargs):
+        raise AssertionError("pickle.load dipanggil tanpa izin")
+
+    monkeypatch.setattr("src.indexing.inverted_index.pickle.load", _no_unpickle)
+    for mmap in (False, True):
+        with pytest.raises(ValueError, match="convert"):
+            load_engine(path, mmap=mmap)
+    monkeypatch.undo()
+
+    assert len(load_engine(path, allow_pickle=True).inverted_index.documents) == 20
+
+
+def test_converted_pickle_opens_without_unpickling(documents, tmp_path, monkeypatch):
+    path = str(tmp_path / "lama.pkl")
+    _index(documents).save(path)
+    assert convert_pickle(path) == path + ".segment"
+
+    monkeypatch.setattr("src.indexing.inverted_index.pickle.load", None)
+    for mmap in (False, True):
+        engine = load_engine(path, mmap=mmap)
+        assert isinstance(engine.inverted_index, SegmentIndex)
+        assert len(engine.inverted_index.documents) == 20
@@ -0,0 +1,50 @@
+import pytest
+
+from conftest import exhaustive_ranking, ranking
+from src.indexing.columnar_index import ColumnarInvertedIndex
+from src.indexing.compressed_index import CompressedInvertedIndex
+from src.indexing.inverted_index import InvertedIndex
+from src.indexing.segment import SegmentIndex, write_segment
+from src.retrieval.loader import load_engine
+from src.retrieval.maxscore import MaxScoreRetrievalEngine
+
+
+@pytest.fixture(scope="module", params=["dict", "columnar", "compressed", "segment"])
+def index(request, documents, tmp_path_factory):
+    if request.param == "columnar":
+        return ColumnarInvertedIndex().build_index(documents)
+    if request.param == "compressed":
+        # blok kecil agar advance() benar-benar melompati blok
+        return CompressedInvertedIndex(block_size=8).build_index(documents)
+    inverted_index = InvertedIndex()
+    inverted_index.build_index(documents)
+    if request.param == "dict":
+        return inverted_index
+    path = tmp_path_factory.mktemp("segment")
+    write_segment(inverted_index, str(path))
+    return SegmentIndex(str(path))
+
+
+@pytest.mark.parametrize("top_k", [1, 5, 20])
+def test_matches_exhaustive(index, queries, top_k):
+    engine = MaxScoreRetrievalEngine(index)
+    for query_terms in queries:
+        assert ranking(engine.search(query_terms, top_k=top_k)) == exhaustive_ranking(engine, query_terms, top_k)
+
+
+def test_precomputed_bounds_same_results(index, queries):
+    engine = MaxScoreRetrievalEngine(index)
+    engine.precompute_bounds()
+    reference = MaxScoreRetrievalEngine(index)
+    for query_terms in queries[:50]:
+        assert ranking(engine.search(query_terms, top_k=10)) == ranking(reference.search(query_terms, top_k=10))
+
+
+def test_load_engine_maxscore(documents, tmp_path):
+    inverted_index = InvertedIndex()
+    inverted_index.build_index(documents)
+    write_segment(inverted_index, str(tmp_path))
+    engine = load_engine(str(tmp_path), engine="maxscore")
+    assert isinstance(engine, MaxScoreRetrievalEngine)
+    with pytest.raises(ValueError):
+        load_engine(str(tmp_path), engine="tidakada")
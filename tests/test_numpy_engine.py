@@ -0,0 +1,50 @@
+import pytest
+
+from conftest import ranking
+from src.indexing.columnar_index import ColumnarInvertedIndex
+from src.indexing.inverted_index import InvertedIndex
+from src.indexing.segment import SegmentIndex, write_segment
+from src.retrieval.loader import load_engine
+from src.retrieval.numpy_engine import NumpyRetrievalEngine
+from src.retrieval.retrieval_engine import RetrievalEngine
+
+
+@pytest.fixture(scope="module", params=["dict", "columnar", "segment"])
+def index(request, documents, tmp_path_factory):
+    if request.param == "columnar":
+        return ColumnarInvertedIndex().build_index(documents)
+    inverted_index = InvertedIndex()
+    inverted_index.build_index(documents)
+    if request.param == "dict":
+        return inverted_index
+    path = tmp_path_factory.mktemp("segment")
+    write_segment(inverted_index, str(path))
+    return SegmentIndex(str(path))
+
+
+@pytest.mark.parametrize("top_k", [1, 10, 1000])
+def test_matches_retrieval_engine(index, queries, top_k):
+    engine = NumpyRetrievalEngine(index)
+    reference = RetrievalEngine(index)
+    for query_terms in queries:
+        results = engine.search(query_terms, top_k=top_k)
+        expected = reference.search(query_terms, top_k=top_k)
+        assert ranking(results) == ranking(expected)
+        assert [res['hits'] for res in results] == [res['hits'] for res in expected]
+
+
+def test_refresh_after_update(documents):
+    index = InvertedIndex()
+    index.build_index(documents[:100])
+    engine = NumpyRetrievalEngine(index)
+    for doc in documents[100:150]:
+        index.add_document(doc)
+    query_terms = {"t001": 1, "t010": 1}
+    assert ranking(engine.search(query_terms)) == ranking(RetrievalEngine(index).search(query_terms))
+
+
+def test_load_engine_numpy(documents, tmp_path):
+    inverted_index = InvertedIndex()
+    inverted_index.build_index(documents)
+    write_segment(inverted_index, str(tmp_path))
+    assert isinstance(load_engine(str(tmp_path), engine="numpy"), NumpyRetrievalEngine)
@@ -0,0 +1,35 @@
+import threading
+
+from src.pipeline import build_models, process_directory, rescan_directory
+
+
+def _write(folder, name, text):
+    (folder / name).write_text(text, encoding="utf-8")
+
+
+def test_rescan_updates_index_only_under_lock(tmp_path):
+    _write(tmp_path, "a.txt", "sistem temu kembali informasi dokumen")
+    _write(tmp_path, "b.txt", "jaringan komputer dan sistem operasi")
+    docs = process_directory(str(tmp_path), positional=True)
+    inverted_index, _, _ = build_models(docs, positional=True)
+    version = inverted_index.version
+
+    _write(tmp_path, "c.txt", "basis data relasional dan indeks")
+    (tmp_path / "b.txt").unlink()
+    lock = threading.RLock()
+    out = {}
+    with lock:
+        worker = threading.Thread(
+            target=lambda: out.update(rescan_directory(str(tmp_path), inverted_index, lean=False, lock=lock)),
+        )
+        worker.start()
+        worker.join(1.0)
+        # file baru sudah diproses, tetapi index belum boleh berubah selama lock dipegang
+        assert worker.is_alive()
+        assert inverted_index.version == version
+    worker.join(10)
+
+    assert not worker.is_alive()
+    assert [doc['metadata']['filename'] for doc in out['added']] == ["c.txt"]
+    assert len(out['removed']) == 1
+    assert sorted(meta['filename'] for meta in inverted_index.documents.values()) == ["a.txt", "c.txt"]
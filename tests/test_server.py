@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from src.indexing.inverted_index import InvertedIndex
+from src.retrieval.retrieval_engine import RetrievalEngine
+from src.server import SearchService
+
+
+class _QueryProcessor:
+    def transform_query(self, query):
+        tokens = query.split()
+        return {term: tokens.count(term) for term in tokens}, tokens
+
+
+async def _exchange(service, request):
+    server = await asyncio.start_server(service.handle_connection, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(request)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+        return response
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.fixture
+def service(documents):
+    index = InvertedIndex()
+    index.build_index(documents[:50])
+    service = SearchService(RetrievalEngine(index), _QueryProcessor(), cache_size=0)
+    yield service
+    service.close()
+
+
+def test_search(service):
+    response = asyncio.run(_exchange(service, b"GET /search?q=t001&k=3 HTTP/1.1\r\nConnection: close\r\n\r\n"))
+    assert response.startswith(b"HTTP/1.1 200 ")
+
+
+@pytest.mark.parametrize("request_bytes", [
+    b"GET /search?q=" + b"a" * 70_000 + b" HTTP/1.1\r\n\r\n",
+    b"GET /health HTTP/1.1\r\nX-Panjang: " + b"a" * 70_000 + b"\r\n\r\n",
+])
+def test_oversized_line_gets_431(service, request_bytes):
+    response = asyncio.run(_exchange(service, request_bytes))
+    assert response.startswith(b"HTTP/1.1 431 ")
+    assert b"Connection: close" in response
@@ -0,0 +1,58 @@
+import pytest
+
+from conftest import ranking
+from src.cli import main as cli_main
+from src.indexing.inverted_index import InvertedIndex
+from src.indexing.shards import write_shards
+from src.retrieval.loader import load_engine
+from src.retrieval.retrieval_engine import RetrievalEngine
+from src.retrieval.sharded_engine import ShardedRetrievalEngine
+
+
+@pytest.fixture(scope="module")
+def index(documents):
+    inverted_index = InvertedIndex()
+    inverted_index.build_index(documents)
+    return inverted_index
+
+
+@pytest.mark.parametrize("n_shards", [1, 3, 7])
+@pytest.mark.parametrize("maxscore", [False, True])
+def test_merged_results_match_single_index(index, queries, tmp_path, n_shards, maxscore):
+    paths = write_shards(index, str(tmp_path), n_shards)
+    reference = RetrievalEngine(index)
+    with ShardedRetrievalEngine(paths, maxscore=maxscore) as engine:
+        for query_terms in queries:
+            for top_k in (1, 10):
+                assert ranking(engine.search(query_terms, top_k=top_k)) == \
+                    ranking(reference.search(query_terms, top_k=top_k))
+
+
+def test_process_pool(index, queries, tmp_path):
+    paths = write_shards(index, str(tmp_path), 3)
+    reference = RetrievalEngine(index)
+    with ShardedRetrievalEngine(paths, workers=2) as engine:
+        for query_terms in queries[:20]:
+            assert ranking(engine.search(query_terms)) == ranking(reference.search(query_terms))
+
+
+def test_cli_index_shards(tmp_path):
+    docs_dir = tmp_path / "dokumen"
+    docs_dir.mkdir()
+    texts = ["sistem temu kembali informasi", "jaringan komputer dan sistem operasi",
+             "basis data relasional", "pencarian dokumen dengan sistem informasi", "kompresi indeks data"]
+    for i, text in enumerate(texts):
+        (docs_dir / f"doc{i}.txt").write_text(text, encoding="utf-8")
+
+    single, sharded = tmp_path / "tunggal", tmp_path / "shard"
+    assert cli_main(["index", str(docs_dir), "--out", str(single), "--workers", "1", "-q"]) == 0
+    assert cli_main(["index", str(docs_dir), "--out", str(sharded), "--workers", "1", "-q", "--shards", "2"]) == 0
+    assert not (sharded / "segment").exists()
+
+    engine = load_engine(str(sharded))
+    assert isinstance(engine, ShardedRetrievalEngine)
+    query_terms = {"sistem": 1, "informasi": 1}
+    expected = ranking(load_engine(str(single)).search(query_terms))
+    assert len(expected) == 3
+    assert ranking(engine.search(query_terms)) == expected
+    engine.close()
@@ -0,0 +1,50 @@
+import itertools
+import random
+
+from src.preprocessing.tala_compiled import stem_tala_word_compiled
+from src.preprocessing.tala_stemmer import stem_cache, stem_tala_word
+
+WORDS = (
+    "membaca", "pembacaan", "dibacakan", "bacalah", "bukunya", "menyapu", "penyapu", "memakai",
+    "pemakaian", "mempelajari", "pelajaran", "belajar", "berlari", "pelari", "bekerja", "pekerjaan",
+    "dikerjakan", "terbaca", "kesatuan", "ketua", "menulis", "penulisan", "tulisanmu", "rumahku",
+    "perumahan", "jalankan", "berjalan", "mengukur", "pengukuran", "mengubah", "perubahan",
+    "menilai", "penilaian", "sistem", "informasi", "dokumen", "temu", "kembali", "pencarian",
+    "memperbaiki", "diperbaiki", "keberhasilan", "pertanian", "petani", "mengenal", "pengenalan",
+    "dipukul", "pemukulan", "mendengarkan", "pendengaran", "melihat", "penglihatan", "ikan",
+    "a", "ab", "me", "di", "ke", "pe", "ber", "meng", "peny", "nya", "lah", "kan", "an", "i", "",
+)
+
+PREFIXES = ("", "me", "mem", "meng", "men", "meny", "pe", "pem", "peng", "pen", "peny",
+            "di", "ter", "ke", "ber", "per", "pel", "bel", "be", "mempe", "diper", "memper")
+SUFFIXES = ("", "kan", "an", "i")
+ENDINGS = ("", "lah", "kah", "pun", "nya", "ku", "mu", "nyalah", "kupun")
+ROOTS = ("ajar", "baca", "tulis", "kerja", "sapu", "pakai", "ambil", "nilai", "satu",
+         "erti", "main", "lari", "beri", "buat", "kata", "ikan", "lihat", "dengar",
+         "sikat", "tani", "kenal", "pukul", "rumah", "jalan", "ubah", "ukur", "a", "e")
+
+
+def _mismatches(words):
+    return [(w, stem_tala_word(w), stem_tala_word_compiled(w)) for w in words
+            if stem_tala_word(w) != stem_tala_word_compiled(w)]
+
+
+def test_word_list():
+    assert _mismatches(WORDS) == []
+
+
+def test_affix_combinations():
+    words = {prefix + root + suffix + ending
+             for prefix, root, suffix, ending in itertools.product(PREFIXES, ROOTS, SUFFIXES, ENDINGS)}
+    assert _mismatches(sorted(words)) == []
+
+
+def test_random_strings():
+    rng = random.Random(0)
+    alphabet = "aiueoaiuemnngykdtrbplsh"
+    words = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 14))) for _ in range(20_000)]
+    assert _mismatches(words) == []
+
+
+def test_stem_cache_uses_compiled_engine():
+    assert stem_cache.stem_fn is stem_tala_word_compiled
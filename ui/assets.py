@@ -1,10 +1,19 @@
 """Helper untuk memuat aset gambar UI."""
 from pathlib import Path
-from PIL import Image, ImageDraw
 import customtkinter as ctk
 
+ASSETS = {
+    "logo": ("logo.png", (34, 34)),
+    "stop": ("StopFix.png", (22, 22)),
+    "highlight": ("highlight_preview_Fix.png", (22, 22)),
+    "result": ("resultFix.png", (26, 26)),
+    "upload": ("uploadFix.png", (72, 72)),
+}
+
 
 def _load_rounded_image(path: Path, size, radius=8):
+    from PIL import Image, ImageDraw
+
     img = Image.open(path).convert("RGBA").resize(size, Image.LANCZOS)
     mask = Image.new("L", size, 0)
     draw = ImageDraw.Draw(mask)
@@ -13,28 +22,47 @@ def _load_rounded_image(path: Path, size, radius=8):
     return img
 
 
+def _load_image(base_dir: Path, key):
+    """CTkImage untuk satu aset, atau None jika file tidak ada/gagal dimuat."""
+    filename, size = ASSETS[key]
+    path = base_dir / filename
+    if not path.exists():
+        return None
+    try:
+        # PIL baru diimpor ketika gambar pertama benar-benar dipakai
+        from PIL import Image
+
+        if key == "logo":
+            img = _load_rounded_image(path, size, radius=8)
+            return ctk.CTkImage(light_image=img, size=size)
+        return ctk.CTkImage(light_image=Image.open(path), size=size)
+    except Exception:
+        return None
+
+
+class LazyImages:
+    """Seperti dict aset, tetapi setiap gambar dimuat saat pertama kali diakses."""
+
+    def __init__(self, base_dir: Path):
+        self.base_dir = base_dir
+        self._images = {}
+
+    def get(self, key, default=None):
+        if key not in ASSETS:
+            return default
+        if key not in self._images:
+            self._images[key] = _load_image(self.base_dir, key)
+        return self._images[key]
+
+    def __getitem__(self, key):
+        if key not in ASSETS:
+            raise KeyError(key)
+        return self.get(key)
+
+    def __contains__(self, key):
+        return key in ASSETS
+
+
 def load_images(base_dir: Path):
-    """Muat aset PNG jika tersedia; abaikan jika gagal."""
-    assets = {
-        "logo": ("logo.png", (34, 34)),
-        "stop": ("StopFix.png", (22, 22)),
-        "highlight": ("highlight_preview_Fix.png", (22, 22)),
-        "result": ("resultFix.png", (26, 26)),
-        "upload": ("uploadFix.png", (72, 72)),
-    }
-
-    images = {}
-    for key, (filename, size) in assets.items():
-        path = base_dir / filename
-        if not path.exists():
-            images[key] = None
-            continue
-        try:
-            if key == "logo":
-                img = _load_rounded_image(path, size, radius=8)
-                images[key] = ctk.CTkImage(light_image=img, size=size)
-            else:
-                images[key] = ctk.CTkImage(light_image=Image.open(path), size=size)
-        except Exception:
-            images[key] = None
-    return images
+    """Muat aset PNG jika tersedia (malas, per gambar); abaikan jika gagal."""
+    return LazyImages(base_dir)
@@ -189,7 +189,8 @@ def create_result_card(
         anchor="w",
     ).pack(anchor="w", pady=(5, 0))
 
-    if preview_text:
+    # preview_text None = pratinjau masih dimuat; diisi kemudian lewat card.set_preview
+    if preview_text or preview_text is None:
         preview_frame = ctk.CTkFrame(content, fg_color=colors["bg_dark"], corner_radius=8)
         preview_frame.pack(fill="x", pady=(10, 0))
 
@@ -204,10 +205,25 @@ def create_result_card(
             activate_scrollbars=False,
         )
         preview_box.pack(padx=15, pady=10, fill="x")
-        
-        # Insert text dengan highlight berwarna
-        _insert_highlighted_text(preview_box, preview_text, query_terms)
-        preview_box.configure(state="disabled")
+
+        def set_preview(text):
+            if not preview_box.winfo_exists():
+                return
+            if not text:
+                preview_frame.pack_forget()
+                return
+            # Insert text dengan highlight berwarna
+            _insert_highlighted_text(preview_box, text, query_terms)
+            preview_box.configure(state="disabled")
+
+        if preview_text is None:
+            preview_box.insert("end", "Memuat pratinjau…")
+            preview_box.configure(state="disabled")
+        else:
+            set_preview(preview_text)
+    else:
+        def set_preview(text):
+            pass
 
     ctk.CTkButton(
         card,
@@ -262,4 +278,5 @@ def create_result_card(
         height=26,
     ).pack(pady=(8, 0))
 
+    card.set_preview = set_preview
     return card
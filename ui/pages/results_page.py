@@ -4,6 +4,8 @@ from ui.components import create_section_header, create_chip, create_result_card
 
 
 def render_results_page(app):
+    # kartu disimpan agar pratinjau yang datang belakangan dapat diisi (lihat MinerApp)
+    app.result_cards = []
     if not app.current_results:
         empty_frame = ctk.CTkFrame(app.main_container, fg_color="transparent")
         empty_frame.pack(expand=True)
@@ -92,12 +94,35 @@ def render_results_page(app):
         image=app.images.get("highlight"),
     )
 
+    stages_row = ctk.CTkFrame(header_frame, fg_color="transparent")
+    stages_row.pack(anchor="w", fill="x", pady=(10, 0))
+    if app.current_search_stages:
+        # rincian waktu kueri ini per tahap (lihat src.utils.instrumentation)
+        ctk.CTkLabel(
+            stages_row,
+            text="Tahap: " + " · ".join(
+                f"{name.split('.', 1)[1]} {ms:.1f} ms" for name, ms in app.current_search_stages.items()
+            ),
+            font=app.fonts["caption"],
+            text_color=app.colors["text_secondary"],
+        ).pack(side="left", padx=8)
+    ctk.CTkButton(
+        stages_row,
+        text="Ekspor metrik",
+        command=app.export_metrics,
+        fg_color=app.colors["surface_dark"],
+        hover_color=app.colors["border_dark"],
+        font=app.fonts["caption"],
+        width=120,
+        height=28,
+    ).pack(side="right", padx=8)
+
     results_frame = ctk.CTkFrame(main_scroll, fg_color="transparent")
     results_frame.grid(row=1, column=0, sticky="ew")
     results_frame.grid_columnconfigure(0, weight=1)
 
     for rank, res in enumerate(app.current_results, 1):
-        create_result_card(
+        card = create_result_card(
             results_frame,
             rank,
             res['metadata']['filename'],
@@ -111,3 +136,4 @@ def render_results_page(app):
             images=app.images,
             open_file_cb=app.open_file,
         )
+        app.result_cards.append(card)
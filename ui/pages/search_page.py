@@ -79,6 +79,16 @@ def render_search_page(app):
     )
     app.search_status.grid(row=2, column=0, sticky="w", pady=(6, 0))
 
+    proximity_var = ctk.BooleanVar(value=app.proximity_search)
+    ctk.CTkCheckBox(
+        search_inner,
+        text="Utamakan dokumen dengan kata kunci yang berdekatan",
+        variable=proximity_var,
+        command=lambda: setattr(app, "proximity_search", proximity_var.get()),
+        font=app.fonts["caption"],
+        text_color=app.colors["text_secondary"],
+    ).grid(row=3, column=0, sticky="w", pady=(6, 0))
+
     chips_frame = ctk.CTkFrame(hero, fg_color="transparent")
     chips_frame.pack(pady=16)
     app.doc_count_label = create_chip(
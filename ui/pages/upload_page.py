@@ -1,6 +1,7 @@
 """Halaman upload dokumen."""
 import customtkinter as ctk
 from ui.components import create_section_header, create_panel
+from src.utils.extractors import SUPPORTED_EXT
 
 
 def render_upload_page(app):
@@ -47,7 +48,7 @@ def render_upload_page(app):
 
     ctk.CTkLabel(
         upload_content,
-        text="Format: .txt, .docx, .pdf",
+        text="Format: " + ", ".join(sorted(SUPPORTED_EXT)),
         font=app.fonts["body"],
         text_color=app.colors["text_secondary"],
     ).pack(pady=4)